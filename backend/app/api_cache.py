@@ -0,0 +1,189 @@
+# backend/app/api_cache.py
+"""
+Response cache for the read API
+Serialized JSON bodies are keyed on (route, data version, normalized query) and held in an
+in-process TTL/LRU, or in Redis shared by all workers when API_CACHE_REDIS_URL is set.
+Each response carries a weak ETag derived from the same key, so clients revalidating
+with If-None-Match get a 304 until the ETL bumps the data version. The tag is weak because
+the compression middleware may send the same JSON as identity, gzip or br bytes (with
+Vary: Accept-Encoding).
+Endpoints whose rows already match their response model field for field can opt into
+`trusted` serialization: rows go straight to orjson without a Pydantic pass.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from .cache import LRUCache, current_data_version
+from .db import async_pool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+API_CACHE_ENABLED = os.getenv("API_CACHE", "on").lower() not in ("0", "off", "false", "no")
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "300"))
+API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", "1024"))
+API_CACHE_REDIS_URL = os.getenv("API_CACHE_REDIS_URL")
+# Browsers may reuse a response this long before revalidating (0 = always revalidate)
+API_MAX_AGE = int(os.getenv("API_MAX_AGE", "0"))
+
+REDIS_KEY_PREFIX = "globemap:api:"
+JSON_MEDIA_TYPE = "application/json"
+
+
+class MemoryBackend:
+    """Per-process LRU whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = LRUCache(maxsize=maxsize)
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key: str, body: bytes) -> None:
+        self._entries.set(key, (time.monotonic() + self.ttl, body))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Redis (or any protocol-compatible server); errors degrade to cache misses"""
+
+    def __init__(self, url: str, ttl: float):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._errors = (redis.RedisError, OSError)
+        self.ttl = max(1, int(ttl))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._client.get(REDIS_KEY_PREFIX + key)
+        except self._errors as e:
+            logger.warning(f"⚠️ API cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, body: bytes) -> None:
+        try:
+            await self._client.set(REDIS_KEY_PREFIX + key, body, ex=self.ttl)
+        except self._errors as e:
+            logger.warning(f"⚠️ API cache write failed: {e}")
+
+    def clear(self) -> None:
+        pass  # Entries are versioned and expire on their own
+
+
+def _make_backend():
+    if not API_CACHE_ENABLED:
+        return None
+    if API_CACHE_REDIS_URL:
+        try:
+            return RedisBackend(API_CACHE_REDIS_URL, API_CACHE_TTL)
+        except ImportError:
+            logger.warning("⚠️ API_CACHE_REDIS_URL is set but redis is not installed; caching in-process")
+    return MemoryBackend(API_CACHE_SIZE, API_CACHE_TTL)
+
+
+backend = _make_backend()
+
+
+def cache_key(route: str, version: int, params: Dict[str, Any]) -> str:
+    """Digest of the route, data version and query parameters (None values dropped)"""
+    normalized = sorted((name, value) for name, value in params.items() if value is not None)
+    payload = json.dumps([route, version, normalized], separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match comparison (weak, as RFC 9110 prescribes for this header)
+    "*" never matches: on a read it would vouch for resources nobody has looked up.
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def serialize(model: Any, data: Any, trusted: bool = False) -> bytes:
+    """
+    Dump data as JSON in the shape of a response model
+
+    Args:
+        model: Response model
+        data: Dicts/lists to serialize
+        trusted: Data already holds the model's fields (or a projection of them) with the
+            right types; skip validation and dump directly, with orjson when it is installed
+
+    Returns:
+        UTF-8 JSON bytes
+    """
+    if trusted:
+        return orjson.dumps(data) if orjson is not None else to_json(data)
+    adapter = _adapter(model)
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+async def cached_json(
+    request: Request,
+    route: str,
+    params: Dict[str, Any],
+    model: Any,
+    build: Callable[[], Awaitable[Any]],
+    trusted: bool = False,
+) -> Response:
+    """
+    Serve a read endpoint through the response cache
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        route: Cache namespace of the endpoint
+        params: The endpoint's query parameters
+        model: Response model used to validate and serialize the data
+        build: Produces the response data on a cache miss
+        trusted: Serialize without validation (see serialize)
+
+    Returns:
+        200 with the JSON body, or 304 when the client already has this version. The 304 is
+        only sent once the body is cached or was just built, so a matching tag never hides
+        a 404 or a 400 that build() would raise.
+    """
+    if backend is None:
+        return Response(content=serialize(model, await build(), trusted), media_type=JSON_MEDIA_TYPE)
+
+    version = await current_data_version(async_pool)
+    key = cache_key(route, version, params)
+    # Weak: the compression middleware sends this body identity, gzip or br encoded (adding Vary)
+    headers = {"ETag": f'W/"{key[:32]}"', "Cache-Control": f"public, max-age={API_MAX_AGE}"}
+
+    body = await backend.get(key)
+    headers["X-Cache"] = "hit" if body is not None else "miss"
+    if body is None:
+        body = serialize(model, await build(), trusted)
+        await backend.set(key, body)
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,5 @@
+# backend/app/bench/__init__.py
+"""
+Benchmarks and load-testing tools
+Run against a disposable database; nothing here is imported by the API
+"""
@@ -0,0 +1,174 @@
+# backend/app/bench/bench_routers.py
+"""
+Router micro-benchmarks (pytest-benchmark)
+Calls the router functions directly, without HTTP, against DATABASE_URL; load data first
+with app.bench.generate. Async routes run to completion on one event loop that owns the
+async pool. The API response cache is off unless API_CACHE is set, so every call reaches
+Postgres. Skipped when pytest-benchmark or the database is unavailable.
+
+Usage:
+    pip install pytest pytest-benchmark
+    pytest app/bench/bench_routers.py --benchmark-only
+    pytest app/bench/bench_routers.py --benchmark-autosave                   # store a baseline
+    pytest app/bench/bench_routers.py --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+import asyncio
+import inspect
+import json
+import os
+
+os.environ.setdefault("API_CACHE", "off")
+
+import pytest
+from fastapi.params import Param
+from psycopg2.extras import RealDictCursor
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from app.api_cache import serialize
+from app.db import async_pool, engine
+from app.routers import charities, crises
+from app.schemas import PaginatedCharities, PaginatedCrises
+from app.tiles import get_tile, tile_cache
+
+pytest.importorskip("pytest_benchmark")
+
+CRISES_CASES = {
+    "default": {},
+    "last_updated": {"sort": "last_updated"},
+    "category": {"category": "Disaster"},
+    "search": {"q": "flood"},
+    "search_relevance": {"q": "flood relief", "sort": "relevance"},
+    "deep_offset": {"offset": 5000},
+    "limit_200": {"limit": 200},
+    "total_estimate": {"total_mode": "estimate"},
+    "total_none": {"total_mode": "none"},
+}
+
+WITHIN_CASES = {
+    "bbox_europe": {"bbox": "-10,35,30,60"},
+    "bbox_world": {"bbox": "-180,-85,180,85", "limit": 5000},
+    "radius_500km": {"lat": 0.0, "lon": 20.0, "radius_km": 500},
+}
+
+CLUSTER_CASES = {
+    "z2": {"z": 2},
+    "z6_bbox": {"z": 6, "bbox": "-10,35,30,60"},
+    "z12_bbox": {"z": 12, "bbox": "2.2,48.8,2.5,48.95"},
+}
+
+CHARITY_CASES = {
+    "all": {},
+    "by_crisis": {"crisis_id": 1},
+    "by_country": {"country_code": "US"},
+    "by_source": {"source": "bench", "limit": 500},
+}
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def call(func, **params):
+    """Call a route function directly, resolving Query(...) defaults to their values"""
+    for name, param in inspect.signature(func).parameters.items():
+        if name not in params and param.default is not inspect.Parameter.empty:
+            default = param.default
+            params[name] = default.default if isinstance(default, Param) else default
+    if "request" in inspect.signature(func).parameters:
+        params.setdefault("request", Request({"type": "http", "method": "GET", "headers": []}))
+    result = func(**params)
+    if inspect.iscoroutine(result):
+        result = _loop.run_until_complete(result)
+    return result
+
+
+def body(response):
+    return json.loads(response.body)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    global _loop
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError as e:
+        pytest.skip(f"Database unavailable: {e}")
+
+    _loop = asyncio.new_event_loop()
+    _loop.run_until_complete(async_pool.open())
+    yield
+    _loop.run_until_complete(async_pool.close())
+    _loop.close()
+    _loop = None
+
+
+@pytest.mark.parametrize("params", CRISES_CASES.values(), ids=CRISES_CASES.keys())
+def test_list_crises(benchmark, params):
+    result = benchmark(call, crises.list_crises, **params)
+    assert "items" in body(result)
+
+
+def test_list_crises_cursor_page(benchmark):
+    first = body(call(crises.list_crises, total_mode="none"))
+    if not first["next_cursor"]:
+        pytest.skip("Not enough crises for a second page")
+    result = benchmark(call, crises.list_crises, cursor=first["next_cursor"], total_mode="none")
+    assert "items" in body(result)
+
+
+@pytest.mark.parametrize("params", WITHIN_CASES.values(), ids=WITHIN_CASES.keys())
+def test_list_crises_within(benchmark, params):
+    result = body(benchmark(call, crises.list_crises_within, **params))
+    assert result["count"] == len(result["items"])
+
+
+@pytest.mark.parametrize("params", CLUSTER_CASES.values(), ids=CLUSTER_CASES.keys())
+def test_list_crisis_clusters(benchmark, params):
+    result = body(benchmark(call, crises.list_crisis_clusters, **params))
+    assert result["z"] == params["z"]
+
+
+@pytest.mark.parametrize("params", CHARITY_CASES.values(), ids=CHARITY_CASES.keys())
+def test_list_charities(benchmark, params):
+    result = body(benchmark(call, charities.list_charities, **params))
+    assert len(result["items"]) <= result["limit"]
+
+
+SERIALIZE_CASES = {
+    "crises_200": (PaginatedCrises, lambda: crises._query_crises(None, None, "severity", 200, 0, None, "none")),
+    "charities_500": (PaginatedCharities, lambda: charities._query_charities(None, None, None, None, 500)),
+}
+
+
+@pytest.mark.parametrize("trusted", [False, True], ids=["validated", "trusted"])
+@pytest.mark.parametrize("case", SERIALIZE_CASES.keys())
+def test_serialize_page(benchmark, case, trusted):
+    """JSON encoding of one page; extra_info.us_per_row gives the CPU cost per row"""
+    model, query = SERIALIZE_CASES[case]
+    page = _loop.run_until_complete(query())
+    body = benchmark(serialize, model, page, trusted)
+    assert len(json.loads(body)["items"]) == len(page["items"])
+    if benchmark.stats is not None:  # None under --benchmark-disable
+        benchmark.extra_info["us_per_row"] = benchmark.stats.stats.mean * 1e6 / max(len(page["items"]), 1)
+
+
+@pytest.fixture
+def dict_cursor():
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor(cursor_factory=RealDictCursor) as cur:
+            yield cur
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+
+@pytest.mark.parametrize("cold", [True, False], ids=["cold", "cached"])
+def test_crisis_tile(benchmark, dict_cursor, cold):
+    setup = tile_cache.clear if cold else None
+    data, etag = benchmark.pedantic(
+        get_tile, args=(dict_cursor, 2, 2, 1, None), setup=setup, rounds=50, warmup_rounds=1
+    )
+    assert etag
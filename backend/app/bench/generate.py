@@ -0,0 +1,206 @@
+# backend/app/bench/generate.py
+"""
+Synthetic data generator for load tests
+Bulk-loads N crises and M charities into the real tables with COPY. Distributions roughly
+follow production data: a few countries hold most crises, severities cluster low with a
+spike at ReliefWeb's default of 5, and description lengths are long-tailed.
+Rows are tagged source='bench' so they can be removed again with --clear.
+
+Usage:
+    python -m app.bench.generate --crises 1000000 --charities 200000
+    python -m app.bench.generate --clear
+"""
+import argparse
+import csv
+import io
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app import countries
+from app.bench.search_bench import WORDS
+from app.cache import bump_data_version
+from app.db import SessionLocal, engine
+from app.etl.sync import relink_charities
+from app.models import Base
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SOURCE = "bench"
+COPY_CHUNK = 50_000
+
+CATEGORIES = ["Disaster", "Conflict", "Climate", "Health", "Hunger"]
+CATEGORY_WEIGHTS = [0.35, 0.2, 0.15, 0.15, 0.15]
+EVENTS = ["Flood", "Earthquake", "Drought", "Cyclone", "Wildfire", "Epidemic", "Conflict", "Famine", "Landslide"]
+ORG_WORDS = ["Relief", "Aid", "Hope", "Care", "Health", "Water", "Children", "Food", "Shelter", "Rescue"]
+ORG_KINDS = ["Foundation", "Fund", "Initiative", "Network", "Alliance", "Trust"]
+
+CRISIS_COLUMNS = [
+    "title", "category", "severity", "latitude", "longitude", "country_code",
+    "description", "source", "source_id", "source_api", "last_updated",
+]
+CHARITY_COLUMNS = ["name", "description", "website", "logo_url", "donation_url", "country_code", "source"]
+
+
+def country_weights(rng: np.random.Generator) -> tuple[List[countries.Country], np.ndarray]:
+    """All countries with Zipf-like weights (rank^-1.1) over a random ranking"""
+    table = countries.all_countries()
+    ranked = [table[i] for i in rng.permutation(len(table))]
+    weights = 1.0 / np.arange(1, len(ranked) + 1) ** 1.1
+    return ranked, weights / weights.sum()
+
+
+def sentences(rng: np.random.Generator, n: int, median_words: int, max_words: int) -> List[str]:
+    """n texts with log-normally distributed word counts"""
+    lengths = np.clip(rng.lognormal(np.log(median_words), 0.8, n).astype(int), 1, max_words)
+    words = np.array(WORDS)[rng.integers(0, len(WORDS), lengths.sum())]
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    return [" ".join(words[bounds[i]:bounds[i + 1]]).capitalize() + "." for i in range(n)]
+
+
+def crisis_rows(rng: np.random.Generator, n: int, run_id: str) -> Iterator[Sequence]:
+    ranked, weights = country_weights(rng)
+    now = datetime.utcnow()
+
+    for start in range(0, n, COPY_CHUNK):
+        size = min(COPY_CHUNK, n - start)
+        picks = rng.choice(len(ranked), size, p=weights)
+        at_sea = rng.random(size) < 0.05
+        categories = rng.choice(CATEGORIES, size, p=CATEGORY_WEIGHTS)
+        severity = np.where(rng.random(size) < 0.4, 5, np.clip(rng.geometric(0.35, size), 1, 10))
+        lat_jitter, lon_jitter = rng.normal(0, 3, size), rng.normal(0, 3, size)
+        ages = rng.exponential(120, size)
+        events = rng.choice(EVENTS, size)
+        descriptions = sentences(rng, size, median_words=25, max_words=400)
+
+        for i in range(size):
+            country = ranked[picks[i]]
+            lat = float(np.clip(country.latitude + lat_jitter[i], -85, 85))
+            lon = (country.longitude + lon_jitter[i] + 180) % 360 - 180
+            yield (
+                f"{events[i]} in {country.name}", categories[i], int(severity[i]),
+                round(lat, 5), round(lon, 5), None if at_sea[i] else country.alpha2,
+                descriptions[i], SOURCE, f"{SOURCE}_{run_id}_{start + i}", SOURCE,
+                now - timedelta(days=float(ages[i])),
+            )
+
+
+def charity_rows(rng: np.random.Generator, n: int, run_id: str) -> Iterator[Sequence]:
+    ranked, weights = country_weights(rng)
+
+    for start in range(0, n, COPY_CHUNK):
+        size = min(COPY_CHUNK, n - start)
+        picks = rng.choice(len(ranked), size, p=weights)
+        global_org = rng.random(size) < 0.1
+        names = zip(rng.choice(ORG_WORDS, size), rng.choice(ORG_WORDS, size), rng.choice(ORG_KINDS, size))
+        descriptions = sentences(rng, size, median_words=40, max_words=300)
+
+        for i, (first, second, kind) in enumerate(names):
+            slug = f"{SOURCE}-{run_id}-{start + i}"
+            yield (
+                f"{first} {second} {kind} {start + i}", descriptions[i],
+                f"https://example.org/{slug}", None, f"https://example.org/{slug}/donate",
+                None if global_org[i] else ranked[picks[i]].alpha2, SOURCE,
+            )
+
+
+def copy_rows(cur, table: str, columns: List[str], rows: Iterator[Sequence]) -> int:
+    """COPY rows in COPY_CHUNK-sized CSV buffers"""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+    while True:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if count == COPY_CHUNK:
+                break
+        if count == 0:
+            return total
+        buf.seek(0)
+        cur.copy_expert(sql, buf)
+        total += count
+        logger.info(f"  {table}: {total:,} rows")
+
+
+def finish(changed: bool) -> None:
+    """Link charities to their country's top crisis and invalidate API caches"""
+    db = SessionLocal()
+    try:
+        relinked = relink_charities(db)
+        if changed or relinked:
+            bump_data_version(db)
+        db.commit()
+        logger.info(f"🔗 Relinked {relinked} charities")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def clear() -> None:
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            cur.execute("DELETE FROM charities WHERE source = %s", (SOURCE,))
+            charities_deleted = cur.rowcount
+            cur.execute("""
+                UPDATE charities SET related_crisis_id = NULL, crisis_id = NULL
+                WHERE related_crisis_id IN (SELECT id FROM crises WHERE source = %s)
+                   OR crisis_id IN (SELECT id FROM crises WHERE source = %s)
+            """, (SOURCE, SOURCE))
+            cur.execute("DELETE FROM crises WHERE source = %s", (SOURCE,))
+            crises_deleted = cur.rowcount
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+    logger.info(f"🧹 Removed {crises_deleted:,} bench crises and {charities_deleted:,} bench charities")
+    finish(changed=True)
+
+
+def generate(num_crises: int, num_charities: int, seed: Optional[int]) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = np.random.default_rng(seed)
+    run_id = str(int(time.time()))
+
+    started = time.perf_counter()
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            copy_rows(cur, "crises", CRISIS_COLUMNS, crisis_rows(rng, num_crises, run_id))
+            copy_rows(cur, "charities", CHARITY_COLUMNS, charity_rows(rng, num_charities, run_id))
+            cur.execute("ANALYZE crises")
+            cur.execute("ANALYZE charities")
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+    finish(changed=num_crises > 0 or num_charities > 0)
+    elapsed = time.perf_counter() - started
+    logger.info(f"✅ Loaded {num_crises:,} crises and {num_charities:,} charities in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crises", type=int, default=100_000)
+    parser.add_argument("--charities", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--clear", action="store_true", help="Remove previously generated rows instead")
+    args = parser.parse_args()
+    if args.clear:
+        clear()
+    else:
+        generate(args.crises, args.charities, args.seed)
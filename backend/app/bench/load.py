@@ -0,0 +1,160 @@
+# backend/app/bench/load.py
+"""
+HTTP load driver
+Hammers a running API with a fixed set of endpoint/parameter scenarios and reports latency
+percentiles (p50/p95/p99), throughput and errors per scenario
+
+Usage:
+    uvicorn app.main:app --workers 4 &
+    python -m app.bench.load --base-url http://localhost:8000 --concurrency 32 --duration 15
+    python -m app.bench.load --scenario crises --json results.json   # only scenarios containing "crises"
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# name -> (path, query params)
+SCENARIOS: Dict[str, tuple] = {
+    "crises": ("/crises/", {}),
+    "crises_last_updated": ("/crises/", {"sort": "last_updated"}),
+    "crises_category": ("/crises/", {"category": "Disaster"}),
+    "crises_search": ("/crises/", {"q": "flood"}),
+    "crises_search_relevance": ("/crises/", {"q": "flood relief", "sort": "relevance"}),
+    "crises_deep_offset": ("/crises/", {"offset": 5000}),
+    "crises_limit_200": ("/crises/", {"limit": 200}),
+    "crises_total_estimate": ("/crises/", {"total_mode": "estimate"}),
+    "crises_total_none": ("/crises/", {"total_mode": "none"}),
+    "crises_within_bbox": ("/crises/within", {"bbox": "-10,35,30,60"}),
+    "crises_within_radius": ("/crises/within", {"lat": 0, "lon": 20, "radius_km": 500}),
+    "crises_clusters_z2": ("/crises/clusters", {"z": 2}),
+    "crises_clusters_z6": ("/crises/clusters", {"z": 6, "bbox": "-10,35,30,60"}),
+    "charities": ("/charities/", {}),
+    "charities_by_crisis": ("/charities/", {"crisis_id": 1}),
+    "charities_by_country": ("/charities/", {"country_code": "US"}),
+    "tile_z2": ("/tiles/crises/2/2/1.mvt", {}),
+}
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    bytes_per_response: int
+
+
+def percentiles(samples: List[float]) -> Dict[int, float]:
+    """p50/p95/p99 of latency samples (ms)"""
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {50: value, 95: value, 99: value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {50: cuts[49], 95: cuts[94], 99: cuts[98]}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, name: str, concurrency: int, duration: float, max_requests: Optional[int]
+) -> ScenarioResult:
+    """`concurrency` workers issue back-to-back requests until time or the request budget runs out"""
+    path, params = SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+    total_bytes = 0
+    issued = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors, total_bytes, issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                ok = response.status_code < 400
+                total_bytes += len(response.content)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cuts = percentiles(latencies)
+    count = len(latencies)
+    return ScenarioResult(
+        scenario=name,
+        requests=count,
+        errors=errors,
+        rps=count / elapsed if elapsed else 0.0,
+        p50_ms=cuts[50],
+        p95_ms=cuts[95],
+        p99_ms=cuts[99],
+        max_ms=max(latencies, default=0.0),
+        bytes_per_response=total_bytes // max(count - errors, 1),
+    )
+
+
+async def run(
+    base_url: str, names: List[str], concurrency: int, duration: float,
+    max_requests: Optional[int], warmup: int,
+) -> List[ScenarioResult]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        results = []
+        logger.info(
+            f"{'scenario':<26}{'reqs':>8}{'err':>6}{'req/s':>9}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'bytes':>9}"
+        )
+        for name in names:
+            path, params = SCENARIOS[name]
+            for _ in range(warmup):
+                try:
+                    await client.get(path, params=params)
+                except httpx.HTTPError:
+                    pass  # counted as errors in the timed run
+            result = await run_scenario(client, name, concurrency, duration, max_requests)
+            results.append(result)
+            logger.info(
+                f"{result.scenario:<26}{result.requests:>8}{result.errors:>6}{result.rps:>9.1f}"
+                f"{result.p50_ms:>9.1f}{result.p95_ms:>9.1f}{result.p99_ms:>9.1f}{result.max_ms:>9.1f}"
+                f"{result.bytes_per_response:>9}"
+            )
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--requests", type=int, default=None, help="Stop a scenario after this many requests")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests before each scenario")
+    parser.add_argument("--scenario", action="append", default=[],
+                        help="Run only scenarios whose name contains this (repeatable)")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    names = [n for n in SCENARIOS if not args.scenario or any(s in n for s in args.scenario)]
+    results = asyncio.run(run(args.base_url, names, args.concurrency, args.duration, args.requests, args.warmup))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
@@ -0,0 +1,96 @@
+# backend/app/bench/search_bench.py
+"""
+Crisis search benchmark: per-token ILIKE vs full-text search
+Builds a synthetic `bench_crises` table (1M rows by default) and times both query shapes
+
+Usage:
+    python -m app.bench.search_bench --rows 1000000 --runs 5
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from app.db import engine
+from app.search import MATCH_SQL, SEARCH_VECTOR_SQL, build_tsquery
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEARCH_TERMS = ["flood", "earthquake region", "drought crops", "cyclone coast", "epidemic"]
+
+WORDS = [
+    "flood", "earthquake", "drought", "cyclone", "wildfire", "epidemic", "storm", "famine",
+    "conflict", "landslide", "heatwave", "region", "coast", "crops", "population", "relief",
+    "severe", "ongoing", "humanitarian", "displacement", "village", "river", "province", "aid",
+]
+
+
+def build_table(cur, rows: int):
+    """(Re)create bench_crises with `rows` random titles/descriptions"""
+    logger.info(f"Building bench_crises with {rows:,} rows...")
+    cur.execute("DROP TABLE IF EXISTS bench_crises")
+    cur.execute(f"""
+        CREATE TABLE bench_crises (
+            id SERIAL PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED
+        )
+    """)
+    cur.execute("""
+        INSERT INTO bench_crises (title, description)
+        SELECT
+            initcap(w[1 + (random() * (cardinality(w) - 1))::int]) || ' in ' ||
+            initcap(w[1 + (random() * (cardinality(w) - 1))::int]),
+            array_to_string(ARRAY(SELECT w[1 + (random() * (cardinality(w) - 1))::int]
+                                  FROM generate_series(1, 8 + (g %% 25))), ' ')
+        FROM generate_series(1, %s) AS g, (SELECT %s::text[] AS w) AS words
+    """, (rows, WORDS))
+    cur.execute("CREATE INDEX ON bench_crises USING GIN (search_vector)")
+    cur.execute("ANALYZE bench_crises")
+
+
+def time_query(cur, sql: str, params: list, runs: int) -> float:
+    """Median wall time in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        cur.execute(sql, params)
+        cur.fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, runs: int, rebuild: bool):
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            if rebuild:
+                build_table(cur, rows)
+                raw_conn.commit()
+
+            logger.info(f"{'query':<22}{'ILIKE ms':>12}{'FTS ms':>12}{'speedup':>10}")
+            for term in SEARCH_TERMS:
+                ilike_clauses, ilike_params = [], []
+                for token in term.split():
+                    ilike_clauses.append("(title ILIKE %s OR description ILIKE %s)")
+                    ilike_params.extend([f"%{token}%", f"%{token}%"])
+                ilike_sql = f"SELECT COUNT(*) FROM bench_crises WHERE {' AND '.join(ilike_clauses)}"
+                fts_sql = f"SELECT COUNT(*) FROM bench_crises WHERE {MATCH_SQL}"
+
+                ilike_ms = time_query(cur, ilike_sql, ilike_params, runs)
+                fts_ms = time_query(cur, fts_sql, [build_tsquery(term)], runs)
+                logger.info(f"{term:<22}{ilike_ms:>12.1f}{fts_ms:>12.1f}{ilike_ms / fts_ms:>9.1f}x")
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-rebuild", action="store_true", help="Reuse an existing bench_crises table")
+    args = parser.parse_args()
+    run(args.rows, args.runs, rebuild=not args.no_rebuild)
@@ -0,0 +1,173 @@
+# backend/app/cache.py
+"""
+In-process caching helpers
+Cached API data is keyed on a data version counter that the ETL bumps whenever it writes
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy import text
+
+# How long an API process trusts its last read of the data version (seconds)
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", "5"))
+
+BUMP_DATA_VERSION_SQL = """
+    INSERT INTO data_version (id, version, updated_at) VALUES (1, 1, now())
+    ON CONFLICT (id) DO UPDATE
+    SET version = data_version.version + 1, updated_at = now()
+"""
+
+_version_lock = threading.Lock()
+_version_value: int | None = None
+_version_checked_at = 0.0
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping with a fixed number of entries"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches predicate; returns how many were dropped"""
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                del self._data[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+DATA_VERSION_SQL = "SELECT version FROM data_version WHERE id = 1"
+
+
+def _fresh_data_version() -> Optional[int]:
+    """The last version read, if it is younger than DATA_VERSION_TTL"""
+    if _version_value is not None and time.monotonic() - _version_checked_at < DATA_VERSION_TTL:
+        return _version_value
+    return None
+
+
+def _remember_data_version(row) -> int:
+    global _version_value, _version_checked_at
+    with _version_lock:
+        _version_value = int(row["version"]) if row else 0
+        _version_checked_at = time.monotonic()
+    return _version_value
+
+
+def get_data_version(cur) -> int:
+    """
+    Current data version, re-read from Postgres at most every DATA_VERSION_TTL seconds
+
+    Args:
+        cur: Open psycopg2 RealDictCursor
+    """
+    version = _fresh_data_version()
+    if version is not None:
+        return version
+    cur.execute(DATA_VERSION_SQL)
+    return _remember_data_version(cur.fetchone())
+
+
+async def get_data_version_async(cur) -> int:
+    """
+    get_data_version for the async read path
+
+    Args:
+        cur: Open psycopg 3 AsyncCursor with dict rows
+    """
+    version = _fresh_data_version()
+    if version is not None:
+        return version
+    await cur.execute(DATA_VERSION_SQL)
+    return _remember_data_version(await cur.fetchone())
+
+
+async def current_data_version(pool) -> int:
+    """
+    Data version for the async path that checks a connection out only once the TTL expired
+
+    Args:
+        pool: psycopg 3 AsyncConnectionPool with dict rows
+    """
+    version = _fresh_data_version()
+    if version is not None:
+        return version
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            return await get_data_version_async(cur)
+
+
+def bump_data_version(db, bbox: Optional[Tuple[float, float, float, float]] = None) -> int:
+    """
+    Invalidate every cache keyed on the data version
+    Call from the ETL inside the transaction that writes crises/charities.
+
+    Args:
+        db: SQLAlchemy session
+        bbox: (min_lon, min_lat, max_lon, max_lat) covering every crisis that changed,
+              letting the tile cache evict only affected tiles; None means "anywhere"
+
+    Returns:
+        The new data version
+    """
+    version = db.execute(text(BUMP_DATA_VERSION_SQL + " RETURNING version")).scalar()
+    min_lon, min_lat, max_lon, max_lat = bbox if bbox else (None, None, None, None)
+    db.execute(
+        text(
+            "INSERT INTO data_changes (version, min_lon, min_lat, max_lon, max_lat) "
+            "VALUES (:version, :min_lon, :min_lat, :max_lon, :max_lat)"
+        ),
+        {"version": version, "min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat},
+    )
+    # Keep a bounded history; readers that fall further behind simply flush everything
+    db.execute(text("DELETE FROM data_changes WHERE version <= :version - 1000"), {"version": version})
+    return version
+
+
+def bump_data_version_cursor(cur, bbox: Optional[Tuple[float, float, float, float]] = None) -> int:
+    """
+    bump_data_version for scripts that write through a raw psycopg2 connection
+
+    Args:
+        cur: psycopg2 cursor inside the writing transaction
+        bbox: (min_lon, min_lat, max_lon, max_lat) covering every crisis that changed, or None
+
+    Returns:
+        The new data version
+    """
+    cur.execute(BUMP_DATA_VERSION_SQL + " RETURNING version")
+    version = cur.fetchone()[0]
+    min_lon, min_lat, max_lon, max_lat = bbox if bbox else (None, None, None, None)
+    cur.execute(
+        "INSERT INTO data_changes (version, min_lon, min_lat, max_lon, max_lat) VALUES (%s, %s, %s, %s, %s)",
+        (version, min_lon, min_lat, max_lon, max_lat),
+    )
+    cur.execute("DELETE FROM data_changes WHERE version <= %s - 1000", (version,))
+    return version
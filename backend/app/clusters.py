@@ -0,0 +1,210 @@
+# backend/app/clusters.py
+"""
+Server-side map clustering
+Crises are aggregated into a Web Mercator grid per zoom level and cached until the ETL bumps the data version.
+Low zooms are aggregated over the whole world; above CLUSTER_WORLD_ZOOM only the viewport is,
+snapped outward to whole tiles so cells are never cut and neighbouring requests share cache entries.
+"""
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from .cache import LRUCache, get_data_version, get_data_version_async
+from .geo import BBox, bbox_clause, tile_bbox
+from .models import ACTIVE_CRISES_SQL
+
+# Grid cells per tile edge; 4 gives ~64px cells on 256px map tiles
+CELLS_PER_TILE = 4
+MAX_CLUSTER_ZOOM = 16
+# Most tiles one request may aggregate (a 4K screen shows ~150 256px tiles)
+MAX_CLUSTER_TILES = 256
+# Highest zoom whose whole-world grid fits in MAX_CLUSTER_TILES; above it a bbox is required
+CLUSTER_WORLD_ZOOM = int(math.log(MAX_CLUSTER_TILES, 4))
+
+# Web Mercator is undefined at the poles; clamp like the map renderer does
+MAX_MERCATOR_LAT = 85.0511
+
+_CLUSTER_SQL = f"""
+    SELECT cx, cy, category,
+           COUNT(*) AS count,
+           MAX(severity) AS max_severity,
+           SUM(latitude) AS lat_sum,
+           SUM(longitude) AS lon_sum,
+           MIN(id) AS min_id
+    FROM (
+        SELECT id, category, severity, latitude, longitude,
+               LEAST(FLOOR((longitude + 180) / 360 * %s), %s - 1)::int AS cx,
+               LEAST(FLOOR((1 - LN(TAN(RADIANS(lat)) + 1 / COS(RADIANS(lat))) / PI()) / 2 * %s), %s - 1)::int AS cy
+        FROM (
+            SELECT id, category, severity, latitude, longitude,
+                   GREATEST(LEAST(latitude, {MAX_MERCATOR_LAT}), -{MAX_MERCATOR_LAT}) AS lat
+            FROM crises
+            {{where_sql}}
+        ) clamped
+    ) cells
+    GROUP BY cx, cy, category
+"""
+
+# Inclusive tile index range (x0, y0, x1, y1); x0 > x1 when it wraps the antimeridian
+TileRange = Tuple[int, int, int, int]
+
+# (data version, zoom, category, tile range) -> list of cluster dicts covering that range
+_cluster_cache = LRUCache(maxsize=64)
+
+
+def _tile_xy(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    n = 2 ** z
+    lat = max(min(lat, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    x = math.floor((lon + 180) / 360 * n)
+    y = math.floor((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_range(z: int, bbox: Optional[BBox]) -> TileRange:
+    """
+    Tiles at zoom z covering bbox (the whole world for None)
+
+    Raises:
+        HTTPException(400) when the range spans more than MAX_CLUSTER_TILES tiles
+    """
+    n = 2 ** z
+    if bbox is None:
+        if z > CLUSTER_WORLD_ZOOM:
+            raise HTTPException(status_code=400, detail=f"bbox is required above zoom {CLUSTER_WORLD_ZOOM}")
+        return 0, 0, n - 1, n - 1
+
+    min_lon, min_lat, max_lon, max_lat = bbox
+    x0, y0 = _tile_xy(min_lon, max_lat, z)
+    x1, y1 = _tile_xy(max_lon, min_lat, z)
+    columns = x1 - x0 + 1 if min_lon <= max_lon else n - x0 + x1 + 1
+    if columns >= n:
+        x0, x1, columns = 0, n - 1, n
+    if columns * (y1 - y0 + 1) > MAX_CLUSTER_TILES:
+        raise HTTPException(
+            status_code=400, detail=f"bbox spans more than {MAX_CLUSTER_TILES} tiles at zoom {z}; zoom in or shrink it"
+        )
+    return x0, y0, x1, y1
+
+
+def _range_bbox(z: int, tiles: TileRange) -> BBox:
+    """Lon/lat bounds of a tile range (min_lon > max_lon when it wraps)"""
+    x0, y0, x1, y1 = tiles
+    min_lon, _, _, max_lat = tile_bbox(z, x0, y0)
+    _, min_lat, max_lon, _ = tile_bbox(z, x1, y1)
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _in_range(cx: int, cy: int, tiles: TileRange) -> bool:
+    """Whether grid cell (cx, cy) lies in a tile range"""
+    x0, y0, x1, y1 = (edge * CELLS_PER_TILE for edge in tiles)
+    if not y0 <= cy < y1 + CELLS_PER_TILE:
+        return False
+    if x0 <= x1:
+        return x0 <= cx < x1 + CELLS_PER_TILE
+    return cx >= x0 or cx < x1 + CELLS_PER_TILE
+
+
+def _aggregate(rows, tiles: TileRange) -> List[Dict]:
+    """Fold per-(cell, category) rows into one cluster per cell, keeping cells inside tiles"""
+    cells: Dict[tuple, Dict] = defaultdict(lambda: {
+        "count": 0, "max_severity": None, "lat_sum": 0.0, "lon_sum": 0.0,
+        "categories": {}, "min_id": None,
+    })
+    for row in rows:
+        # Points right on the range edge may round into a neighbouring, partly covered cell
+        if not _in_range(row["cx"], row["cy"], tiles):
+            continue
+        cell = cells[(row["cx"], row["cy"])]
+        cell["count"] += row["count"]
+        cell["lat_sum"] += row["lat_sum"]
+        cell["lon_sum"] += row["lon_sum"]
+        cell["categories"][row["category"]] = row["count"]
+        if row["max_severity"] is not None:
+            cell["max_severity"] = max(cell["max_severity"] or 0, row["max_severity"])
+        if cell["min_id"] is None or row["min_id"] < cell["min_id"]:
+            cell["min_id"] = row["min_id"]
+
+    clusters = []
+    for (cx, cy), cell in cells.items():
+        count = cell["count"]
+        clusters.append({
+            "x": cx,
+            "y": cy,
+            "count": count,
+            "max_severity": cell["max_severity"],
+            "categories": cell["categories"],
+            "latitude": cell["lat_sum"] / count,
+            "longitude": cell["lon_sum"] / count,
+            "crisis_id": cell["min_id"] if count == 1 else None,
+        })
+    clusters.sort(key=lambda c: c["count"], reverse=True)
+    return clusters
+
+
+def _cluster_query(z: int, category: Optional[str], tiles: TileRange) -> Tuple[str, List[object]]:
+    n = (2 ** z) * CELLS_PER_TILE
+    params: List[object] = [n, n, n, n]
+    where_sql = f"WHERE {ACTIVE_CRISES_SQL}"
+    if tiles != (0, 0, 2 ** z - 1, 2 ** z - 1):
+        box_sql, box_params = bbox_clause(_range_bbox(z, tiles))
+        where_sql += f" AND {box_sql}"
+        params += box_params
+    if category:
+        where_sql += " AND category = %s"
+        params.append(category)
+    return _CLUSTER_SQL.format(where_sql=where_sql), params
+
+
+def _cache_range(z: int, bbox: Optional[BBox]) -> TileRange:
+    """Range to aggregate and cache: the whole world at low zooms, else the viewport's tiles"""
+    return tile_range(z, None if z <= CLUSTER_WORLD_ZOOM else bbox)
+
+
+def _clip(clusters: List[Dict], z: int, bbox: Optional[BBox]) -> List[Dict]:
+    """Clusters of a whole-world grid that fall in the viewport's tiles"""
+    if bbox is None or z > CLUSTER_WORLD_ZOOM:
+        return clusters
+    tiles = tile_range(z, bbox)
+    return [c for c in clusters if _in_range(c["x"], c["y"], tiles)]
+
+
+def get_clusters(cur, z: int, category: Optional[str] = None, bbox: Optional[BBox] = None) -> List[Dict]:
+    """
+    Clusters for zoom level z in the tiles covering bbox, computed once per data version
+
+    Args:
+        cur: Open psycopg2 RealDictCursor
+        z: Map zoom level (0..MAX_CLUSTER_ZOOM)
+        category: Optional category filter
+        bbox: Viewport; required above CLUSTER_WORLD_ZOOM
+
+    Raises:
+        HTTPException(400) without a bbox above CLUSTER_WORLD_ZOOM, or when it spans too many tiles
+    """
+    tiles = _cache_range(z, bbox)
+    key = (get_data_version(cur), z, category, tiles)
+    clusters = _cluster_cache.get(key)
+    if clusters is None:
+        cur.execute(*_cluster_query(z, category, tiles))
+        clusters = _aggregate(cur.fetchall(), tiles)
+        _cluster_cache.set(key, clusters)
+    return _clip(clusters, z, bbox)
+
+
+async def get_clusters_async(cur, z: int, category: Optional[str] = None, bbox: Optional[BBox] = None) -> List[Dict]:
+    """
+    get_clusters for the async read path (shares its cache)
+
+    Args:
+        cur: Open psycopg 3 AsyncCursor with dict rows
+    """
+    tiles = _cache_range(z, bbox)
+    key = (await get_data_version_async(cur), z, category, tiles)
+    clusters = _cluster_cache.get(key)
+    if clusters is None:
+        await cur.execute(*_cluster_query(z, category, tiles))
+        clusters = _aggregate(await cur.fetchall(), tiles)
+        _cluster_cache.set(key, clusters)
+    return _clip(clusters, z, bbox)
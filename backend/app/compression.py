@@ -0,0 +1,76 @@
+# backend/app/compression.py
+"""
+Response compression
+Brotli for clients that accept it, gzip otherwise, on Starlette's GZip responder machinery
+(Vary header, streaming, big chunks compressed off the event loop). Media types that are
+already compressed or binary pass through untouched.
+"""
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import (
+    DEFAULT_EXCLUDED_CONTENT_TYPES, GZipResponder, IdentityResponder, _get_gzip_capacity_limiter,
+)
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Binary bodies that gain little or nothing from compression, on top of Starlette's defaults
+BINARY_MEDIA_TYPES = (
+    "application/vnd.apache.parquet",        # zstd row groups
+    "application/vnd.apache.arrow.stream",   # columnar; use parquet for a compact export
+    "application/vnd.mapbox-vector-tile",
+    "application/x-protobuf",
+    "application/octet-stream",
+)
+EXCLUDED_MEDIA_TYPES = DEFAULT_EXCLUDED_CONTENT_TYPES + BINARY_MEDIA_TYPES
+
+BROTLI_QUALITY = 4  # brotli-asgi's default: close to gzip -9 in size at a fraction of the CPU
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, *, exclude_content_types: tuple[str, ...]):
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self._compressor = None
+        self.thread_minimum_size = 128 * 1024
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            return await anyio.to_thread.run_sync(
+                self._compress_body, body, more_body, limiter=_get_gzip_capacity_limiter()
+            )
+        return self._compress_body(body, more_body)
+
+
+class CompressionMiddleware:
+    """Brotli (when installed and accepted) or gzip for responses of at least minimum_size bytes"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, exclude_content_types: tuple[str, ...] = EXCLUDED_MEDIA_TYPES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.exclude_content_types = exclude_content_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("Accept-Encoding", "")
+        if brotli is not None and "br" in accept_encoding:
+            responder_class = BrotliResponder
+        elif "gzip" in accept_encoding:
+            responder_class = GZipResponder
+        else:
+            responder_class = IdentityResponder
+        responder = responder_class(self.app, self.minimum_size, exclude_content_types=self.exclude_content_types)
+        await responder(scope, receive, send)
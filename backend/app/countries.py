@@ -0,0 +1,319 @@
+# backend/app/countries.py
+"""
+Offline country index
+ISO-3166 codes, names and centroids from the bundled app/data/countries.csv (dict lookups),
+and point-in-country reverse geocoding against Natural Earth admin-0 polygons compiled
+into flat NumPy arrays under app/data/country_polygons/ that are memory-mapped on load.
+Both the polygons (app/data/naturalearth_lowres/, the 1:110m admin-0 countries as shipped
+with geopandas 0.13) and the compiled arrays are bundled; lookups never touch the network.
+
+Usage (rebuild the bundled .npy files, then commit them):
+    python -m app.countries                                   # compile the bundled polygons
+    python -m app.countries --shapefile ne_110m_admin_0_countries.shp   # compile another copy
+    python -m app.countries --download                        # fetch the latest 110m release first
+"""
+import argparse
+import csv
+import io
+import logging
+import re
+import struct
+import tempfile
+import threading
+import unicodedata
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ISO_TABLE = Path(__file__).parent / "data" / "countries.csv"
+POLYGON_URL = "https://naciscdn.org/naturalearth/110m/cultural/ne_110m_admin_0_countries.zip"
+POLYGON_SHAPEFILE = Path(__file__).parent / "data" / "naturalearth_lowres" / "naturalearth_lowres.shp"
+INDEX_DIR = Path(__file__).parent / "data" / "country_polygons"
+INDEX_ARRAYS = ("edges", "edge_offsets", "bboxes", "codes")
+
+
+class Country(NamedTuple):
+    alpha2: str
+    alpha3: str
+    name: str
+    latitude: float
+    longitude: float
+
+
+# Alternative spellings seen in upstream feeds (UN names, older names, short forms)
+ALIASES = {
+    "usa": "US", "united states of america": "US", "uk": "GB", "great britain": "GB",
+    "russian federation": "RU", "iran (islamic republic of)": "IR", "syrian arab republic": "SY",
+    "viet nam": "VN", "lao people's democratic republic": "LA", "lao pdr": "LA",
+    "republic of korea": "KR", "korea": "KR", "democratic people's republic of korea": "KP",
+    "bolivia (plurinational state of)": "BO", "venezuela (bolivarian republic of)": "VE",
+    "united republic of tanzania": "TZ", "democratic republic of congo": "CD", "dr congo": "CD",
+    "congo": "CG", "czech republic": "CZ", "turkiye": "TR", "burma": "MM", "ivory coast": "CI",
+    "east timor": "TL", "swaziland": "SZ", "macedonia": "MK", "cabo verde": "CV",
+    "micronesia (federated states of)": "FM", "federated states of micronesia": "FM",
+    "state of palestine": "PS", "occupied palestinian territory": "PS",
+    "republic of moldova": "MD", "the bahamas": "BS", "the gambia": "GM",
+}
+
+
+def _normalize_name(name: str) -> str:
+    """Lowercase, accent-free, single-spaced"""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"\s+", " ", ascii_name).strip().lower()
+
+
+def _load_table() -> Tuple[Dict[str, Country], Dict[str, Country]]:
+    """code (alpha-2 and alpha-3) -> Country, normalized name -> Country"""
+    by_code: Dict[str, Country] = {}
+    by_name: Dict[str, Country] = {}
+    with open(ISO_TABLE, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            country = Country(
+                row["alpha2"], row["alpha3"], row["name"], float(row["latitude"]), float(row["longitude"])
+            )
+            by_code[country.alpha2] = country
+            by_code[country.alpha3] = country
+            by_name[_normalize_name(country.name)] = country
+    for alias, alpha2 in ALIASES.items():
+        by_name[alias] = by_code[alpha2]
+    return by_code, by_name
+
+
+_BY_CODE, _BY_NAME = _load_table()
+
+
+def get(code: Optional[str]) -> Optional[Country]:
+    """Country by ISO alpha-2 or alpha-3 code (any case)"""
+    if not code:
+        return None
+    return _BY_CODE.get(code.strip().upper())
+
+
+def iso3_to_iso2(iso3: Optional[str]) -> Optional[str]:
+    """ISO alpha-3 -> alpha-2, None if unknown"""
+    country = get(iso3)
+    return country.alpha2 if country else None
+
+
+def centroid(code: Optional[str]) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) of a country's centroid, None if unknown"""
+    country = get(code)
+    return (country.latitude, country.longitude) if country else None
+
+
+def all_countries() -> List[Country]:
+    """Every country in the table, by alpha-2 code"""
+    return sorted({country.alpha2: country for country in _BY_CODE.values()}.values())
+
+
+def by_name(name: Optional[str]) -> Optional[Country]:
+    """Country by English name or common alias (case and accent insensitive)"""
+    if not name:
+        return None
+    return _BY_NAME.get(_normalize_name(name))
+
+
+# --- Polygon index ---------------------------------------------------------------
+
+class PolygonIndex(NamedTuple):
+    """
+    edges:        (E, 4) x1, y1, x2, y2 of every ring segment, grouped by country
+    edge_offsets: (C + 1,) start of each country's edges
+    bboxes:       (C, 4) min_lon, min_lat, max_lon, max_lat
+    codes:        (C,) alpha-2 code of each country
+    """
+    edges: np.ndarray
+    edge_offsets: np.ndarray
+    bboxes: np.ndarray
+    codes: np.ndarray
+
+
+def _read_shp_polygons(path: Path) -> List[List[np.ndarray]]:
+    """Rings (n x 2 lon/lat arrays) of every record in an ESRI Polygon shapefile"""
+    data = path.read_bytes()
+    records = []
+    pos = 100
+    while pos < len(data):
+        _, length = struct.unpack(">ii", data[pos:pos + 8])
+        content = data[pos + 8:pos + 8 + length * 2]
+        pos += 8 + length * 2
+
+        shape_type = struct.unpack("<i", content[:4])[0]
+        if shape_type == 0:  # Null shape
+            records.append([])
+            continue
+        num_parts, num_points = struct.unpack("<ii", content[36:44])
+        parts = np.frombuffer(content, dtype="<i4", count=num_parts, offset=44)
+        points = np.frombuffer(content, dtype="<f8", count=num_points * 2, offset=44 + 4 * num_parts)
+        points = points.reshape(-1, 2)
+        bounds = list(parts) + [num_points]
+        records.append([points[bounds[i]:bounds[i + 1]] for i in range(num_parts)])
+    return records
+
+
+def _read_dbf(path: Path, encoding: str = "utf-8") -> List[Dict[str, str]]:
+    """Attribute rows of a dBase III file, all values as stripped strings"""
+    data = path.read_bytes()
+    num_records, header_len, record_len = struct.unpack("<IHH", data[4:12])
+    fields = []
+    pos = 32
+    while data[pos] != 0x0D:
+        name = data[pos:pos + 11].split(b"\0", 1)[0].decode("ascii")
+        fields.append((name, data[pos + 16]))
+        pos += 32
+
+    rows = []
+    for i in range(num_records):
+        record = data[header_len + i * record_len:header_len + (i + 1) * record_len]
+        row, offset = {}, 1  # first byte is the deletion flag
+        for name, size in fields:
+            row[name] = record[offset:offset + size].decode(encoding, "replace").strip()
+            offset += size
+        rows.append(row)
+    return rows
+
+
+def _record_code(attributes: Dict[str, str]) -> Optional[str]:
+    """
+    Alpha-2 code of a Natural Earth admin-0 record
+    ISO codes are -99 for a few countries (Kosovo), which are matched by name instead;
+    field names are upper case in the Natural Earth release and lower case in geopandas' copy.
+    """
+    attributes = {field.upper(): value for field, value in attributes.items()}
+    for field in ("ISO_A2_EH", "ISO_A2"):
+        country = get(attributes.get(field))
+        if country and len(attributes[field]) == 2:
+            return country.alpha2
+    for field in ("ISO_A3_EH", "ISO_A3", "ADM0_A3"):
+        country = get(attributes.get(field))
+        if country:
+            return country.alpha2
+    for field in ("NAME_LONG", "NAME"):
+        country = by_name(attributes.get(field))
+        if country:
+            return country.alpha2
+    return None
+
+
+def download_polygons(target: Path) -> Path:
+    """Download and unpack the Natural Earth admin-0 shapefile into target; returns the .shp path"""
+    logger.info("🌍 Downloading Natural Earth country polygons...")
+    response = httpx.get(POLYGON_URL, timeout=60, follow_redirects=True)
+    response.raise_for_status()
+    with zipfile.ZipFile(io.BytesIO(response.content)) as z:
+        z.extractall(target)
+    logger.info("✅ Country polygons downloaded")
+    return next(target.glob("*.shp"))
+
+
+def build_polygon_index(shp: Path, index_dir: Path = INDEX_DIR) -> PolygonIndex:
+    """
+    Compile an admin-0 shapefile (with its .dbf alongside) into flat arrays
+
+    Args:
+        shp: Path of the .shp file
+        index_dir: Directory the .npy arrays are written to
+
+    Returns:
+        The compiled index
+    """
+    cpg = shp.with_suffix(".cpg")
+    encoding = cpg.read_text().strip() if cpg.exists() else "utf-8"
+    rings_by_record = _read_shp_polygons(shp)
+    attributes = _read_dbf(shp.with_suffix(".dbf"), encoding)
+
+    edges, offsets, bboxes, codes = [], [0], [], []
+    for rings, row in zip(rings_by_record, attributes):
+        code = _record_code(row)
+        if code is None or not rings:
+            continue
+        # Segments never join consecutive rings, so holes fall out of the even-odd rule
+        segments = np.concatenate([np.hstack([ring[:-1], ring[1:]]) for ring in rings])
+        points = np.concatenate(rings)
+        edges.append(segments)
+        offsets.append(offsets[-1] + len(segments))
+        bboxes.append([points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()])
+        codes.append(code)
+
+    index = PolygonIndex(
+        edges=np.ascontiguousarray(np.concatenate(edges), dtype=np.float64),
+        edge_offsets=np.array(offsets, dtype=np.int64),
+        bboxes=np.array(bboxes, dtype=np.float64),
+        codes=np.array(codes, dtype="<U2"),
+    )
+    index_dir.mkdir(parents=True, exist_ok=True)
+    for name in INDEX_ARRAYS:
+        np.save(index_dir / f"{name}.npy", getattr(index, name))
+    logger.info(f"✅ Country polygon index built: {len(codes)} countries, {len(index.edges)} edges")
+    return index
+
+
+_index: Optional[PolygonIndex] = None
+_index_failed = False
+_index_lock = threading.Lock()
+
+
+def _polygon_index() -> Optional[PolygonIndex]:
+    """Memory-mapped bundled index, loaded on first use; None if it is missing or unreadable"""
+    global _index, _index_failed
+    if _index is not None or _index_failed:
+        return _index
+    with _index_lock:
+        if _index is None and not _index_failed:
+            try:
+                _index = PolygonIndex(*(
+                    np.load(INDEX_DIR / f"{name}.npy", mmap_mode="r") for name in INDEX_ARRAYS
+                ))
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    f"⚠️ Country polygon index unavailable, reverse geocoding disabled "
+                    f"(rebuild it with python -m app.countries): {e}"
+                )
+                _index_failed = True
+    return _index
+
+
+def country_at(latitude: float, longitude: float) -> Optional[str]:
+    """
+    Alpha-2 code of the country containing a point, None at sea (or without polygons)
+
+    Candidates are found by bounding box, then tested by even-odd ray casting over
+    all of the country's edges at once.
+    """
+    index = _polygon_index()
+    if index is None:
+        return None
+
+    bboxes = index.bboxes
+    candidates = np.nonzero(
+        (bboxes[:, 0] <= longitude) & (longitude <= bboxes[:, 2])
+        & (bboxes[:, 1] <= latitude) & (latitude <= bboxes[:, 3])
+    )[0]
+    for i in candidates:
+        x1, y1, x2, y2 = index.edges[index.edge_offsets[i]:index.edge_offsets[i + 1]].T
+        spans = (y1 > latitude) != (y2 > latitude)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x1 + (latitude - y1) * (x2 - x1) / (y2 - y1)
+        if np.count_nonzero(spans & (longitude < crossing_x)) % 2:
+            return str(index.codes[i])
+    return None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Compile the country polygon index into app/data/country_polygons")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--shapefile", type=Path, default=POLYGON_SHAPEFILE,
+                        help="admin-0 .shp to compile (default: the bundled 1:110m polygons)")
+    source.add_argument("--download", action="store_true", help="Download the latest 1:110m release and compile it")
+    args = parser.parse_args()
+    if args.download:
+        with tempfile.TemporaryDirectory() as download_dir:
+            build_polygon_index(download_polygons(Path(download_dir)))
+    else:
+        build_polygon_index(args.shapefile)
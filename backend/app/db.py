@@ -2,8 +2,15 @@
 Database connection and session management
 """
 import os
+import threading
+import time
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,11 +19,102 @@ load_dotenv()
 # Database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/globemap")
 
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Pool settings; size the pool so workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) fits max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections older than this many seconds are replaced on checkout (-1 keeps them forever)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Pre-ping costs a round trip per checkout; turn it off to rely on DB_POOL_RECYCLE instead
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", True)
+# Behind PgBouncer (transaction pooling): don't hold server connections in-process and
+# don't use server-side prepared statements, which don't survive a connection switch
+DB_PGBOUNCER = _env_flag("DB_PGBOUNCER", False)
+
+
+class PoolWaitStats:
+    """Thread-safe running totals of how long checkouts waited for a connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.total_wait * 1000, 3),
+                "wait_ms_avg": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class _TimedCheckoutMixin:
+    """Records the time each checkout spends waiting for (or opening) a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+def _engine_options() -> dict:
+    if DB_PGBOUNCER:
+        # PgBouncer owns the pooling; every checkout opens a cheap client connection to it
+        return {"poolclass": TimedNullPool, "pool_pre_ping": False}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
     echo=False,  # Set to True for SQL query logging
+    **_engine_options(),
 )
 
 # Create SessionLocal class
@@ -25,6 +123,74 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Backward compatibility alias
 conn = engine
 
+# Async pool (psycopg 3) for the read endpoints; opened and closed by the app lifespan.
+# Takes the same DATABASE_URL, minus the SQLAlchemy driver suffix.
+ASYNC_POOL_MIN_SIZE = int(os.getenv("ASYNC_POOL_MIN_SIZE", "2"))
+ASYNC_POOL_MAX_SIZE = int(os.getenv("ASYNC_POOL_MAX_SIZE", "20"))
+
+
+def libpq_conninfo(url: str) -> str:
+    """libpq connection string for a SQLAlchemy URL such as postgresql+psycopg2://..."""
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+_async_connect_kwargs = {"row_factory": dict_row}
+if DB_PGBOUNCER:
+    _async_connect_kwargs["prepare_threshold"] = None
+
+async_pool = AsyncConnectionPool(
+    libpq_conninfo(DATABASE_URL),
+    min_size=ASYNC_POOL_MIN_SIZE,
+    max_size=ASYNC_POOL_MAX_SIZE,
+    kwargs=_async_connect_kwargs,
+    timeout=DB_POOL_TIMEOUT,
+    max_lifetime=DB_POOL_RECYCLE if DB_POOL_RECYCLE > 0 else float("inf"),
+    check=AsyncConnectionPool.check_connection if DB_POOL_PRE_PING else None,
+    open=False,
+)
+
+
+def pool_status() -> dict:
+    """
+    Settings and live metrics of both connection pools
+
+    Returns:
+        {"sync": SQLAlchemy pool, "async": psycopg pool}; wait times are in milliseconds
+    """
+    pool = engine.pool
+    sync = {
+        "mode": "pgbouncer" if DB_PGBOUNCER else "queue",
+        "pre_ping": DB_POOL_PRE_PING and not DB_PGBOUNCER,
+        "recycle_s": DB_POOL_RECYCLE,
+        **pool_wait_stats.snapshot(),
+    }
+    if isinstance(pool, QueuePool):
+        sync.update({
+            "size": pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "timeout_s": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # Negative while the pool is still below pool_size
+            "overflow": pool.overflow(),
+        })
+
+    stats = async_pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    async_status = {
+        "min_size": async_pool.min_size,
+        "max_size": async_pool.max_size,
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "checked_out": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "checkouts": requests,
+        "timeouts": stats.get("requests_errors", 0),
+        "wait_ms_total": stats.get("requests_wait_ms", 0),
+        "wait_ms_avg": round(stats.get("requests_wait_ms", 0) / requests, 3) if requests else 0.0,
+    }
+    return {"sync": sync, "async": async_status}
+
 
 def get_db():
     """
@@ -0,0 +1,196 @@
+# backend/app/etl/backfill.py
+"""
+ReliefWeb Historical Backfill
+Walks the full disaster history with offset/limit pagination, fetching up to
+BACKFILL_CONCURRENCY pages at once. Each page is upserted in its own transaction together
+with the checkpoint (the offset below which every page is stored), so an interrupted run
+picks up where it stopped and a finished one only fetches disasters added since.
+
+Usage:
+    python -m app.etl.backfill                 # start, or resume from the checkpoint
+    python -m app.etl.backfill --restart       # ignore the checkpoint and start at offset 0
+    python -m app.etl.backfill --active-only   # only alert/ongoing disasters
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.cache import bump_data_version
+from app.db import SessionLocal, engine
+from app.models import Base
+from app.integrations.reliefweb_client import MAX_PAGE_SIZE, fetch_reliefweb_page
+from app.integrations import http_client
+from app.etl.sync import apply_crisis_batch, points_bbox, relink_charities, write_mark
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SOURCE = "reliefweb"
+PAGE_SIZE = MAX_PAGE_SIZE
+
+# Pages in flight at once (the shared HTTP client also enforces ReliefWeb's rate limit)
+BACKFILL_CONCURRENCY = 4
+
+
+def load_checkpoint(db: Session, query: str) -> int:
+    """Offset to resume from; 0 when there is no checkpoint for this query"""
+    row = db.execute(
+        text("SELECT query, next_offset FROM backfill_checkpoints WHERE source = :source"),
+        {"source": SOURCE},
+    ).first()
+    if row is None or row.query != query:
+        return 0
+    return row.next_offset
+
+
+def save_checkpoint(db: Session, query: str, next_offset: int, total: int, completed: bool = False) -> None:
+    db.execute(
+        text("""
+            INSERT INTO backfill_checkpoints (source, query, next_offset, total, completed_at, updated_at)
+            VALUES (:source, :query, :next_offset, :total, CASE WHEN :completed THEN now() END, now())
+            ON CONFLICT (source) DO UPDATE
+            SET query = excluded.query, next_offset = excluded.next_offset, total = excluded.total,
+                completed_at = excluded.completed_at, updated_at = now()
+        """),
+        {"source": SOURCE, "query": query, "next_offset": next_offset, "total": total, "completed": completed},
+    )
+
+
+def store_page(crises: List[Dict], query: str, next_offset: int, total: int) -> Dict:
+    """
+    Upsert one page and move the checkpoint in the same transaction
+
+    Returns:
+        {"upserted": int, "mark": newest date.created on the page}
+    """
+    db: Session = SessionLocal()
+    try:
+        touched, upserted, _, mark = apply_crisis_batch(db, SOURCE, crises, False, [])
+        if touched:
+            bump_data_version(db, points_bbox(touched))
+        save_checkpoint(db, query, next_offset, total)
+        db.commit()
+        return {"upserted": upserted, "mark": mark}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def finish_backfill(query: str, next_offset: int, total: int, mark: Optional[datetime]) -> None:
+    """Mark the checkpoint complete, hand the newest date to incremental sync and relink charities"""
+    db: Session = SessionLocal()
+    try:
+        save_checkpoint(db, query, next_offset, total, completed=True)
+        marks = {source: hwm for source, hwm in db.execute(text("SELECT source, high_water_mark FROM sync_state"))}
+        write_mark(db, SOURCE, mark, marks)
+        relinked = relink_charities(db)
+        if relinked:
+            bump_data_version(db)
+        db.commit()
+        logger.info(f"🔗 Relinked {relinked} charities")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def backfill(active_only: bool = False, restart: bool = False) -> None:
+    """
+    Load every ReliefWeb disaster page by page
+
+    Pages are fetched concurrently but the checkpoint only advances over the contiguous
+    prefix of stored pages; a page stored past it is simply upserted again on resume.
+    """
+    query = f"page_size={PAGE_SIZE};active_only={active_only}"
+
+    db = SessionLocal()
+    try:
+        start = 0 if restart else load_checkpoint(db, query)
+    finally:
+        db.close()
+
+    # The first page tells us how many there are
+    first_page, total = await fetch_reliefweb_page(start, PAGE_SIZE, active_only)
+    pages = max(0, -(-(total - start) // PAGE_SIZE))
+    logger.info(f"📚 ReliefWeb backfill: {total} disasters, resuming at offset {start} ({pages} pages to go)")
+
+    watermark = start
+    finished: Set[int] = set()
+    upserted = 0
+    newest: Optional[datetime] = None
+
+    async def store(offset: int, crises: List[Dict]) -> None:
+        nonlocal watermark, upserted, newest
+        finished.add(offset)
+        while watermark in finished:
+            finished.discard(watermark)
+            watermark += PAGE_SIZE
+        next_offset = min(watermark, total)
+        result = await asyncio.to_thread(store_page, crises, query, next_offset, total)
+        upserted += result["upserted"]
+        if result["mark"] and (newest is None or result["mark"] > newest):
+            newest = result["mark"]
+        logger.info(f"📄 offset {offset}: {len(crises)} crises, {result['upserted']} upserted "
+                    f"(checkpoint {next_offset}/{total})")
+
+    if start < total:
+        await store(start, first_page)
+
+    offsets = iter(range(start + PAGE_SIZE, total, PAGE_SIZE))
+    tasks: Dict[asyncio.Task, int] = {}
+
+    def schedule() -> None:
+        while len(tasks) < BACKFILL_CONCURRENCY:
+            offset = next(offsets, None)
+            if offset is None:
+                return
+            tasks[asyncio.create_task(fetch_reliefweb_page(offset, PAGE_SIZE, active_only))] = offset
+
+    try:
+        schedule()
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                offset = tasks.pop(task)
+                crises, _ = task.result()
+                await store(offset, crises)
+            schedule()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.error(f"❌ Backfill interrupted; rerun to resume from offset {min(watermark, total)}")
+        raise
+
+    await asyncio.to_thread(finish_backfill, query, min(watermark, total), total, newest)
+    logger.info(f"✅ ReliefWeb backfill complete: {upserted} crises upserted")
+
+
+async def main(active_only: bool = False, restart: bool = False):
+    """
+    Main async entry point
+    """
+    Base.metadata.create_all(bind=engine)
+    try:
+        await backfill(active_only=active_only, restart=restart)
+    finally:
+        await http_client.close_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paginated full-history ReliefWeb load")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the first page")
+    parser.add_argument("--active-only", action="store_true", help="Only alert/ongoing disasters")
+    args = parser.parse_args()
+    asyncio.run(main(active_only=args.active_only, restart=args.restart))
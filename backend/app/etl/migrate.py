@@ -6,6 +6,7 @@ Adds new columns to existing tables without losing data
 from sqlalchemy import text
 from app.db import SessionLocal, engine
 from app.models import Base
+from app.search import SEARCH_VECTOR_SQL
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +29,17 @@ def migrate_database():
             "ALTER TABLE crises ADD COLUMN IF NOT EXISTS source_id VARCHAR UNIQUE;",
             "ALTER TABLE crises ADD COLUMN IF NOT EXISTS last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP;",
             "CREATE INDEX IF NOT EXISTS idx_crises_country_code ON crises(country_code);",
+            # Composite indexes backing keyset pagination in routers/crises.py
+            "CREATE INDEX IF NOT EXISTS idx_crises_severity_id ON crises ((COALESCE(severity, 0)) DESC, id DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_crises_last_updated_id ON crises ((COALESCE(last_updated, '-infinity')) DESC, id DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_crises_category_severity_id ON crises (category, (COALESCE(severity, 0)) DESC, id DESC);",
+            # Stored full-text search vector, maintained by Postgres on insert/update
+            f"ALTER TABLE crises ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED;",
+            "CREATE INDEX IF NOT EXISTS idx_crises_search_vector ON crises USING GIN (search_vector);",
+            # Soft delete for incremental sync (etl/sync.py)
+            "ALTER TABLE crises ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP;",
+            # Built-in GiST index for viewport / radius queries (app/geo.py)
+            "CREATE INDEX IF NOT EXISTS idx_crises_location ON crises USING GIST (point(longitude, latitude));",
         ]
         
         for sql in crisis_migrations:
@@ -51,6 +63,9 @@ def migrate_database():
             "CREATE INDEX IF NOT EXISTS idx_charities_country_code ON charities(country_code);",
             "CREATE INDEX IF NOT EXISTS idx_charities_related_crisis ON charities(related_crisis_id);",
             "CREATE INDEX IF NOT EXISTS idx_charities_crisis ON charities(crisis_id);",
+            # Composite indexes backing filtered keyset pagination in routers/charities.py
+            "CREATE INDEX IF NOT EXISTS idx_charities_country_code_id ON charities (country_code, id DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_charities_source_id ON charities (source, id DESC);",
         ]
         
         for sql in charity_migrations:
@@ -62,6 +77,38 @@ def migrate_database():
                 logger.warning(f"⚠️ Migration already applied or failed: {sql} - {e}")
                 db.rollback()
         
+        # Data version counter used to invalidate API caches after ETL runs
+        try:
+            db.execute(text(
+                "CREATE TABLE IF NOT EXISTS data_version ("
+                "id INTEGER PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0, "
+                "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);"
+            ))
+            db.execute(text("INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;"))
+            db.execute(text(
+                "CREATE TABLE IF NOT EXISTS data_changes ("
+                "id SERIAL PRIMARY KEY, version INTEGER NOT NULL, "
+                "min_lon DOUBLE PRECISION, min_lat DOUBLE PRECISION, "
+                "max_lon DOUBLE PRECISION, max_lat DOUBLE PRECISION, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);"
+            ))
+            db.execute(text("CREATE INDEX IF NOT EXISTS idx_data_changes_version ON data_changes(version);"))
+            db.execute(text(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "source VARCHAR PRIMARY KEY, high_water_mark TIMESTAMP, "
+                "last_synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);"
+            ))
+            db.execute(text(
+                "CREATE TABLE IF NOT EXISTS backfill_checkpoints ("
+                "source VARCHAR PRIMARY KEY, query VARCHAR NOT NULL, next_offset INTEGER NOT NULL DEFAULT 0, "
+                "total INTEGER, completed_at TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);"
+            ))
+            db.commit()
+            logger.info("✅ Data version tables ready")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not create data version tables: {e}")
+            db.rollback()
+
         # Update last_updated for existing records
         try:
             db.execute(text("UPDATE crises SET last_updated = CURRENT_TIMESTAMP WHERE last_updated IS NULL;"))
@@ -4,15 +4,21 @@ Fetches data from multiple external APIs and seeds the database
 """
 import asyncio
 import logging
+import time
+from datetime import datetime
+from sqlalchemy import insert, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from typing import List, Dict, Set
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from app.db import SessionLocal, engine
+from app.cache import bump_data_version
 from app.models import Base, Crisis, Charity
 from app.integrations.reliefweb_client import fetch_reliefweb_crises
 from app.integrations.usgs_client import fetch_usgs_earthquakes
 from app.integrations.everyorg_client import fetch_everyorg_charities
 from app.integrations.opencollective_client import fetch_opencollective_charities
+from app.integrations import http_client
 
 # Configure logging
 logging.basicConfig(
@@ -52,12 +58,42 @@ async def fetch_all_crises() -> List[Dict]:
     return all_crises
 
 
-async def fetch_charities_by_countries(country_codes: Set[str]) -> List[Dict]:
+# Every.org lookups in flight at once; request pacing comes from the shared HTTP rate limiter
+EVERYORG_CONCURRENCY = 8
+EVERYORG_PER_COUNTRY = 5
+
+
+def tally_countries(crises_data: Iterable[Dict], stats: Dict[str, Tuple[int, int]]) -> None:
+    """Fold crises into per-country (max severity, crisis count), in place"""
+    for crisis in crises_data:
+        country_code = crisis.get("country_code")
+        if not country_code or crisis.get("deleted"):
+            continue
+        max_severity, count = stats.get(country_code, (0, 0))
+        stats[country_code] = (max(max_severity, crisis.get("severity") or 0), count + 1)
+
+
+def rank_countries(stats: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Country codes from tally_countries, most urgent first"""
+    return sorted(stats, key=lambda code: (-stats[code][0], -stats[code][1], code))
+
+
+def rank_countries_by_severity(crises_data: List[Dict]) -> List[str]:
+    """Country codes ordered by their most severe crisis (then crisis count), most urgent first"""
+    stats: Dict[str, Tuple[int, int]] = {}
+    tally_countries(crises_data, stats)
+    return rank_countries(stats)
+
+
+async def fetch_charities_by_countries(country_codes: Sequence[str]) -> List[Dict]:
     """
     Fetch charities for specific countries + global charities
     
+    Countries are scheduled in the given order (see rank_countries_by_severity)
+    with at most EVERYORG_CONCURRENCY lookups in flight.
+    
     Args:
-        country_codes: Set of ISO 2-letter country codes
+        country_codes: ISO 2-letter country codes, most important first
         
     Returns:
         List of normalized charity dictionaries
@@ -67,41 +103,147 @@ async def fetch_charities_by_countries(country_codes: Set[str]) -> List[Dict]:
     logger.info("=" * 80)
     
     all_charities = []
+    country_codes = [code for code in dict.fromkeys(country_codes) if code]  # Dedupe, keep order
     
     # 1. Fetch global charities from OpenCollective
     logger.info("Fetching global charities from OpenCollective...")
-    opencollective_charities = await fetch_opencollective_charities(
+    opencollective_task = asyncio.create_task(fetch_opencollective_charities(
         keywords=["disaster relief", "humanitarian", "crisis response"],
         limit=10
-    )
-    all_charities.extend(opencollective_charities)
+    ))
     
     # 2. Fetch country-specific charities from Every.org
     logger.info(f"Fetching country-specific charities for {len(country_codes)} countries...")
+    semaphore = asyncio.Semaphore(EVERYORG_CONCURRENCY)
+    latencies: Dict[str, float] = {}
+    
+    async def fetch_country(country_code: str) -> List[Dict]:
+        # Semaphore waiters are woken in FIFO order, so severe countries go first
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                return await fetch_everyorg_charities(country_code, limit=EVERYORG_PER_COUNTRY)
+            finally:
+                latencies[country_code] = time.perf_counter() - started
     
-    # Limit to avoid rate limiting
-    limited_countries = list(country_codes)[:10]
+    country_results = await asyncio.gather(
+        *(fetch_country(code) for code in country_codes),
+        return_exceptions=True,
+    )
+    
+    for country_code, result in zip(country_codes, country_results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ Failed to fetch charities for {country_code}: {result}")
+        else:
+            all_charities.extend(result)
     
-    tasks = []
-    for country_code in limited_countries:
-        if country_code:  # Skip None values
-            tasks.append(fetch_everyorg_charities(country_code, limit=5))
-            # Small delay between requests
-            await asyncio.sleep(0.3)
+    if latencies:
+        ordered = sorted(latencies.values())
+        slowest = sorted(latencies.items(), key=lambda item: item[1], reverse=True)[:5]
+        logger.info(
+            f"⏱️  Every.org latency over {len(ordered)} countries: "
+            f"p50={ordered[len(ordered) // 2]:.2f}s max={ordered[-1]:.2f}s "
+            f"slowest={', '.join(f'{code}={secs:.2f}s' for code, secs in slowest)}"
+        )
+        for country_code in country_codes:
+            logger.debug(f"   {country_code}: {latencies.get(country_code, 0):.2f}s")
     
-    if tasks:
-        country_results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in country_results:
-            if isinstance(result, Exception):
-                logger.error(f"❌ Failed to fetch charities: {result}")
-            else:
-                all_charities.extend(result)
+    all_charities.extend(await opencollective_task)
     
     logger.info(f"✅ Total charities fetched: {len(all_charities)}")
     return all_charities
 
 
+CRISIS_COLUMNS = [
+    "title", "category", "severity", "latitude", "longitude",
+    "country_code", "description", "source", "source_id",
+]
+CHARITY_COLUMNS = [
+    "name", "description", "website", "logo_url", "donation_url", "country_code", "source",
+]
+UPSERT_BATCH_SIZE = 1000
+
+
+def dedupe_crises(crises_data: List[Dict]) -> List[Dict]:
+    """Keep the first crisis seen for each source_id (crises without one are all kept)"""
+    seen = set()
+    unique = []
+    for crisis_dict in crises_data:
+        source_id = crisis_dict.get("source_id")
+        if source_id:
+            if source_id in seen:
+                logger.debug(f"Skipping duplicate crisis: {source_id}")
+                continue
+            seen.add(source_id)
+        unique.append(crisis_dict)
+    return unique
+
+
+def upsert_crises(db: Session, crises_data: List[Dict]) -> List[Tuple[float, float]]:
+    """
+    INSERT ... ON CONFLICT (source_id) DO UPDATE, one statement per batch
+    
+    Rows whose values are unchanged (and not soft-deleted) are left untouched,
+    so re-running on the same data writes nothing.
+    
+    Returns:
+        (latitude, longitude) of every row inserted or updated
+    """
+    now = datetime.utcnow()
+    rows = [
+        {**{col: crisis_dict.get(col) for col in CRISIS_COLUMNS}, "last_updated": now}
+        for crisis_dict in dedupe_crises(crises_data)
+    ]
+    update_cols = [col for col in CRISIS_COLUMNS if col != "source_id"]
+    table = Crisis.__table__
+    
+    changed = []
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = pg_insert(table).values(rows[start:start + UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source_id"],
+            set_={
+                **{col: stmt.excluded[col] for col in update_cols},
+                "last_updated": stmt.excluded.last_updated,
+                "deleted_at": None,
+            },
+            where=or_(
+                tuple_(*(table.c[col] for col in update_cols)).is_distinct_from(
+                    tuple_(*(stmt.excluded[col] for col in update_cols))
+                ),
+                table.c.deleted_at.isnot(None),
+            ),
+        ).returning(table.c.latitude, table.c.longitude)
+        changed.extend(tuple(row) for row in db.execute(stmt))
+    return changed
+
+
+def crisis_ids_by_country(db: Session) -> Dict[str, int]:
+    """country_code -> id of the most severe crisis in that country"""
+    result = db.execute(text("""
+        SELECT DISTINCT ON (country_code) country_code, id
+        FROM crises
+        WHERE country_code IS NOT NULL AND deleted_at IS NULL
+        ORDER BY country_code, COALESCE(severity, 0) DESC, id
+    """))
+    return {country_code: crisis_id for country_code, crisis_id in result}
+
+
+def insert_charities(db: Session, charities_data: List[Dict], country_map: Dict[str, int]) -> int:
+    """Bulk insert charities, linking each to a crisis in the same country"""
+    rows = []
+    for charity_dict in charities_data:
+        crisis_id = country_map.get(charity_dict.get("country_code"))
+        row = {col: charity_dict.get(col) for col in CHARITY_COLUMNS}
+        row["related_crisis_id"] = crisis_id
+        row["crisis_id"] = crisis_id  # Legacy field
+        rows.append(row)
+    
+    if rows:
+        db.execute(insert(Charity.__table__), rows)
+    return len(rows)
+
+
 def seed_database(crises_data: List[Dict], charities_data: List[Dict]):
     """
     Seed the database with crises and charities
@@ -121,67 +263,28 @@ def seed_database(crises_data: List[Dict], charities_data: List[Dict]):
         Base.metadata.create_all(bind=engine)
         logger.info("✅ Database tables created/verified")
         
-        # Optional: Clear existing data (comment out to keep existing data)
+        # Full reload: clear and refill in one transaction so readers never see
+        # empty tables (use app.etl.sync for incremental updates)
         logger.info("🗑️  Clearing existing data...")
         db.query(Charity).delete()
         db.query(Crisis).delete()
-        db.commit()
-        logger.info("✅ Existing data cleared")
         
-        # Insert crises
-        logger.info(f"📍 Inserting {len(crises_data)} crises...")
-        crisis_map = {}  # Map source_id to Crisis object
+        # Bulk upsert crises (deduped by source_id)
+        logger.info(f"📍 Upserting {len(crises_data)} crises...")
+        upserted = len(upsert_crises(db, crises_data))
+        logger.info(f"✅ Upserted {upserted} unique crises")
         
-        for crisis_dict in crises_data:
-            # Check for duplicates by source_id
-            source_id = crisis_dict.get("source_id")
-            
-            if source_id and db.query(Crisis).filter(Crisis.source_id == source_id).first():
-                logger.debug(f"Skipping duplicate crisis: {source_id}")
-                continue
-            
-            crisis = Crisis(**crisis_dict)
-            db.add(crisis)
-            db.flush()  # Get the ID without committing
-            
-            if source_id:
-                crisis_map[source_id] = crisis
-        
-        db.commit()
-        logger.info(f"✅ Inserted {len(crisis_map)} unique crises")
-        
-        # Get all country codes from inserted crises
-        country_codes = set()
-        for crisis in db.query(Crisis).all():
-            if crisis.country_code:
-                country_codes.add(crisis.country_code)
-        
-        logger.info(f"📍 Found {len(country_codes)} unique countries: {country_codes}")
+        # Link charities to the most severe crisis in their country (one query)
+        country_map = crisis_ids_by_country(db)
+        logger.info(f"📍 Found {len(country_map)} unique countries: {set(country_map)}")
         
         # Insert charities and link to crises
         logger.info(f"💖 Inserting {len(charities_data)} charities...")
-        charity_count = 0
-        
-        for charity_dict in charities_data:
-            country_code = charity_dict.get("country_code")
-            
-            # Try to link charity to a crisis in the same country
-            related_crisis = None
-            if country_code:
-                related_crisis = db.query(Crisis).filter(
-                    Crisis.country_code == country_code
-                ).first()
-            
-            charity = Charity(
-                **charity_dict,
-                related_crisis_id=related_crisis.id if related_crisis else None,
-                crisis_id=related_crisis.id if related_crisis else None,  # Legacy field
-            )
-            db.add(charity)
-            charity_count += 1
+        charity_count = insert_charities(db, charities_data, country_map)
         
+        bump_data_version(db)
         db.commit()
-        logger.info(f"✅ Inserted {charity_count} charities")
+        logger.info(f"✅ Inserted {charity_count} charities (committed)")
         
         # Summary
         logger.info("=" * 80)
@@ -216,8 +319,8 @@ async def main():
         crises_data = await fetch_all_crises()
         
         # Step 2: Extract unique country codes
-        country_codes = {c.get("country_code") for c in crises_data if c.get("country_code")}
-        logger.info(f"📍 Unique countries in crises: {country_codes}")
+        country_codes = rank_countries_by_severity(crises_data)
+        logger.info(f"📍 Unique countries in crises (most severe first): {country_codes}")
         
         # Step 3: Fetch charities for those countries
         charities_data = await fetch_charities_by_countries(country_codes)
@@ -230,6 +333,8 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Seed process failed: {e}")
         raise
+    finally:
+        await http_client.close_client()
 
 
 if __name__ == "__main__":
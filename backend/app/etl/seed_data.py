@@ -1,17 +1,22 @@
+import argparse
 import os
 import io
 import math
-import random
 import datetime
 import zipfile
 from pathlib import Path
 
+import numpy as np
 import psycopg2
+from psycopg2.extras import execute_values
 import geopandas as gpd
-from shapely.geometry import Point
+import shapely
+from scipy.spatial import cKDTree
 from dotenv import load_dotenv
 import requests
 
+from app.cache import bump_data_version_cursor
+
 load_dotenv()
 
 # --- DB connection ---
@@ -51,81 +56,107 @@ DESCRIPTIONS = [
     "Environmental crisis affecting nearby regions.",
 ]
 MIN_DISTANCE_KM = 100.0            # no two crises closer than this
-MAX_ATTEMPTS_PER_POINT = 15000     # attempts to find a valid land+far-enough point
+BATCH_SIZE = 20000                 # candidate points drawn (and tested) per round
+MAX_EMPTY_BATCHES = 50             # give up after this many rounds without a new point
+EARTH_RADIUS_KM = 6371.0
+
+# Land test against a prepared geometry: shapely 2 evaluates whole coordinate arrays at once
+shapely.prepare(land_polygons)
 
 # --- Helpers ---
-def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371.0
-    p1, p2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlmb = math.radians(lon2 - lon1)
-    a = math.sin(dphi/2)**2 + math.cos(p1) * math.cos(p2) * math.sin(dlmb/2)**2
-    return 2 * R * math.asin(math.sqrt(a))
+def to_unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere, so great-circle spacing becomes a Euclidean (chord) radius"""
+    phi, lmb = np.radians(lats), np.radians(lons)
+    return np.column_stack((np.cos(phi) * np.cos(lmb), np.cos(phi) * np.sin(lmb), np.sin(phi)))
+
+def chord_for_km(km: float) -> float:
+    return 2 * math.sin(km / (2 * EARTH_RADIUS_KM))
 
 def load_existing_coords():
     with conn, conn.cursor() as cur:
         cur.execute("SELECT latitude, longitude FROM crises")
         return [(float(r[0]), float(r[1])) for r in cur.fetchall()]
 
-def is_far_enough(lat: float, lon: float, existing: list[tuple[float,float]], min_km: float) -> bool:
-    for elat, elon in existing:
-        if haversine_km(lat, lon, elat, elon) < min_km:
-            return False
-    return True
-
-def random_land_coordinate() -> tuple[float, float]:
+def random_land_coordinates(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
     # avoid polar extremes for better performance
-    lat = round(random.uniform(-60, 80), 4)
-    lon = round(random.uniform(-170, 170), 4)
-    return (lat, lon)
-
-def pick_valid_coordinate(existing: list[tuple[float,float]], min_km: float) -> tuple[float, float] | None:
-    for _ in range(MAX_ATTEMPTS_PER_POINT):
-        lat, lon = random_land_coordinate()
-        if not land_polygons.contains(Point(lon, lat)):
-            continue
-        if is_far_enough(lat, lon, existing, min_km):
-            return (lat, lon)
-    return None
-
-def generate_random_crisis(existing_coords: list[tuple[float,float]]) -> tuple | None:
-    title = f"{random.choice(EVENTS)} in Region {random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}"
-    category = random.choice(CATEGORIES)
-    description = random.choice(DESCRIPTIONS)
-    severity = random.randint(1, 5)
-
-    coord = pick_valid_coordinate(existing_coords, MIN_DISTANCE_KM)
-    if coord is None:
-        return None
+    lats = np.round(rng.uniform(-60, 80, n), 4)
+    lons = np.round(rng.uniform(-170, 170, n), 4)
+    keep = shapely.contains_xy(land_polygons, lons, lats)
+    return lats[keep], lons[keep]
+
+def pick_valid_coordinates(existing: list[tuple[float,float]], count: int, min_km: float,
+                           rng: np.random.Generator) -> list[tuple[float, float]]:
+    """
+    Up to `count` land points at least min_km from existing crises and from each other.
+    Candidates come in batches: land-masked in one call, checked against a KD-tree of
+    accepted points, then thinned greedily (in draw order) against their own batch.
+    """
+    chord = chord_for_km(min_km)
+    placed = to_unit_vectors(*np.array(existing, dtype=float).reshape(-1, 2).T)
+    picked: list[tuple[float, float]] = []
+    empty_batches = 0
+
+    while len(picked) < count and empty_batches < MAX_EMPTY_BATCHES:
+        lats, lons = random_land_coordinates(rng, BATCH_SIZE)
+        xyz = to_unit_vectors(lats, lons)
+        if len(placed):
+            dist, _ = cKDTree(placed).query(xyz, distance_upper_bound=chord)
+            far = np.isinf(dist)
+            lats, lons, xyz = lats[far], lons[far], xyz[far]
+
+        taken = np.zeros(len(xyz), dtype=bool)
+        neighbors = cKDTree(xyz).query_ball_point(xyz, chord) if len(xyz) else []
+        for i, near in enumerate(neighbors):
+            if len(picked) >= count:
+                break
+            if taken[near].any():
+                continue
+            taken[i] = True
+            picked.append((float(lats[i]), float(lons[i])))
+
+        placed = np.vstack((placed, xyz[taken]))
+        empty_batches = 0 if taken.any() else empty_batches + 1
+
+    return picked
+
+def build_random_crisis(coord: tuple[float, float], rng: np.random.Generator) -> tuple:
+    title = f"{rng.choice(EVENTS)} in Region {rng.choice(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))}"
+    category = str(rng.choice(CATEGORIES))
+    description = str(rng.choice(DESCRIPTIONS))
+    severity = int(rng.integers(1, 6))
 
     latitude, longitude = coord
     source_api = "random_seed"
     last_updated = datetime.datetime.now(datetime.timezone.utc)
     return (title, category, description, severity, latitude, longitude, source_api, last_updated)
 
-def insert_random_crises(num_random: int = 10):
+def insert_random_crises(num_random: int = 10, min_km: float = MIN_DISTANCE_KM, seed: int | None = None):
+    rng = np.random.default_rng(seed)  # one generator, so --seed reproduces every field
     existing = load_existing_coords()
+    coords = pick_valid_coordinates(existing, num_random, min_km, rng)
+    if len(coords) < num_random:
+        print(f"⚠️  Only found {len(coords)} of {num_random} land points ≥{min_km} km from others.")
 
-    inserted = 0
+    rows = [build_random_crisis(coord, rng) for coord in coords]
     with conn:
         with conn.cursor() as cur:
-            for _ in range(num_random):
-                payload = generate_random_crisis(existing)
-                if payload is None:
-                    print(f"⚠️  Skipped: couldn’t find a land point ≥{MIN_DISTANCE_KM} km from others after many tries.")
-                    continue
-                cur.execute("""
-                    INSERT INTO crises (title, category, description, severity, latitude, longitude, source_api, last_updated)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, payload)
-                # update in-memory list so subsequent points avoid this one too
-                existing.append((payload[4], payload[5]))
-                inserted += 1
-                print(f"✅ Added on-land crisis {inserted}: {payload[0]} at ({payload[4]}, {payload[5]})")
-
-    print(f"🎉 Done. Inserted {inserted} new crises (min spacing {MIN_DISTANCE_KM} km).")
+            execute_values(cur, """
+                INSERT INTO crises (title, category, description, severity, latitude, longitude, source_api, last_updated)
+                VALUES %s
+            """, rows, page_size=1000)
+            if rows:
+                lats, lons = zip(*coords)
+                bump_data_version_cursor(cur, (min(lons), min(lats), max(lons), max(lats)))
+
+    for i, payload in enumerate(rows[:10], start=1):
+        print(f"✅ Added on-land crisis {i}: {payload[0]} at ({payload[4]}, {payload[5]})")
+    print(f"🎉 Done. Inserted {len(rows)} new crises (min spacing {min_km} km).")
 
 if __name__ == "__main__":
-    # change the number below to add more/less per run
-    insert_random_crises(num_random=10)
+    parser = argparse.ArgumentParser(description="Insert random on-land crises")
+    parser.add_argument("--count", type=int, default=10, help="crises to add (default 10)")
+    parser.add_argument("--min-km", type=float, default=MIN_DISTANCE_KM, help="minimum spacing between crises")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    args = parser.parse_args()
+    insert_random_crises(num_random=args.count, min_km=args.min_km, seed=args.seed)
     conn.close()
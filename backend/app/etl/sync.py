@@ -0,0 +1,374 @@
+# backend/app/etl/sync.py
+"""
+Incremental ETL Sync
+Fetches only what changed upstream since the last run (per-source high-water marks),
+upserts it by source_id and soft-deletes crises that disappeared, in one transaction;
+charities for newly covered countries are then added in a second, short one.
+
+Usage:
+    python -m app.etl.sync          # incremental
+    python -m app.etl.sync --full   # refetch whole windows; soft-delete ReliefWeb disasters no longer listed
+    python -m app.etl.sync --stream-usgs --usgs-days 365 --usgs-min-magnitude 2.5
+                                    # parse the USGS feed incrementally, upserting in batches
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.cache import bump_data_version
+from app.db import SessionLocal, engine
+from app.models import Base
+from app.integrations.reliefweb_client import fetch_reliefweb_created_since
+from app.integrations.usgs_client import fetch_usgs_earthquakes, stream_usgs_earthquakes
+from app.integrations import http_client
+from app.etl.seed import (
+    fetch_charities_by_countries, insert_charities, rank_countries, tally_countries, upsert_crises,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+USGS_MIN_MAGNITUDE = 4.5
+USGS_DAYS_BACK = 30
+
+# Sources whose full fetch lists every crisis they have, so anything missing from it is gone.
+# A USGS fetch only covers a time window (deletions within it arrive explicitly instead).
+FULL_LISTING_SOURCES = {"reliefweb"}
+
+# Crises per upsert when a source is streamed
+STREAM_BATCH_SIZE = 1000
+
+
+def load_sync_state(db: Session) -> Dict[str, Optional[datetime]]:
+    """source -> high-water mark"""
+    rows = db.execute(text("SELECT source, high_water_mark FROM sync_state"))
+    return {source: mark for source, mark in rows}
+
+
+def load_covered_countries(db: Session) -> Set[str]:
+    """Countries that already have at least one charity"""
+    rows = db.execute(text("SELECT DISTINCT country_code FROM charities WHERE country_code IS NOT NULL"))
+    return {country_code for (country_code,) in rows}
+
+
+async def fetch_changed_crises(
+    marks: Dict[str, Optional[datetime]],
+    full: bool,
+    usgs: bool = True,
+    usgs_days: int = USGS_DAYS_BACK,
+    usgs_min_magnitude: float = USGS_MIN_MAGNITUDE,
+) -> Dict[str, List[Dict]]:
+    """
+    Fetch crises per source; with full=False only those changed after each source's mark
+
+    Args:
+        usgs: Set False when USGS is streamed instead (see stream_usgs_earthquakes)
+
+    Returns:
+        source -> normalized crises (USGS deletions included as {"deleted": True});
+        sources whose fetch raised are left out
+    """
+    usgs_mark = None if full else marks.get("usgs")
+    reliefweb_mark = None if full else marks.get("reliefweb")
+
+    fetches = {"reliefweb": fetch_reliefweb_created_since(reliefweb_mark)}
+    if usgs:
+        fetches["usgs"] = fetch_usgs_earthquakes(
+            min_magnitude=usgs_min_magnitude, days_back=usgs_days, updated_after=usgs_mark
+        )
+    results = await asyncio.gather(*fetches.values(), return_exceptions=True)
+
+    fetched = {}
+    for source, result in zip(fetches, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ Crisis source {source} failed: {result}")
+            continue
+        fetched[source] = result
+        logger.info(f"📥 {source}: {len(result)} changed since {None if full else marks.get(source)}")
+    return fetched
+
+
+def soft_delete_crises(
+    db: Session, source: str, deleted_ids: List[str], keep_ids: Optional[List[str]] = None
+) -> List[Tuple[float, float]]:
+    """
+    Mark crises deleted: the given source_ids, or (keep_ids given) every live crisis
+    of the source not in keep_ids
+
+    Returns:
+        (latitude, longitude) of every crisis soft-deleted
+    """
+    if keep_ids is not None:
+        sql = "source_id <> ALL(:ids)"
+        ids = keep_ids
+    elif deleted_ids:
+        sql = "source_id = ANY(:ids)"
+        ids = deleted_ids
+    else:
+        return []
+
+    rows = db.execute(
+        text(f"""
+            UPDATE crises SET deleted_at = now()
+            WHERE source = :source AND deleted_at IS NULL AND {sql}
+            RETURNING latitude, longitude
+        """),
+        {"source": source, "ids": ids},
+    )
+    return [tuple(row) for row in rows]
+
+
+def relink_charities(db: Session) -> int:
+    """Point each country's charities at its most severe live crisis"""
+    result = db.execute(text("""
+        UPDATE charities ch
+        SET related_crisis_id = m.id, crisis_id = m.id
+        FROM (
+            SELECT DISTINCT ON (country_code) country_code, id
+            FROM crises
+            WHERE country_code IS NOT NULL AND deleted_at IS NULL
+            ORDER BY country_code, COALESCE(severity, 0) DESC, id
+        ) m
+        WHERE ch.country_code = m.country_code AND ch.related_crisis_id IS DISTINCT FROM m.id
+    """))
+    # Charities whose country no longer has a live crisis
+    result_orphans = db.execute(text("""
+        UPDATE charities ch
+        SET related_crisis_id = NULL, crisis_id = NULL
+        FROM crises c
+        WHERE ch.related_crisis_id = c.id AND c.deleted_at IS NOT NULL
+    """))
+    return result.rowcount + result_orphans.rowcount
+
+
+def points_bbox(points: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+    lats = [lat for lat, _ in points]
+    lons = [lon for _, lon in points]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def write_mark(db: Session, source: str, mark: Optional[datetime], marks: Dict[str, Optional[datetime]]) -> None:
+    """Advance the source's high-water mark (never moves it backwards)"""
+    if mark is None or (marks.get(source) is not None and mark <= marks[source]):
+        return
+    db.execute(
+        text("""
+            INSERT INTO sync_state (source, high_water_mark, last_synced_at)
+            VALUES (:source, :mark, now())
+            ON CONFLICT (source) DO UPDATE
+            SET high_water_mark = excluded.high_water_mark, last_synced_at = now()
+        """),
+        {"source": source, "mark": mark},
+    )
+
+
+def apply_crisis_batch(
+    db: Session, source: str, crises: List[Dict], full: bool, live_ids_seen: List[str]
+) -> Tuple[List[Tuple[float, float]], int, int, Optional[datetime]]:
+    """
+    Upsert one batch of a source's crises and soft-delete its explicit deletions
+
+    With full=True the sweep of missing crises is left to the caller, which needs
+    every live source_id of the run; they are appended to live_ids_seen.
+
+    Returns:
+        (touched points, crises upserted, crises soft-deleted, newest source_updated_at in the batch)
+    """
+    live = [c for c in crises if not c.get("deleted")]
+    deleted_ids = [c["source_id"] for c in crises if c.get("deleted") and c.get("source_id")]
+    touched: List[Tuple[float, float]] = []
+
+    # Old positions of updated crises, so tiles they moved away from are refreshed too
+    live_ids = [c["source_id"] for c in live if c.get("source_id")]
+    old_positions = []
+    if live_ids:
+        old_positions = [tuple(row) for row in db.execute(
+            text("SELECT latitude, longitude FROM crises WHERE source_id = ANY(:ids)"),
+            {"ids": live_ids},
+        )]
+
+    changed = upsert_crises(db, live)
+    if changed:
+        touched.extend(changed + old_positions)
+
+    if full:
+        live_ids_seen.extend(live_ids)
+    removed = soft_delete_crises(db, source, deleted_ids)
+    touched.extend(removed)
+
+    stamps = [c["source_updated_at"] for c in crises if c.get("source_updated_at")]
+    return touched, len(changed), len(removed), max(stamps) if stamps else None
+
+
+async def _batched(items: AsyncIterator[Dict], size: int) -> AsyncIterator[List[Dict]]:
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def sync_database(
+    fetched: Dict[str, List[Dict]],
+    streams: Dict[str, AsyncIterator[Dict]],
+    covered: Set[str],
+    marks: Dict[str, Optional[datetime]],
+    full: bool,
+) -> bool:
+    """
+    Apply fetched changes: all crisis changes in one transaction, then new charities in another
+
+    Streamed sources are consumed STREAM_BATCH_SIZE crises at a time, so only one
+    batch is ever held in memory; if a stream fails midway every crisis change rolls back.
+    Once those are committed, charities are looked up for countries that have none yet.
+
+    Args:
+        fetched: source -> crises already in memory
+        streams: source -> async iterator of crises
+        covered: countries that already have charities
+        marks: high-water marks read at the start of the run
+        full: whether the fetch covered whole windows (enables the missing-crisis sweep
+            for FULL_LISTING_SOURCES)
+
+    Returns:
+        True if any crisis or charity changed
+    """
+    db: Session = SessionLocal()
+
+    try:
+        touched: List[Tuple[float, float]] = []
+        country_stats: Dict[str, Tuple[int, int]] = {}
+
+        async def apply_source(source: str, batches: AsyncIterator[List[Dict]]) -> None:
+            live_ids_seen: List[str] = []
+            upserted = removed = 0
+            new_mark = None
+            async for batch in batches:
+                points, count, deleted, batch_mark = apply_crisis_batch(db, source, batch, full, live_ids_seen)
+                touched.extend(points)
+                upserted += count
+                removed += deleted
+                if batch_mark and (new_mark is None or batch_mark > new_mark):
+                    new_mark = batch_mark
+                tally_countries(batch, country_stats)
+
+            # Only a complete listing is authoritative; an empty one more likely means an outage
+            if full and source in FULL_LISTING_SOURCES and live_ids_seen:
+                swept = soft_delete_crises(db, source, [], keep_ids=live_ids_seen)
+                touched.extend(swept)
+                removed += len(swept)
+            logger.info(f"✅ {source}: {upserted} upserted, {removed} soft-deleted")
+            write_mark(db, source, new_mark, marks)
+
+        for source, crises in fetched.items():
+            await apply_source(source, _batched(_aiter(crises), STREAM_BATCH_SIZE))
+        for source, stream in streams.items():
+            await apply_source(source, _batched(stream, STREAM_BATCH_SIZE))
+
+        if touched:
+            relinked = relink_charities(db)
+            logger.info(f"🔗 Relinked {relinked} charities")
+            bump_data_version(db, points_bbox(touched))
+        db.commit()
+
+        # Charity lookups fan out over HTTP, so they run with no transaction (and no row locks) open.
+        # Only countries that have none yet are looked up, most severe first.
+        new_countries = [code for code in rank_countries(country_stats) if code not in covered]
+        charities_data = await fetch_charities_by_countries(new_countries) if new_countries else []
+
+        charity_count = 0
+        if charities_data:
+            urls = [c.get("donation_url") for c in charities_data if c.get("donation_url")]
+            existing = {url for (url,) in db.execute(
+                text("SELECT donation_url FROM charities WHERE donation_url = ANY(:urls)"), {"urls": urls}
+            )}
+            new_charities = []
+            for charity in charities_data:
+                url = charity.get("donation_url")
+                if url:
+                    if url in existing:
+                        continue
+                    existing.add(url)
+                new_charities.append(charity)
+            charity_count = insert_charities(db, new_charities, {})
+            logger.info(f"✅ Inserted {charity_count} new charities")
+
+        if charity_count:
+            relinked = relink_charities(db)
+            logger.info(f"🔗 Relinked {relinked} charities")
+            bump_data_version(db, None)
+        db.commit()
+        return bool(touched) or charity_count > 0
+
+    except Exception as e:
+        logger.error(f"❌ Sync failed, rolled back: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _aiter(items: List[Dict]) -> AsyncIterator[Dict]:
+    for item in items:
+        yield item
+
+
+async def main(full: bool = False, stream_usgs: bool = False, usgs_days: int = USGS_DAYS_BACK,
+               usgs_min_magnitude: float = USGS_MIN_MAGNITUDE):
+    """
+    Main async entry point
+    """
+    logger.info(f"🔄 STARTING {'FULL' if full else 'INCREMENTAL'} SYNC")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        marks = load_sync_state(db)
+        covered = load_covered_countries(db)
+    finally:
+        db.close()
+
+    try:
+        streams = {}
+        if stream_usgs:
+            streams["usgs"] = stream_usgs_earthquakes(
+                min_magnitude=usgs_min_magnitude,
+                days_back=usgs_days,
+                updated_after=None if full else marks.get("usgs"),
+            )
+        fetched = await fetch_changed_crises(
+            marks, full, usgs=not stream_usgs, usgs_days=usgs_days, usgs_min_magnitude=usgs_min_magnitude
+        )
+        changed = await sync_database(fetched, streams, covered, marks, full)
+    finally:
+        await http_client.close_client()
+
+    logger.info("✅ SYNC COMPLETED" + ("" if changed else " (no upstream changes)"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental crisis/charity sync")
+    parser.add_argument("--full", action="store_true", help="Refetch whole windows and soft-delete missing crises")
+    parser.add_argument("--stream-usgs", action="store_true",
+                        help="Parse the USGS feed incrementally and upsert it in batches (for long windows)")
+    parser.add_argument("--usgs-days", type=int, default=USGS_DAYS_BACK, help="USGS window in days")
+    parser.add_argument("--usgs-min-magnitude", type=float, default=USGS_MIN_MAGNITUDE,
+                        help="Smallest USGS magnitude to ingest")
+    args = parser.parse_args()
+    asyncio.run(main(
+        full=args.full,
+        stream_usgs=args.stream_usgs,
+        usgs_days=args.usgs_days,
+        usgs_min_magnitude=args.usgs_min_magnitude,
+    ))
@@ -0,0 +1,125 @@
+# backend/app/export.py
+"""
+Streaming encoders for bulk crisis exports
+Each encoder turns batches of row tuples into bytes as they arrive, so an export of any size
+is written with constant memory: CSV via the stdlib, Arrow IPC stream and Parquet (one row
+group per batch) via pyarrow when it is installed
+"""
+import csv
+import io
+from datetime import datetime
+from typing import List, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("csv", "arrow", "parquet")
+
+
+def _arrow_types() -> dict:
+    """Arrow column type per crisis field (matches the crises table)"""
+    text = pa.string()
+    return {
+        "id": pa.int64(), "title": text, "category": text, "description": text, "severity": pa.int32(),
+        "latitude": pa.float64(), "longitude": pa.float64(), "country_code": text, "source": text,
+        "source_id": text, "source_api": text, "last_updated": pa.timestamp("us"),
+    }
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class CsvEncoder:
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self, fields: Sequence[str]):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(fields)
+
+    def write(self, rows: List[tuple]) -> bytes:
+        for row in rows:
+            self._writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class ArrowEncoder:
+    """Arrow IPC stream, or a Parquet file when parquet=True"""
+
+    def __init__(self, fields: Sequence[str], parquet: bool = False):
+        types = _arrow_types()
+        self.schema = pa.schema([(name, types[name]) for name in fields])
+        self.media_type = "application/vnd.apache.parquet" if parquet else "application/vnd.apache.arrow.stream"
+        self.extension = "parquet" if parquet else "arrows"
+        self._sink = _ChunkSink()
+        if parquet:
+            self._writer = pq.ParquetWriter(self._sink, self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def write(self, rows: List[tuple]) -> bytes:
+        columns = list(zip(*rows)) if rows else [()] * len(self.schema)
+        batch = pa.record_batch(
+            [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema,
+        )
+        self._writer.write_batch(batch)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def make_encoder(format: str, fields: Sequence[str]):
+    """
+    Encoder for one export
+
+    Args:
+        format: One of EXPORT_FORMATS
+        fields: Column names, in row order
+
+    Raises:
+        RuntimeError if an Arrow format is requested without pyarrow installed
+    """
+    if format == "csv":
+        return CsvEncoder(fields)
+    if not ARROW_AVAILABLE:
+        raise RuntimeError(f"{format} export requires pyarrow")
+    return ArrowEncoder(fields, parquet=format == "parquet")
@@ -0,0 +1,133 @@
+# backend/app/geo.py
+"""
+Geographic helpers for map queries
+Spatial filters use the built-in GiST index on point(longitude, latitude), so no PostGIS is required
+"""
+import math
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+EARTH_RADIUS_KM = 6371.0
+# On the same sphere as HAVERSINE_SQL, so radius boxes never clip the circle they bound
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# Index-backed containment test; matches idx_crises_location in etl/migrate.py
+POINT_SQL = "point(longitude, latitude)"
+BOX_SQL = f"{POINT_SQL} <@ box(point(%s, %s), point(%s, %s))"
+
+# Great-circle distance in km from (%s lat, %s lon) to each row. Near antipodal points
+# rounding can push the sqrt just past 1, which asin rejects, so it is clamped
+HAVERSINE_SQL = (
+    f"2 * {EARTH_RADIUS_KM} * asin(LEAST(1.0, sqrt("
+    "power(sin(radians(latitude - %s) / 2), 2) + "
+    "cos(radians(%s)) * cos(radians(latitude)) * power(sin(radians(longitude - %s) / 2), 2)"
+    ")))"
+)
+
+BBox = Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
+
+
+def parse_bbox(bbox: str) -> BBox:
+    """
+    Parse "min_lon,min_lat,max_lon,max_lat"
+
+    min_lon may be greater than max_lon for viewports crossing the antimeridian.
+
+    Raises:
+        HTTPException(400) on malformed or out-of-range input
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise HTTPException(status_code=400, detail="bbox latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise HTTPException(status_code=400, detail="bbox longitudes must be within -180..180")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def radius_bbox(lat: float, lon: float, radius_km: float) -> BBox:
+    """Smallest lat/lon box containing the circle; may wrap the antimeridian"""
+    dlat = radius_km / KM_PER_DEG_LAT
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    if min_lat <= -90 or max_lat >= 90:
+        # Circle covers a pole, and with it every longitude
+        return -180.0, min_lat, 180.0, max_lat
+
+    # Widest longitude reached by the circle (at its tangent meridians, not due east/west)
+    angle = radius_km / EARTH_RADIUS_KM
+    dlon = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+    min_lon = (lon - dlon + 180) % 360 - 180
+    max_lon = (lon + dlon + 180) % 360 - 180
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def bbox_clause(bbox: BBox) -> Tuple[str, List[float]]:
+    """WHERE fragment for points inside bbox, split in two at the antimeridian"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if min_lon <= max_lon:
+        return BOX_SQL, [min_lon, min_lat, max_lon, max_lat]
+    return (
+        f"({BOX_SQL} OR {BOX_SQL})",
+        [min_lon, min_lat, 180.0, max_lat, -180.0, min_lat, max_lon, max_lat],
+    )
+
+
+def radius_clause(lat: float, lon: float, radius_km: float) -> Tuple[str, List[float]]:
+    """WHERE fragment for points within radius_km: index-backed box, then exact distance"""
+    box_sql, box_params = bbox_clause(radius_bbox(lat, lon, radius_km))
+    return (
+        f"{box_sql} AND {HAVERSINE_SQL} <= %s",
+        box_params + [lat, lat, lon, radius_km],
+    )
+
+
+def tile_bbox(z: int, x: int, y: int, buffer: float = 0.0) -> BBox:
+    """
+    Lon/lat bounds of Web Mercator tile (z, x, y)
+
+    Args:
+        buffer: Extra margin as a fraction of the tile size, so symbols at tile
+                edges are not clipped
+    """
+    n = 2 ** z
+
+    def lon(tx: float) -> float:
+        return tx / n * 360.0 - 180.0
+
+    def lat(ty: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    min_lon = max(lon(x - buffer), -180.0)
+    max_lon = min(lon(x + 1 + buffer), 180.0)
+    min_lat = max(lat(y + 1 + buffer), -90.0) if y + 1 < n else -90.0
+    max_lat = min(lat(y - buffer), 90.0) if y > 0 else 90.0
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def bboxes_intersect(a: BBox, b: BBox) -> bool:
+    """Overlap test for boxes that do not wrap the antimeridian"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def in_bbox(lat: float, lon: float, bbox: BBox) -> bool:
+    """Python counterpart of bbox_clause"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if not (min_lat <= lat <= max_lat):
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= lon <= max_lon
+    return lon >= min_lon or lon <= max_lon
+
+
+def validate_center(lat: Optional[float], lon: Optional[float], radius_km: Optional[float]) -> bool:
+    """True when a complete center+radius was given; 400 if only part of one was"""
+    given = [v is not None for v in (lat, lon, radius_km)]
+    if not any(given):
+        return False
+    if not all(given):
+        raise HTTPException(status_code=400, detail="lat, lon and radius_km must be given together")
+    return True
@@ -8,6 +8,8 @@ import os
 from typing import List, Dict
 import logging
 
+from . import http_client
+
 logger = logging.getLogger(__name__)
 
 EVERYORG_API = "https://partners.every.org/v0.2/search"
@@ -38,28 +40,27 @@ async def fetch_everyorg_charities(country_code: str, limit: int = 10) -> List[D
             "take": limit,
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(f"Fetching charities from Every.org for country: {country_code}")
-            response = await client.get(EVERYORG_API, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            nonprofits = data.get("nonprofits", [])
-            logger.info(f"✅ Retrieved {len(nonprofits)} charities from Every.org for {country_code}")
-            
-            for org in nonprofits:
-                charity = {
-                    "name": org.get("name", "Unknown Organization"),
-                    "description": org.get("description", org.get("mission", "")),
-                    "website": org.get("websiteUrl"),
-                    "logo_url": org.get("logoUrl"),
-                    "donation_url": f"https://www.every.org/{org.get('slug', '')}",
-                    "country_code": country_code,
-                    "source": "everyorg",
-                }
-                charities.append(charity)
-            
-            logger.info(f"✅ Normalized {len(charities)} Every.org charities")
+        logger.info(f"Fetching charities from Every.org for country: {country_code}")
+        response = await http_client.request("everyorg", "GET", EVERYORG_API, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        nonprofits = data.get("nonprofits", [])
+        logger.info(f"✅ Retrieved {len(nonprofits)} charities from Every.org for {country_code}")
+        
+        for org in nonprofits:
+            charity = {
+                "name": org.get("name", "Unknown Organization"),
+                "description": org.get("description", org.get("mission", "")),
+                "website": org.get("websiteUrl"),
+                "logo_url": org.get("logoUrl"),
+                "donation_url": f"https://www.every.org/{org.get('slug', '')}",
+                "country_code": country_code,
+                "source": "everyorg",
+            }
+            charities.append(charity)
+        
+        logger.info(f"✅ Normalized {len(charities)} Every.org charities")
             
     except httpx.HTTPError as e:
         logger.error(f"❌ Every.org API error for {country_code}: {e}")
@@ -0,0 +1,271 @@
+# backend/app/integrations/http_client.py
+"""
+Shared HTTP layer for all integration clients
+One pooled httpx.AsyncClient (keep-alive, HTTP/2 when `h2` is installed), per-host
+concurrency limits, per-source timeouts and token-bucket rate limits, and jittered
+exponential backoff that honors Retry-After
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .response_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Per-source settings: request timeout (seconds), max in-flight requests to its host,
+# token-bucket rate (requests/second) and burst, and how long a cached response is
+# served without revalidation (seconds, 0 = never cache)
+SOURCES: Dict[str, Dict[str, float]] = {
+    "usgs": {"timeout": 60.0, "concurrency": 4, "rate": 5.0, "burst": 5, "cache_ttl": 300},
+    "reliefweb": {"timeout": 30.0, "concurrency": 4, "rate": 5.0, "burst": 5, "cache_ttl": 900},
+    "everyorg": {"timeout": 15.0, "concurrency": 8, "rate": 4.0, "burst": 8, "cache_ttl": 86400},
+    "opencollective": {"timeout": 20.0, "concurrency": 4, "rate": 2.0, "burst": 4, "cache_ttl": 86400},
+}
+DEFAULT_SOURCE = {"timeout": 30.0, "concurrency": 4, "rate": 5.0, "burst": 5, "cache_ttl": 0}
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_CAP = float(os.getenv("HTTP_BACKOFF_CAP", "30"))
+# A server's Retry-After is waited out up to this many seconds (by default the backoff ceiling);
+# longer asks fail the request rather than stall the caller
+RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", str(BACKOFF_CAP)))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+USER_AGENT = "chariot-app/1.0"
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _HttpState:
+    """Client and semaphores bound to one event loop (each asyncio.run gets its own)"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+        )
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.rate_limiters: Dict[str, TokenBucket] = {}
+
+
+_state: Optional[_HttpState] = None
+
+
+def _get_state() -> _HttpState:
+    global _state
+    loop = asyncio.get_running_loop()
+    if _state is None or _state.loop is not loop or _state.client.is_closed:
+        _state = _HttpState(loop)
+    return _state
+
+
+def _host_semaphore(state: _HttpState, url: str, source: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in state.host_semaphores:
+        limit = int(SOURCES.get(source, DEFAULT_SOURCE)["concurrency"])
+        state.host_semaphores[host] = asyncio.Semaphore(limit)
+    return state.host_semaphores[host]
+
+
+def _rate_limiter(state: _HttpState, source: str) -> TokenBucket:
+    if source not in state.rate_limiters:
+        settings = SOURCES.get(source, DEFAULT_SOURCE)
+        state.rate_limiters[source] = TokenBucket(settings["rate"], settings["burst"])
+    return state.rate_limiters[source]
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+async def _send(state: _HttpState, source: str, request: httpx.Request, stream: bool = False) -> httpx.Response:
+    """
+    Send under the source's rate limit and per-host concurrency limit, retrying transient failures
+
+    With stream=True the body is left unread and the response keeps its host slot:
+    the caller must aclose the response and then release the host semaphore (see stream()).
+    A Retry-After longer than RETRY_AFTER_MAX is not waited for; that response is returned as is.
+    """
+    semaphore = _host_semaphore(state, str(request.url), source)
+    limiter = _rate_limiter(state, source)
+
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire()
+        await semaphore.acquire()
+        try:
+            response = await state.client.send(request, stream=stream)
+        except BaseException as e:
+            semaphore.release()
+            if not isinstance(e, httpx.TransportError) or attempt == MAX_RETRIES:
+                raise
+            delay = _backoff(attempt)
+            logger.warning(f"⚠️ {source} {request.method} failed ({e!r}), retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        if not stream:
+            semaphore.release()
+
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+
+        delay = _retry_after(response)
+        if delay is not None and delay > RETRY_AFTER_MAX:
+            logger.warning(
+                f"⚠️ {source} {request.method} returned {response.status_code} with Retry-After {delay:.0f}s "
+                f"(over HTTP_RETRY_AFTER_MAX={RETRY_AFTER_MAX:.0f}s), giving up"
+            )
+            return response
+        if delay is None:
+            delay = _backoff(attempt)
+        logger.warning(
+            f"⚠️ {source} {request.method} returned {response.status_code}, "
+            f"retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s"
+        )
+        await response.aclose()
+        if stream:
+            semaphore.release()
+        await asyncio.sleep(delay)
+
+    raise RuntimeError("unreachable")
+
+
+async def request(source: str, method: str, url: str, cache: bool = True, **kwargs) -> httpx.Response:
+    """
+    Send a request through the shared client, retrying transient failures
+
+    Responses are served from the on-disk cache while younger than the source's
+    cache_ttl, then revalidated with ETag / Last-Modified.
+
+    Args:
+        source: Integration name (selects timeout, concurrency limit and cache TTL)
+        method: HTTP method
+        url: Absolute URL
+        cache: Set False to bypass the response cache
+        **kwargs: Passed to httpx.AsyncClient.build_request (params, json, headers, ...)
+
+    Returns:
+        The final response (callers still call raise_for_status)
+
+    Raises:
+        httpx.TransportError if every attempt failed to connect/read
+    """
+    state = _get_state()
+    settings = SOURCES.get(source, DEFAULT_SOURCE)
+    kwargs.setdefault("timeout", settings["timeout"])
+    req = state.client.build_request(method, url, **kwargs)
+
+    store = get_cache() if cache and settings["cache_ttl"] > 0 else None
+    key = store.key_for(req) if store else None
+    # SQLite reads, writes and evictions block; keep them off the event loop
+    cached = await asyncio.to_thread(store.get, key) if store else None
+    if cached is not None:
+        if cached.age() < settings["cache_ttl"]:
+            logger.debug(f"{source} {method} {req.url} served from cache")
+            return cached.to_response(req)
+        req.headers.update(cached.conditional_headers())
+
+    response = await _send(state, source, req)
+
+    if cached is not None and response.status_code == 304:
+        await asyncio.to_thread(store.refresh, key)
+        logger.info(f"♻️ {source} {method} not modified, reusing cached response")
+        return cached.to_response(req)
+    if store is not None and response.status_code == 200:
+        if not await asyncio.to_thread(store.put, key, response):
+            logger.warning(f"⚠️ {source} {method} {req.url} answered with errors; not cached")
+    return response
+
+
+@asynccontextmanager
+async def stream(source: str, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """
+    Like request(), but yields a response whose body has not been read yet
+
+    For large payloads consumed with response.aiter_bytes(). Streamed responses
+    bypass the response cache, which would have to buffer the whole body, and hold
+    one of the host's concurrency slots until the block exits.
+
+    Usage:
+        async with http_client.stream("usgs", "GET", url, params=params) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                ...
+    """
+    state = _get_state()
+    kwargs.setdefault("timeout", SOURCES.get(source, DEFAULT_SOURCE)["timeout"])
+    req = state.client.build_request(method, url, **kwargs)
+    semaphore = _host_semaphore(state, str(req.url), source)
+    response = await _send(state, source, req, stream=True)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+        semaphore.release()
+
+
+async def close_client() -> None:
+    """Close the shared client (call once at the end of an ETL run)"""
+    global _state
+    if _state is not None and not _state.client.is_closed:
+        await _state.client.aclose()
+    _state = None
@@ -0,0 +1,115 @@
+# backend/app/integrations/json_stream.py
+"""
+Incremental JSON parsing over an async byte stream
+Yields the items of one top-level array (e.g. GeoJSON "features") without holding the document in memory
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator
+
+_WHITESPACE = " \t\r\n"
+# Characters that can continue a number (raw_decode stops before e.g. a trailing "1." or "2e")
+_NUMBER_CHARS = "0123456789.eE+-"
+_decoder = json.JSONDecoder()
+
+
+class _StreamReader:
+    """Text buffer over an async byte iterator that only keeps the unparsed tail"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk; False once the stream is exhausted"""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self._utf8.decode(b"", final=True)
+            self.pos = 0
+            return False
+        self.buf = self.buf[self.pos:] + self._utf8.decode(chunk)
+        self.pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character (not consumed); '' at end of stream"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it parses"""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not await self.fill():
+                    raise
+                continue
+            # A number that reaches the end of the buffer, or stops at a character that
+            # could still extend it, may continue in the next chunk
+            if (
+                not self.eof
+                and isinstance(value, (int, float))
+                and (end == len(self.buf) or self.buf[end] in _NUMBER_CHARS)
+            ):
+                await self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+async def iter_array_items(chunks: AsyncIterator[bytes], key: str) -> AsyncIterator[Any]:
+    """
+    Yield each item of the array stored under top-level `key`
+
+    Other top-level members are decoded and discarded. Raises ValueError or
+    json.JSONDecodeError on malformed input.
+    """
+    reader = _StreamReader(chunks)
+    await reader.expect("{")
+    if await reader.peek() == "}":
+        return
+
+    while True:
+        name = await reader.value()
+        await reader.expect(":")
+
+        if name == key:
+            await reader.expect("[")
+            if await reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield await reader.value()
+                    if await reader.peek() == ",":
+                        reader.pos += 1
+                        continue
+                    await reader.expect("]")
+                    break
+        else:
+            await reader.value()
+
+        if await reader.peek() == ",":
+            reader.pos += 1
+            continue
+        await reader.expect("}")
+        return
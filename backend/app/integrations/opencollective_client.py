@@ -3,89 +3,127 @@
 OpenCollective API Client
 Fetches public collectives (charities) by keyword search
 """
+import asyncio
 import httpx
 from typing import List, Dict
 import logging
 
+from . import http_client
+
 logger = logging.getLogger(__name__)
 
 OPENCOLLECTIVE_GRAPHQL = "https://api.opencollective.com/graphql/v2"
 
+# Keyword searches merged into one aliased GraphQL document
+KEYWORDS_PER_QUERY = 5
+
+COLLECTIVE_FIELDS = """
+      collectives {
+        name
+        slug
+        description
+        website
+        imageUrl
+      }
+"""
+
+
+def _build_search_document(count: int) -> str:
+    """One query with `count` aliased searches: k0: search($t0), k1: search($t1), ..."""
+    variables = ", ".join(f"$t{i}: String!" for i in range(count))
+    searches = "".join(
+        f"  k{i}: search(searchTerm: $t{i}, limit: $limit, types: [COLLECTIVE]) {{{COLLECTIVE_FIELDS}  }}\n"
+        for i in range(count)
+    )
+    return f"query({variables}, $limit: Int!) {{\n{searches}}}"
+
+
+async def _search_keywords(keywords: List[str], limit: int) -> Dict[str, List[Dict]]:
+    """
+    Run several keyword searches in a single GraphQL request
+
+    Falls back to one request per keyword if the API rejects the merged document.
+
+    Returns:
+        keyword -> raw collective dicts
+    """
+    variables = {f"t{i}": keyword for i, keyword in enumerate(keywords)}
+    variables["limit"] = limit
+
+    response = await http_client.request(
+        "opencollective", "POST", OPENCOLLECTIVE_GRAPHQL,
+        json={"query": _build_search_document(len(keywords)), "variables": variables}
+    )
+    response.raise_for_status()
+    payload = response.json()
+
+    if payload.get("errors") and len(keywords) > 1:
+        logger.warning(f"⚠️ Merged OpenCollective search rejected, retrying {len(keywords)} keywords separately")
+        results = await asyncio.gather(*(_search_keywords([keyword], limit) for keyword in keywords))
+        return {keyword: found for result in results for keyword, found in result.items()}
+
+    data = payload.get("data") or {}
+    return {
+        keyword: (data.get(f"k{i}") or {}).get("collectives", [])
+        for i, keyword in enumerate(keywords)
+    }
+
 
 async def fetch_opencollective_charities(keywords: List[str] = None, limit: int = 20) -> List[Dict]:
     """
     Fetch public collectives from OpenCollective
-    
+
+    Keywords are searched concurrently (batched into aliased GraphQL queries and
+    paced by the shared rate limiter); results are deduplicated by slug.
+
     Args:
         keywords: List of search keywords (e.g., ["disaster", "hunger", "health"])
         limit: Maximum number of charities per keyword
-        
+
     Returns:
         List of normalized charity dictionaries
     """
     charities = []
-    
+
     if keywords is None:
         keywords = ["disaster relief", "hunger", "health", "climate"]
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for keyword in keywords:
-                logger.info(f"Searching OpenCollective for: {keyword}")
-                
-                # GraphQL query
-                query = """
-                query($searchTerm: String!, $limit: Int!) {
-                  search(searchTerm: $searchTerm, limit: $limit, types: [COLLECTIVE]) {
-                    collectives {
-                      name
-                      slug
-                      description
-                      website
-                      imageUrl
-                    }
-                  }
-                }
-                """
-                
-                variables = {
-                    "searchTerm": keyword,
-                    "limit": limit,
-                }
-                
-                response = await client.post(
-                    OPENCOLLECTIVE_GRAPHQL,
-                    json={"query": query, "variables": variables}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                collectives = data.get("data", {}).get("search", {}).get("collectives", [])
-                logger.info(f"✅ Retrieved {len(collectives)} collectives for '{keyword}'")
-                
-                for collective in collectives:
-                    charity = {
-                        "name": collective.get("name", "Unknown Collective"),
-                        "description": collective.get("description", ""),
-                        "website": collective.get("website"),
-                        "logo_url": collective.get("imageUrl"),
-                        "donation_url": f"https://opencollective.com/{collective.get('slug', '')}",
-                        "country_code": None,  # OpenCollective doesn't provide country in search
-                        "source": "opencollective",
-                    }
-                    charities.append(charity)
-                
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.5)
-            
-            logger.info(f"✅ Total normalized OpenCollective charities: {len(charities)}")
-            
-    except httpx.HTTPError as e:
-        logger.error(f"❌ OpenCollective API error: {e}")
-    except Exception as e:
-        logger.error(f"❌ Unexpected error fetching OpenCollective data: {e}")
-    
-    return charities
 
+    batches = [keywords[i:i + KEYWORDS_PER_QUERY] for i in range(0, len(keywords), KEYWORDS_PER_QUERY)]
+    logger.info(f"Searching OpenCollective for {len(keywords)} keywords in {len(batches)} requests")
 
-import asyncio
+    results = await asyncio.gather(
+        *(_search_keywords(batch, limit) for batch in batches),
+        return_exceptions=True,
+    )
+
+    seen_slugs = set()
+    for batch, result in zip(batches, results):
+        if isinstance(result, httpx.HTTPError):
+            logger.error(f"❌ OpenCollective API error for {batch}: {result}")
+            continue
+        if isinstance(result, Exception):
+            logger.error(f"❌ Unexpected error fetching OpenCollective data for {batch}: {result}")
+            continue
+
+        for keyword, collectives in result.items():
+            logger.info(f"✅ Retrieved {len(collectives)} collectives for '{keyword}'")
+
+            for collective in collectives:
+                slug = collective.get("slug", "")
+                if slug in seen_slugs:
+                    continue
+                seen_slugs.add(slug)
+
+                charity = {
+                    "name": collective.get("name", "Unknown Collective"),
+                    "description": collective.get("description", ""),
+                    "website": collective.get("website"),
+                    "logo_url": collective.get("imageUrl"),
+                    "donation_url": f"https://opencollective.com/{slug}",
+                    "country_code": None,  # OpenCollective doesn't provide country in search
+                    "source": "opencollective",
+                }
+                charities.append(charity)
+
+    logger.info(f"✅ Total normalized OpenCollective charities: {len(charities)}")
+    return charities
@@ -0,0 +1,164 @@
+# backend/app/integrations/response_cache.py
+"""
+Persistent HTTP response cache for the integration clients
+SQLite-backed, keyed on the final request (method, URL with params, body); entries past
+their source TTL are revalidated with If-None-Match / If-Modified-Since, and the file is
+kept under a byte budget by evicting least recently used entries.
+Calls block on disk I/O; async callers run them in a worker thread.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "http_cache.sqlite"
+CACHE_PATH = Path(os.getenv("HTTP_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+CACHE_ENABLED = os.getenv("HTTP_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+# Headers describing the wire encoding; the cache stores decoded bodies
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        status INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        body BLOB NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+class CachedResponse:
+    """A stored response plus its freshness metadata"""
+
+    def __init__(self, row: sqlite3.Row):
+        self.status = row["status"]
+        self.headers = json.loads(row["headers"])
+        self.body = row["body"]
+        self.etag = row["etag"]
+        self.last_modified = row["last_modified"]
+        self.stored_at = row["stored_at"]
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status, headers=self.headers, content=self.body, request=request)
+
+
+def _has_graphql_errors(response: httpx.Response) -> bool:
+    """A 200 whose JSON body reports errors (GraphQL signals failures this way)"""
+    if b'"errors"' not in response.content or "json" not in response.headers.get("content-type", ""):
+        return False
+    try:
+        payload = json.loads(response.content)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and bool(payload.get("errors"))
+
+
+class ResponseCache:
+    """Size-bounded SQLite response store (safe to share between threads)"""
+
+    def __init__(self, path: Path, max_bytes: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        digest = hashlib.sha256()
+        digest.update(request.method.encode())
+        digest.update(str(request.url).encode())
+        digest.update(request.content or b"")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return CachedResponse(row)
+
+    def put(self, key: str, response: httpx.Response) -> bool:
+        """Store a response; returns False for error payloads, which would be replayed until they expire"""
+        if _has_graphql_errors(response):
+            return False
+        body = response.content
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, status, headers, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, response.status_code, json.dumps(headers), body,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    now, now, len(body),
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def refresh(self, key: str) -> None:
+        """Mark an entry fresh again after a 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is under 90% of its budget"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for row in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row["key"],))
+            total -= row["size"]
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Process-wide cache, or None when disabled with HTTP_CACHE=off"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(CACHE_PATH, CACHE_MAX_BYTES)
+    return _cache
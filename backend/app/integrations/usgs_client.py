@@ -3,23 +3,34 @@
 USGS Earthquake API Client
 Fetches significant recent earthquakes (magnitude > 4.5)
 """
+import re
 import httpx
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
 import logging
 from datetime import datetime, timedelta
 
+from .. import countries
+from . import http_client
+from .json_stream import iter_array_items
+
 logger = logging.getLogger(__name__)
 
 USGS_API = "https://earthquake.usgs.gov/fdsnws/event/1/query"
 
 
-async def fetch_usgs_earthquakes(min_magnitude: float = 4.5, days_back: int = 30) -> List[Dict]:
+async def fetch_usgs_earthquakes(
+    min_magnitude: float = 4.5,
+    days_back: int = 30,
+    updated_after: Optional[datetime] = None,
+) -> List[Dict]:
     """
     Fetch recent significant earthquakes from USGS
     
     Args:
         min_magnitude: Minimum earthquake magnitude
         days_back: Number of days to look back
+        updated_after: Only events updated after this UTC time (incremental sync);
+                       deleted events are then included as {"source_id", "deleted": True}
         
     Returns:
         List of normalized crisis dictionaries
@@ -27,54 +38,23 @@ async def fetch_usgs_earthquakes(min_magnitude: float = 4.5, days_back: int = 30
     crises = []
     
     try:
-        start_time = (datetime.utcnow() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        params = _build_params(min_magnitude, days_back, updated_after)
         
-        params = {
-            "format": "geojson",
-            "starttime": start_time,
-            "minmagnitude": min_magnitude,
-            "orderby": "magnitude",
-        }
+        logger.info(f"Fetching earthquakes from USGS (mag >= {min_magnitude})...")
+        response = await http_client.request("usgs", "GET", USGS_API, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        features = data.get("features", [])
+        logger.info(f"✅ Retrieved {len(features)} earthquakes from USGS")
+        
+        for feature in features:
+            crisis = _normalize_feature(feature)
+            if crisis:
+                crises.append(crisis)
+        
+        logger.info(f"✅ Normalized {len(crises)} USGS earthquakes")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(f"Fetching earthquakes from USGS (mag >= {min_magnitude})...")
-            response = await client.get(USGS_API, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            features = data.get("features", [])
-            logger.info(f"✅ Retrieved {len(features)} earthquakes from USGS")
-            
-            for feature in features:
-                props = feature.get("properties", {})
-                coords = feature.get("geometry", {}).get("coordinates", [])
-                
-                if len(coords) >= 2:
-                    lon, lat = coords[0], coords[1]
-                    magnitude = props.get("mag", 0)
-                    place = props.get("place", "Unknown Location")
-                    
-                    # Extract country code from place string if possible
-                    country_code = _extract_country_from_place(place)
-                    
-                    # Calculate severity based on magnitude (scale to 1-10)
-                    severity = min(int((magnitude - 4) * 2), 10)
-                    
-                    crisis = {
-                        "title": f"Magnitude {magnitude} Earthquake - {place}",
-                        "category": "Disaster",
-                        "severity": severity,
-                        "latitude": lat,
-                        "longitude": lon,
-                        "country_code": country_code,
-                        "description": f"Earthquake with magnitude {magnitude} occurred near {place}",
-                        "source": "usgs",
-                        "source_id": feature.get("id"),
-                    }
-                    crises.append(crisis)
-            
-            logger.info(f"✅ Normalized {len(crises)} USGS earthquakes")
-            
     except httpx.HTTPError as e:
         logger.error(f"❌ USGS API error: {e}")
     except Exception as e:
@@ -83,27 +63,138 @@ async def fetch_usgs_earthquakes(min_magnitude: float = 4.5, days_back: int = 30
     return crises
 
 
-def _extract_country_from_place(place: str) -> str:
-    """Extract country code from USGS place string"""
-    # Simple mapping of common country names in USGS data
-    country_mapping = {
-        "Japan": "JP",
-        "Indonesia": "ID",
-        "Philippines": "PH",
-        "Chile": "CL",
-        "Mexico": "MX",
-        "Turkey": "TR",
-        "Iran": "IR",
-        "Italy": "IT",
-        "Greece": "GR",
-        "New Zealand": "NZ",
-        "Alaska": "US",
-        "California": "US",
-        "Nevada": "US",
+async def stream_usgs_earthquakes(
+    min_magnitude: float = 4.5,
+    days_back: int = 30,
+    updated_after: Optional[datetime] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Streaming variant of fetch_usgs_earthquakes for large feeds
+    
+    Features are parsed one at a time from the response body, so peak memory
+    stays flat however many events the query matches. Unlike the list variant,
+    errors propagate to the caller (a half-consumed feed must not look complete).
+    
+    Yields:
+        Normalized crisis dictionaries
+    """
+    params = _build_params(min_magnitude, days_back, updated_after)
+    logger.info(f"Streaming earthquakes from USGS (mag >= {min_magnitude}, {days_back} days)...")
+    
+    count = 0
+    async with http_client.stream("usgs", "GET", USGS_API, params=params) as response:
+        response.raise_for_status()
+        async for feature in iter_array_items(response.aiter_bytes(), "features"):
+            crisis = _normalize_feature(feature)
+            if crisis:
+                count += 1
+                yield crisis
+    
+    logger.info(f"✅ Streamed {count} USGS earthquakes")
+
+
+def _build_params(min_magnitude: float, days_back: int, updated_after: Optional[datetime]) -> Dict:
+    """FDSN event query parameters"""
+    start_time = (datetime.utcnow() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+    
+    params = {
+        "format": "geojson",
+        "starttime": start_time,
+        "minmagnitude": min_magnitude,
+        "orderby": "magnitude",
     }
+    if updated_after:
+        params["updatedafter"] = updated_after.strftime("%Y-%m-%dT%H:%M:%S")
+        params["includedeleted"] = "true"
+    return params
+
+
+def _normalize_feature(feature: Dict) -> Optional[Dict]:
+    """GeoJSON feature -> normalized crisis dict (None if it has no coordinates)"""
+    props = feature.get("properties", {})
+    updated_ms = props.get("updated")
+    source_updated_at = datetime.utcfromtimestamp(updated_ms / 1000) if updated_ms else None
+    
+    if props.get("status") == "deleted":
+        return {
+            "source": "usgs",
+            "source_id": feature.get("id"),
+            "source_updated_at": source_updated_at,
+            "deleted": True,
+        }
+    
+    coords = (feature.get("geometry") or {}).get("coordinates", [])
+    if len(coords) < 2:
+        return None
     
-    for country, code in country_mapping.items():
-        if country in place:
-            return code
+    lon, lat = coords[0], coords[1]
+    magnitude = props.get("mag") or 0
+    place = props.get("place") or "Unknown Location"
     
+    country_code = _country_for(lat, lon, place)
+    
+    # Calculate severity based on magnitude (scale to 1-10)
+    severity = max(1, min(int((magnitude - 4) * 2), 10))
+    
+    return {
+        "title": f"Magnitude {magnitude} Earthquake - {place}",
+        "category": "Disaster",
+        "severity": severity,
+        "latitude": lat,
+        "longitude": lon,
+        "country_code": country_code,
+        "description": f"Earthquake with magnitude {magnitude} occurred near {place}",
+        "source": "usgs",
+        "source_id": feature.get("id"),
+        "source_updated_at": source_updated_at,
+    }
+
+
+# Place-name suffixes USGS uses instead of a country name
+PLACE_ALIASES = {
+    **{state: "US" for state in (
+        "alabama", "alaska", "arizona", "arkansas", "california", "colorado", "connecticut",
+        "delaware", "florida", "hawaii", "idaho", "illinois", "indiana", "iowa",
+        "kansas", "kentucky", "louisiana", "maine", "maryland", "massachusetts", "michigan",
+        "minnesota", "mississippi", "missouri", "montana", "nebraska", "nevada", "new hampshire",
+        "new jersey", "new mexico", "new york", "north carolina", "north dakota", "ohio",
+        "oklahoma", "oregon", "pennsylvania", "rhode island", "south carolina", "south dakota",
+        "tennessee", "texas", "utah", "vermont", "virginia", "washington", "west virginia",
+        "wisconsin", "wyoming", "ca", "aleutian islands", "andreanof islands", "rat islands",
+        "fox islands", "unimak island", "gulf of alaska",
+    )},
+    "mx": "MX", "b.c.": "MX", "baja california": "MX",
+    "kuril islands": "RU", "kamchatka": "RU", "komandorskiye ostrova": "RU",
+    "ryukyu islands": "JP", "izu islands": "JP", "bonin islands": "JP", "honshu": "JP",
+    "hokkaido": "JP", "kyushu": "JP", "shikoku": "JP",
+    "kermadec islands": "NZ", "fiji islands": "FJ", "tonga islands": "TO",
+    "santa cruz islands": "SB", "loyalty islands": "NC", "vanuatu islands": "VU",
+    "mariana islands": "MP", "northern mariana islands": "MP", "andaman islands": "IN",
+    "nicobar islands": "IN", "south sandwich islands": "GS", "easter island": "CL",
+    "galapagos islands": "EC", "azores": "PT", "azores islands": "PT", "crete": "GR",
+    "dodecanese islands": "GR", "sumatra": "ID", "java": "ID", "sulawesi": "ID",
+    "molucca sea": "ID", "banda sea": "ID", "mindanao": "PH", "luzon": "PH",
+    "new britain": "PG", "new ireland": "PG", "bougainville": "PG",
+}
+
+_PLACE_PREFIX = re.compile(r"^(?:.*\b(?:of|near)\s+)?(?:the\s+)?")
+
+
+def _country_for(lat: float, lon: float, place: str) -> Optional[str]:
+    """
+    Country code for an event: the country containing the epicenter, else the
+    region named at the end of the place string ("... of Honshu, Japan")
+    """
+    code = countries.country_at(lat, lon)
+    if code:
+        return code
+
+    tail = place.rsplit(",", 1)[-1].strip().lower()
+    tail = _PLACE_PREFIX.sub("", tail)
+    for name in (tail, tail.removesuffix(" region")):
+        country = countries.by_name(name)
+        if country:
+            return country.alpha2
+        if name in PLACE_ALIASES:
+            return PLACE_ALIASES[name]
     return None
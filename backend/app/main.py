@@ -1,8 +1,25 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import crises, charities
+from .compression import CompressionMiddleware
+from .db import async_pool, pool_status
+from .routers import crises, charities, tiles
 
-app = FastAPI(title="Global Problems API")
+# Responses smaller than this (bytes) are sent uncompressed; 0 disables compression
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await async_pool.open()
+    try:
+        yield
+    finally:
+        await async_pool.close()
+
+
+app = FastAPI(title="Global Problems API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -10,10 +27,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Brotli when the client accepts it (and brotli is installed), gzip otherwise; binary
+# exports and vector tiles are sent as they are
+if COMPRESSION_MIN_SIZE > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
 
 app.include_router(crises.router)
 app.include_router(charities.router)
+app.include_router(tiles.router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/health/pool")
+def health_pool():
+    """Connection pool settings, checkouts, overflow and wait times"""
+    return pool_status()
@@ -1,14 +1,20 @@
 """
 SQLAlchemy Database Models
 """
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
+from .search import SEARCH_VECTOR_SQL
+
 # Create Base class for declarative models
 Base = declarative_base()
 
+# Raw SQL filter for crises still live upstream (see Crisis.deleted_at)
+ACTIVE_CRISES_SQL = "deleted_at IS NULL"
+
 
 class Crisis(Base):
     """Crisis/Disaster Model"""
@@ -26,6 +32,8 @@ class Crisis(Base):
     source_id = Column(String, nullable=True, unique=True)  # External API ID
     source_api = Column(String, nullable=True)  # Legacy field for compatibility
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))  # Full-text search (GIN indexed)
+    deleted_at = Column(DateTime, nullable=True)  # Soft delete: set when the crisis disappears upstream
 
     # Relationship
     charities = relationship("Charity", back_populates="crisis", foreign_keys="Charity.related_crisis_id")
@@ -49,4 +57,48 @@ class Charity(Base):
     crisis_id = Column(Integer, ForeignKey("crises.id"), nullable=True)
 
     # Relationship
-    crisis = relationship("Crisis", back_populates="charities", foreign_keys=[related_crisis_id])
\ No newline at end of file
+    crisis = relationship("Crisis", back_populates="charities", foreign_keys=[related_crisis_id])
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by the ETL so API caches know when data changed"""
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class DataChange(Base):
+    """Area touched by each data version bump; a NULL bbox means the whole map"""
+    __tablename__ = "data_changes"
+    __table_args__ = (Index("idx_data_changes_version", "version"),)
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    min_lon = Column(Float, nullable=True)
+    min_lat = Column(Float, nullable=True)
+    max_lon = Column(Float, nullable=True)
+    max_lat = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SyncState(Base):
+    """Per-source high-water mark for incremental ETL sync"""
+    __tablename__ = "sync_state"
+
+    source = Column(String, primary_key=True)  # usgs, reliefweb
+    high_water_mark = Column(DateTime, nullable=True)  # Latest upstream updated/created time seen
+    last_synced_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BackfillCheckpoint(Base):
+    """Resume point of a paginated historical load: every page before next_offset is stored"""
+    __tablename__ = "backfill_checkpoints"
+
+    source = Column(String, primary_key=True)  # reliefweb
+    query = Column(String, nullable=False)  # Parameters the offsets refer to (a different query restarts)
+    next_offset = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)  # Upstream total count when last seen
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
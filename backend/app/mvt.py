@@ -0,0 +1,109 @@
+# backend/app/mvt.py
+"""
+Minimal Mapbox Vector Tile (v2) encoder for point layers
+Hand-rolled protobuf so crisis tiles need no extra dependency
+"""
+import math
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+from .clusters import MAX_MERCATOR_LAT
+
+EXTENT = 4096
+
+_VARINT = 0
+_FIXED64 = 1
+_BYTES = 2
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, _BYTES) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value) -> bytes:
+    """Tile Value message: string=1, double=3, int=4, bool=7"""
+    if isinstance(value, bool):
+        return _key(7, _VARINT) + _varint(int(value))
+    if isinstance(value, int):
+        return _key(4, _VARINT) + _varint(value & 0xFFFFFFFFFFFFFFFF)
+    if isinstance(value, float):
+        return _key(3, _FIXED64) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+def lonlat_to_tile_px(lon: float, lat: float, z: int, x: int, y: int) -> Tuple[int, int]:
+    """Project lon/lat to integer coordinates inside tile (z, x, y)"""
+    lat = max(min(lat, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    world = EXTENT * (2 ** z)
+    gx = (lon + 180.0) / 360.0 * world
+    sin_lat = math.sin(math.radians(lat))
+    gy = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * world
+    return round(gx - x * EXTENT), round(gy - y * EXTENT)
+
+
+def encode_point_layer(name: str, features: List[Dict], z: int, x: int, y: int) -> bytes:
+    """
+    Encode one point layer as a complete tile
+
+    Args:
+        name: Layer name seen by the map style
+        features: Dicts with `id`, `latitude`, `longitude` and `properties`
+        z, x, y: Tile address
+    """
+    if not features:
+        return b""
+
+    keys: Dict[str, int] = {}
+    values: Dict[tuple, int] = {}
+    encoded_features = []
+
+    for feature in features:
+        tags = []
+        for key, value in feature["properties"].items():
+            if value is None:
+                continue
+            key_index = keys.setdefault(key, len(keys))
+            value_key = (type(value).__name__, value)
+            value_index = values.setdefault(value_key, len(values))
+            tags.extend([key_index, value_index])
+
+        px, py = lonlat_to_tile_px(feature["longitude"], feature["latitude"], z, x, y)
+        geometry = [(1 & 0x7) | (1 << 3), _zigzag(px), _zigzag(py)]  # MoveTo(1)
+
+        body = _key(1, _VARINT) + _varint(feature["id"])
+        body += _packed(2, tags)
+        body += _key(3, _VARINT) + _varint(1)  # GeomType.POINT
+        body += _packed(4, geometry)
+        encoded_features.append(_bytes_field(2, body))
+
+    layer = _key(15, _VARINT) + _varint(2)
+    layer += _bytes_field(1, name.encode("utf-8"))
+    layer += b"".join(encoded_features)
+    layer += b"".join(_bytes_field(3, key.encode("utf-8")) for key in keys)
+    layer += b"".join(_bytes_field(4, _encode_value(value)) for _, value in values)
+    layer += _key(5, _VARINT) + _varint(EXTENT)
+    return _bytes_field(3, layer)
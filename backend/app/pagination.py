@@ -0,0 +1,88 @@
+# backend/app/pagination.py
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque url-safe tokens encoding the (sort key, id) of the last row on a page
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import HTTPException
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Sort key a cursor may carry, per sort; anything else would only fail once bound into SQL
+CURSOR_KEY_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "severity": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "relevance": _is_number,
+    # "-infinity" stands in for a NULL last_updated (see SORT_KEYS in routers/crises.py)
+    "last_updated": lambda value: isinstance(value, datetime) or value == "-infinity",
+    "title": lambda value: isinstance(value, str),
+    "id": lambda value: value is None,
+}
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """
+    Build an opaque cursor from the last row of a page
+
+    Args:
+        sort: Name of the sort the cursor belongs to
+        value: Sort key of the last row
+        row_id: Primary key of the last row (tie-breaker)
+    """
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps([sort, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException(400) if the cursor is malformed, was issued for another sort,
+        or carries a sort key of the wrong type for its sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        if not isinstance(value, (str, int, float, datetime, type(None))):
+            raise ValueError("cursor sort key must be a scalar")
+        row_id = int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+    check = CURSOR_KEY_CHECKS.get(sort)
+    if check is not None and not check(value):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id
+
+
+def keyset_clause(sort_expr: str, value: Any, row_id: int) -> Tuple[str, list]:
+    """
+    WHERE fragment selecting the rows after (value, row_id) for
+    ORDER BY {sort_expr} DESC, id DESC
+
+    `sort_expr` must come from a fixed allow-list and never be NULL, so the
+    row comparison can be answered by a matching composite index.
+    """
+    if sort_expr == "id":
+        return "id < %s", [row_id]
+    return f"({sort_expr}, id) < (%s, %s)", [value, row_id]
+
+
+def order_by(sort_expr: str) -> str:
+    """ORDER BY expression matching keyset_clause"""
+    if sort_expr == "id":
+        return "id DESC"
+    return f"{sort_expr} DESC, id DESC"
@@ -1,32 +1,108 @@
 # backend/app/routers/charities.py
-from fastapi import APIRouter, Query
-from typing import List
-from psycopg2.extras import RealDictCursor
-from ..db import engine
-from ..schemas import CharityOut
+from typing import AsyncIterator, Literal
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from ..api_cache import cached_json, serialize
+from ..db import async_pool
+from ..pagination import decode_cursor, encode_cursor, keyset_clause, order_by
+from ..schemas import CharityOut, PaginatedCharities
 
 router = APIRouter(prefix="/charities", tags=["charities"])
 
-@router.get("/", response_model=List[CharityOut])
-def list_charities(crisis_id: int | None = Query(default=None)):
-    sql = """
-      SELECT id, name, description, website, logo_url, related_crisis_id, verified
-      FROM charities
+# Every CharityOut field, so rows can be serialized as-is (api_cache trusted serialization)
+CHARITY_COLUMNS_SQL = (
+    "id, name, description, website, logo_url, donation_url, country_code, source, related_crisis_id, crisis_id"
+)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows fetched per round trip from the server-side cursor, and per chunk sent, while streaming
+STREAM_BATCH_SIZE = 1000
+
+
+def _build_filters(
+    crisis_id: int | None, country_code: str | None, source: str | None, cursor: str | None
+) -> tuple[str, list[object]]:
+    """
+    WHERE clause for a charity listing, newest first (id DESC)
+
+    Equality filters plus the keyset seek match the (column, id DESC) indexes from etl/migrate.py.
     """
-    params = []
-    if crisis_id:
-        sql += " WHERE related_crisis_id = %s"
+    clauses: list[str] = []
+    params: list[object] = []
+    if crisis_id is not None:
+        clauses.append("related_crisis_id = %s")
         params.append(crisis_id)
+    if country_code:
+        clauses.append("country_code = %s")
+        params.append(country_code.upper())
+    if source:
+        clauses.append("source = %s")
+        params.append(source)
+    if cursor:
+        _, after_id = decode_cursor(cursor, "id")
+        clause, clause_params = keyset_clause("id", None, after_id)
+        clauses.append(clause)
+        params.extend(clause_params)
+    where_sql = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where_sql, params
+
+
+async def _query_charities(
+    crisis_id: int | None, country_code: str | None, source: str | None, cursor: str | None, limit: int
+) -> dict:
+    where_sql, params = _build_filters(crisis_id, country_code, source, cursor)
+
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            # Fetch one extra row to learn whether another page exists
+            await cur.execute(f"""
+                SELECT {CHARITY_COLUMNS_SQL}
+                FROM charities
+                {where_sql}
+                ORDER BY {order_by("id")}
+                LIMIT %s
+            """, params + [limit + 1])
+            items = await cur.fetchall()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor("id", None, items[-1]["id"])
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+
+async def _stream_charities(where_sql: str, params: list[object]) -> AsyncIterator[bytes]:
+    """One JSON object per line; one chunk per STREAM_BATCH_SIZE rows read from a server-side cursor"""
+    async with async_pool.connection() as conn:
+        async with conn.cursor(name="charities_stream") as cur:
+            await cur.execute(f"""
+                SELECT {CHARITY_COLUMNS_SQL}
+                FROM charities
+                {where_sql}
+                ORDER BY {order_by("id")}
+            """, params)
+            while rows := await cur.fetchmany(STREAM_BATCH_SIZE):
+                yield b"".join(serialize(CharityOut, row, trusted=True) + b"\n" for row in rows)
+
+
+@router.get("/", response_model=PaginatedCharities)
+async def list_charities(
+    request: Request,
+    crisis_id: int | None = Query(default=None),
+    country_code: str | None = Query(default=None, min_length=2, max_length=2, description="ISO alpha-2"),
+    source: str | None = Query(default=None, description="everyorg, globalgiving, opencollective, ..."),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="Opaque next_cursor from a previous page"),
+    format: Literal["json", "ndjson"] = Query(default="json", description="ndjson streams every match"),
+):
+    """Charities, newest first; format=ndjson streams all matches (limit ignored) as JSON lines"""
+    if format == "ndjson":
+        where_sql, params = _build_filters(crisis_id, country_code, source, cursor)
+        return StreamingResponse(_stream_charities(where_sql, params), media_type=NDJSON_MEDIA_TYPE)
 
-    raw_conn = engine.raw_connection()
-    try:
-        with raw_conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-        raw_conn.commit()
-        return rows
-    except Exception:
-        raw_conn.rollback()
-        raise
-    finally:
-        raw_conn.close()
+    params = {
+        "crisis_id": crisis_id, "country_code": country_code, "source": source,
+        "cursor": cursor, "limit": limit,
+    }
+    return await cached_json(
+        request, "charities", params, PaginatedCharities, lambda: _query_charities(**params), trusted=True
+    )
@@ -1,62 +1,415 @@
-from fastapi import APIRouter, Query
-from psycopg2.extras import RealDictCursor
-from ..db import engine
-from ..schemas import CrisisOut, PaginatedCrises
+import asyncio
+from typing import AsyncIterator, Literal
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from psycopg.rows import tuple_row
+from ..api_cache import cached_json
+from ..cache import LRUCache, get_data_version_async
+from ..clusters import MAX_CLUSTER_ZOOM, get_clusters_async, tile_range
+from ..db import async_pool
+from ..export import make_encoder
+from ..models import ACTIVE_CRISES_SQL
+from ..geo import bbox_clause, parse_bbox, radius_clause, validate_center
+from ..pagination import decode_cursor, encode_cursor, keyset_clause, order_by
+from ..schemas import (
+    CrisesInArea, CrisisClusters, CrisisOut, CrisisWithCharities, PaginatedCrises, PaginatedCrisesWithCharities,
+)
+from ..search import MATCH_SQL, RANK_SQL, build_tsquery
+from .charities import CHARITY_COLUMNS_SQL
 
 router = APIRouter(prefix="/crises", tags=["crises"])
 
-@router.get("/", response_model=PaginatedCrises)
-def list_crises(
+# Allowed sorts -> (non-null SQL sort expression, Python stand-in for NULL).
+# The expressions match the composite indexes created in etl/migrate.py.
+SORT_KEYS = {
+    "severity": ("COALESCE(severity, 0)", 0),
+    "last_updated": ("COALESCE(last_updated, '-infinity')", "-infinity"),
+    "id": ("id", None),
+    # Only meaningful together with `q`; falls back to severity otherwise
+    "relevance": (RANK_SQL, 0),
+}
+
+# Every CrisisOut field, so rows can be serialized as-is (api_cache trusted serialization);
+# also the allow-list for `fields=` projections
+CRISIS_FIELDS = (
+    "id", "title", "category", "description", "severity", "latitude", "longitude", "country_code",
+    "source", "source_id", "source_api", "last_updated",
+)
+CRISIS_COLUMNS_SQL = ", ".join(CRISIS_FIELDS)
+
+# Rows per server-side cursor fetch (and per Arrow record batch / Parquet row group) in /export
+EXPORT_BATCH_SIZE = 10_000
+
+# Exact counts per (data version, filter signature); stale entries age out of the LRU
+_count_cache = LRUCache(maxsize=2048)
+
+
+def _build_filters(q: str | None, category: str | None) -> tuple[list[str], list[object], str | None]:
+    """
+    WHERE clauses shared by the crisis list queries
+
+    Returns:
+        (clauses, params, tsquery) where tsquery is None when q has no search terms
+    """
+    clauses: list[str] = [ACTIVE_CRISES_SQL]
+    params: list[object] = []
+
+    # Full-text search on the indexed search_vector column
+    tsquery = build_tsquery(q) if q else None
+    if tsquery:
+        clauses.append(MATCH_SQL)
+        params.append(tsquery)
+
+    if category:
+        clauses.append("category = %s")
+        params.append(category)
+
+    return clauses, params, tsquery
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    """
+    Validate a comma-separated `fields=` projection
+
+    Returns:
+        The requested fields in CRISIS_FIELDS order, always including id; every field when empty
+
+    Raises:
+        HTTPException(400) on names outside CRISIS_FIELDS
+    """
+    if not fields:
+        return CRISIS_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(CRISIS_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(name for name in CRISIS_FIELDS if name in requested)
+
+
+async def _count_total(cur, where_sql: str, params: list, total_mode: str) -> tuple[int | None, str]:
+    """
+    Resolve `total` for a list request
+
+    Returns:
+        (total, mode that produced it): exact, cached, estimate or none
+    """
+    if total_mode == "none":
+        return None, "none"
+
+    if total_mode == "estimate":
+        if where_sql == f"WHERE {ACTIVE_CRISES_SQL}":
+            # The planner's row estimate for the live-crisis filter (soft-deleted rows excluded);
+            # only trusted once the table has been analyzed (reltuples is -1 before that)
+            await cur.execute("SELECT reltuples FROM pg_class WHERE oid = 'crises'::regclass")
+            row = await cur.fetchone()
+            if row and row["reltuples"] >= 0:
+                await cur.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM crises {where_sql}", params)
+                plan = (await cur.fetchone())["QUERY PLAN"][0]["Plan"]
+                return int(plan["Plan Rows"]), "estimate"
+
+        # Filtered lists: planner estimates for text search are too rough, so count once per data version
+
+        key = (await get_data_version_async(cur), where_sql, tuple(params))
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached, "cached"
+
+        await cur.execute(f"SELECT COUNT(*) AS count FROM crises {where_sql}", params)
+        total = int((await cur.fetchone())["count"])
+        _count_cache.set(key, total)
+        return total, "exact"
+
+    await cur.execute(f"SELECT COUNT(*) AS count FROM crises {where_sql}", params)
+    return int((await cur.fetchone())["count"]), "exact"
+
+
+async def _attach_charities(cur, crises: list[dict], per_crisis: int) -> None:
+    """
+    Nest each crisis's charities under crises[i]["charities"] with one batched query
+
+    Args:
+        cur: Open async cursor
+        crises: Crisis rows (dicts with an id)
+        per_crisis: Maximum charities kept per crisis
+    """
+    by_crisis: dict[int, list[dict]] = {crisis["id"]: [] for crisis in crises}
+    if by_crisis:
+        await cur.execute(f"""
+            SELECT {CHARITY_COLUMNS_SQL}
+            FROM (
+                SELECT {CHARITY_COLUMNS_SQL},
+                       ROW_NUMBER() OVER (PARTITION BY related_crisis_id ORDER BY id) AS position
+                FROM charities
+                WHERE related_crisis_id = ANY(%s)
+            ) ranked
+            WHERE position <= %s
+            ORDER BY related_crisis_id, id
+        """, [list(by_crisis), per_crisis])
+        for charity in await cur.fetchall():
+            by_crisis[charity["related_crisis_id"]].append(charity)
+    for crisis in crises:
+        crisis["charities"] = by_crisis[crisis["id"]]
+
+
+async def _query_crises(
+    q: str | None, category: str | None, sort: str, limit: int, offset: int,
+    cursor: str | None, total_mode: str, include: str | None = None, charities_limit: int = 0,
+    fields: tuple[str, ...] = CRISIS_FIELDS,
+) -> dict:
+    clauses, params, tsquery = _build_filters(q, category)
+    where_sql = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+
+    # Only allow safe, known sort columns to prevent SQL injection
+    if sort not in SORT_KEYS or (sort == "relevance" and tsquery is None):
+        sort = "severity"
+    sort_expr, null_key = SORT_KEYS[sort]
+
+    # The cursor needs the sort key of the last row even when the projection leaves it out;
+    # such columns are selected anyway and dropped before returning
+    columns = list(fields)
+    hidden: list[str] = []
+    if sort in ("severity", "last_updated") and sort not in fields:
+        columns.append(sort)
+        hidden.append(sort)
+
+    # Relevance ranks against the search query, so its expression carries a parameter
+    select_params: list[object] = []
+    sort_params: list[object] = []
+    order_sql = order_by(sort_expr)
+    if sort == "relevance":
+        # ts_rank_cd is float4; widening it keeps the value echoed in the cursor exact
+        columns.append(f"{RANK_SQL}::float8 AS rank")
+        hidden.append("rank")
+        select_params = [tsquery]
+        sort_params = [tsquery]
+        order_sql = order_by("rank")
+
+    # Keyset pagination: seek past the last row instead of scanning OFFSET rows
+    page_clauses = list(clauses)
+    page_params = list(params)
+    if cursor:
+        after_key, after_id = decode_cursor(cursor, sort)
+        clause, clause_params = keyset_clause(sort_expr, after_key, after_id)
+        page_clauses.append(clause)
+        page_params.extend(sort_params + clause_params)
+        offset = 0
+    page_where_sql = ("WHERE " + " AND ".join(page_clauses)) if page_clauses else ""
+
+    # Pooled async connection; the block commits on success and rolls back on error,
+    # so a failed query still bubbles up as a clean 500 from FastAPI's handler
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            total, total_source = await _count_total(cur, where_sql, params, total_mode)
+
+            # Fetch one extra row to learn whether another page exists
+            await cur.execute(f"""
+                SELECT {", ".join(columns)}
+                FROM crises
+                {page_where_sql}
+                ORDER BY {order_sql}
+                LIMIT %s OFFSET %s
+            """, select_params + page_params + [limit + 1, offset])
+
+            items = await cur.fetchall()
+            has_more = len(items) > limit
+            items = items[:limit]
+
+            if include == "charities":
+                await _attach_charities(cur, items, charities_limit)
+
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        key_field = "rank" if sort == "relevance" else sort
+        last_key = last[key_field] if last[key_field] is not None else null_key
+        next_cursor = encode_cursor(sort, last_key, last["id"])
+    for item in items:
+        for name in hidden:
+            del item[name]
+
+    # `items` hold exactly the projected CrisisOut fields, so they are serialized without revalidation
+    return {
+        "total": total,
+        "total_mode": total_source,
+        "items": items,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/", response_model=PaginatedCrises | PaginatedCrisesWithCharities)
+async def list_crises(
+    request: Request,
     q: str | None = None,
     category: str | None = None,
     sort: str = Query(default="severity"),
     limit: int = Query(default=20, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="Opaque next_cursor from a previous page"),
+    total_mode: Literal["exact", "estimate", "none"] = Query(default="exact"),
+    include: Literal["charities"] | None = Query(default=None, description="Nest each crisis's charities"),
+    charities_limit: int = Query(default=50, ge=1, le=500, description="Charities per crisis with include"),
+    fields: str | None = Query(default=None, description="Comma-separated item fields to return (id is always included)"),
 ):
-    # Only allow safe, known sort columns to prevent SQL injection
-    allowed_sorts = {"severity", "last_updated", "id"}
-    if sort not in allowed_sorts:
-        sort = "severity"
+    params = {
+        "q": q, "category": category, "sort": sort, "limit": limit,
+        "offset": offset, "cursor": cursor, "total_mode": total_mode, "include": include,
+        "fields": parse_fields(fields),
+    }
+    model = PaginatedCrises
+    if include == "charities":
+        params["charities_limit"] = charities_limit
+        model = PaginatedCrisesWithCharities
+    return await cached_json(request, "crises", params, model, lambda: _query_crises(**params), trusted=True)
 
-    clauses: list[str] = []
-    params: list[object] = []
 
-    # Tokenized ILIKE search
-    if q:
-        for token in q.split():
-            clauses.append("(title ILIKE %s OR description ILIKE %s)")
-            params.extend([f"%{token}%", f"%{token}%"])
+async def _query_crises_within(
+    bbox: str | None, lat: float | None, lon: float | None, radius_km: float | None,
+    category: str | None, limit: int, fields: tuple[str, ...] = CRISIS_FIELDS,
+) -> dict:
+    has_center = validate_center(lat, lon, radius_km)
+    if bool(bbox) == has_center:
+        raise HTTPException(status_code=400, detail="Provide either bbox or lat/lon/radius_km")
+
+    if bbox:
+        area_sql, params = bbox_clause(parse_bbox(bbox))
+    else:
+        area_sql, params = radius_clause(lat, lon, radius_km)
 
+    clauses = [ACTIVE_CRISES_SQL, area_sql]
     if category:
         clauses.append("category = %s")
         params.append(category)
 
-    where_sql = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            # Most severe first, so a truncated viewport still shows what matters
+            await cur.execute(f"""
+                SELECT {", ".join(fields)}
+                FROM crises
+                WHERE {" AND ".join(clauses)}
+                ORDER BY {order_by(SORT_KEYS["severity"][0])}
+                LIMIT %s
+            """, params + [limit + 1])
 
-    # Get raw psycopg2 connection from SQLAlchemy engine
-    raw_conn = engine.raw_connection()
-    try:
-        with raw_conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(f"SELECT COUNT(*) AS count FROM crises {where_sql}", params)
-            total = int(cur.fetchone()["count"])
+            items = await cur.fetchall()
+
+    truncated = len(items) > limit
+    items = items[:limit]
+    return {"items": items, "count": len(items), "truncated": truncated}
+
+
+@router.get("/within", response_model=CrisesInArea)
+async def list_crises_within(
+    request: Request,
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat"),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lon: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0, le=20000),
+    category: str | None = None,
+    limit: int = Query(default=500, ge=1, le=5000),
+    fields: str | None = Query(default=None, description="Comma-separated item fields to return (id is always included)"),
+):
+    """Crises inside the map viewport (bbox) or within radius_km of a center point"""
+    params = {
+        "bbox": bbox, "lat": lat, "lon": lon, "radius_km": radius_km, "category": category, "limit": limit,
+        "fields": parse_fields(fields),
+    }
+    return await cached_json(
+        request, "crises/within", params, CrisesInArea, lambda: _query_crises_within(**params), trusted=True
+    )
+
+
+async def _query_clusters(z: int, bbox: str | None, category: str | None) -> dict:
+    area = parse_bbox(bbox) if bbox else None
+    tile_range(z, area)  # 400 before checking out a connection
 
-            cur.execute(f"""
-                SELECT id, title, category, description, severity,
-                       latitude, longitude, source_api, last_updated
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            clusters = await get_clusters_async(cur, z, category, area)
+    return {"z": z, "clusters": clusters}
+
+
+@router.get("/clusters", response_model=CrisisClusters)
+async def list_crisis_clusters(
+    request: Request,
+    z: int = Query(ge=0, le=MAX_CLUSTER_ZOOM),
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat"),
+    category: str | None = None,
+):
+    """Pre-aggregated crisis clusters for zoomed-out map views"""
+    params = {"z": z, "bbox": bbox, "category": category}
+    return await cached_json(
+        request, "crises/clusters", params, CrisisClusters, lambda: _query_clusters(**params)
+    )
+
+
+async def _stream_export(encoder, columns: tuple[str, ...], where_sql: str, params: list) -> AsyncIterator[bytes]:
+    """Encoded export chunks, one per EXPORT_BATCH_SIZE rows read from a server-side cursor"""
+    async with async_pool.connection() as conn:
+        async with conn.cursor(name="crises_export", row_factory=tuple_row) as cur:
+            await cur.execute(f"""
+                SELECT {", ".join(columns)}
                 FROM crises
                 {where_sql}
-                ORDER BY {sort} DESC
-                LIMIT %s OFFSET %s
-            """, params + [limit, offset])
-
-            items = cur.fetchall()
-        raw_conn.commit()
-    except Exception:
-        # Reset failed transaction and bubble up a clean 500 with FastAPI's handler
-        raw_conn.rollback()
-        raise
-    finally:
-        raw_conn.close()
-
-    # `items` are already dicts compatible with CrisisOut; FastAPI will coerce them
-    return {"total": total, "items": items, "limit": limit, "offset": offset}
+                ORDER BY id
+            """, params)
+            while rows := await cur.fetchmany(EXPORT_BATCH_SIZE):
+                # Encoding is CPU-bound; keep it off the event loop
+                chunk = await asyncio.to_thread(encoder.write, rows)
+                if chunk:
+                    yield chunk
+    yield encoder.close()
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_crises(
+    q: str | None = None,
+    category: str | None = None,
+    format: Literal["csv", "arrow", "parquet"] = Query(default="csv"),
+    fields: str | None = Query(default=None, description="Comma-separated columns to export (id is always included)"),
+):
+    """Every crisis matching the list filters, streamed by id as CSV, an Arrow IPC stream or Parquet"""
+    columns = parse_fields(fields)
+    clauses, params, _ = _build_filters(q, category)
+    try:
+        encoder = make_encoder(format, columns)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    return StreamingResponse(
+        _stream_export(encoder, columns, "WHERE " + " AND ".join(clauses), params),
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="crises.{encoder.extension}"'},
+    )
+
+
+async def _query_crisis(crisis_id: int, charities_limit: int) -> dict:
+    async with async_pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(f"""
+                SELECT {CRISIS_COLUMNS_SQL}
+                FROM crises
+                WHERE id = %s AND {ACTIVE_CRISES_SQL}
+            """, [crisis_id])
+            crisis = await cur.fetchone()
+            if crisis is None:
+                raise HTTPException(status_code=404, detail="Crisis not found")
+            await _attach_charities(cur, [crisis], charities_limit)
+    return crisis
+
+
+# Declared last so /{crisis_id} never shadows the fixed paths above
+@router.get("/{crisis_id}", response_model=CrisisWithCharities)
+async def get_crisis(
+    request: Request,
+    crisis_id: int,
+    charities_limit: int = Query(default=50, ge=1, le=500),
+):
+    """One crisis with its charities nested"""
+    params = {"crisis_id": crisis_id, "charities_limit": charities_limit}
+    return await cached_json(
+        request, "crises/detail", params, CrisisWithCharities, lambda: _query_crisis(**params), trusted=True
+    )
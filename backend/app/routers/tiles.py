@@ -0,0 +1,35 @@
+# backend/app/routers/tiles.py
+import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from psycopg2.extras import RealDictCursor
+from ..api_cache import etag_matches
+from ..db import engine
+from ..tiles import get_tile
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MAX_TILE_ZOOM = 22
+TILE_MAX_AGE = int(os.getenv("TILE_MAX_AGE", "300"))
+
+@router.get("/crises/{z}/{x}/{y}.mvt", response_class=Response)
+def crisis_tile(z: int, x: int, y: int, request: Request, category: str | None = None):
+    """Crisis points for one map tile, encoded as a Mapbox Vector Tile"""
+    if not (0 <= z <= MAX_TILE_ZOOM) or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor(cursor_factory=RealDictCursor) as cur:
+            tile, etag = get_tile(cur, z, x, y, category)
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={TILE_MAX_AGE}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
@@ -1,6 +1,6 @@
 # backend/app/schemas.py
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
 
@@ -73,11 +73,40 @@ class CrisisWithCharities(Crisis):
 # Pagination response schemas
 class PaginatedCrises(BaseModel):
     items: List[Crisis]
-    total: int
+    total: Optional[int] = None  # None when requested with total_mode=none
+    total_mode: str = "exact"  # exact, cached, estimate or none
     limit: int
     offset: int
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
+
+
+class PaginatedCrisesWithCharities(PaginatedCrises):
+    items: List[CrisisWithCharities]  # /crises?include=charities
+
+
+class CrisesInArea(BaseModel):
+    items: List[Crisis]
+    count: int
+    truncated: bool = False  # True when more crises matched than `limit`
+
+
+class CrisisCluster(BaseModel):
+    x: int  # Grid cell column at this zoom
+    y: int  # Grid cell row at this zoom
+    count: int
+    max_severity: Optional[int] = None
+    categories: Dict[str, int]  # Category -> number of crises in the cell
+    latitude: float  # Centroid
+    longitude: float
+    crisis_id: Optional[int] = None  # Set when the cluster is a single crisis
+
+
+class CrisisClusters(BaseModel):
+    z: int
+    clusters: List[CrisisCluster]
 
 
 class PaginatedCharities(BaseModel):
     items: List[Charity]
-    total: int
+    limit: int
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
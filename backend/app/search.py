@@ -0,0 +1,48 @@
+# backend/app/search.py
+"""
+Full-text search over crises
+Backed by the stored `search_vector` tsvector column (title weighted above description)
+and its GIN index, both created in etl/migrate.py
+"""
+import re
+from typing import Optional
+
+SEARCH_CONFIG = "english"
+
+# Generated column expression; kept in sync on insert/update by Postgres itself
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+MATCH_SQL = f"search_vector @@ to_tsquery('{SEARCH_CONFIG}', %s)"
+RANK_SQL = f"ts_rank_cd(search_vector, to_tsquery('{SEARCH_CONFIG}', %s))"
+
+# Letters and digits; Postgres' parser also splits words at underscores
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Postgres' english.stop (the stop list of SEARCH_CONFIG): to_tsquery drops these words, so a
+# query made only of them would match nothing instead of searching nothing
+STOPWORDS = frozenset("""
+    i me my myself we our ours ourselves you your yours yourself yourselves he him his himself
+    she her hers herself it its itself they them their theirs themselves what which who whom
+    this that these those am is are was were be been being have has had having do does did doing
+    a an the and but if or because as until while of at by for with about against between into
+    through during before after above below to from up down in out on off over under again
+    further then once here there when where why how all any both each few more most other some
+    such no nor not only own same so than too very s t can will just don should now
+""".split())
+
+
+def build_tsquery(q: str) -> Optional[str]:
+    """
+    Turn free text into a prefix-matching tsquery string
+
+    Every token must match (AND), each as a prefix so partially typed words
+    still hit: "flood ban" -> "flood:* & ban:*". Returns None when q has no
+    searchable tokens (stop words such as "the" are not searchable).
+    """
+    tokens = [token for token in _TOKEN_RE.findall(q) if token.lower() not in STOPWORDS]
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
@@ -0,0 +1,140 @@
+# backend/app/tiles.py
+"""
+Crisis vector tiles
+Encoded tiles are kept in an LRU cache; when the ETL bumps the data version only the
+tiles overlapping the changed area (recorded in data_changes) are evicted
+"""
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from .cache import LRUCache, get_data_version
+from .geo import BBox, bbox_clause, bboxes_intersect, tile_bbox
+from .models import ACTIVE_CRISES_SQL
+from .mvt import encode_point_layer
+
+TILE_LAYER = "crises"
+MAX_TILE_FEATURES = int(os.getenv("MAX_TILE_FEATURES", "5000"))
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "4096"))
+# Fraction of a tile fetched around it so edge markers render on both neighbours
+TILE_BUFFER = 0.0625
+
+
+class TileCache:
+    """(z, x, y, category) -> (tile bytes, etag), kept in step with data_changes"""
+
+    def __init__(self, maxsize: int):
+        self._tiles = LRUCache(maxsize=maxsize)
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def sync(self, cur) -> int:
+        """
+        Evict tiles touched by data versions newer than the one last seen
+
+        The version compare, the eviction and the version update happen under one lock,
+        so no request sees the new version while stale tiles are still cached.
+
+        Returns:
+            The data version read from the database (pass it to set)
+        """
+        version = get_data_version(cur)
+        with self._lock:
+            previous = self._version
+            if previous is not None and version <= previous:
+                return version
+            if previous is not None:
+                self._evict_changed(cur, previous, version)
+            self._version = version
+        return version
+
+    def _evict_changed(self, cur, previous: int, version: int) -> None:
+        cur.execute(
+            """
+            SELECT version, min_lon, min_lat, max_lon, max_lat
+            FROM data_changes
+            WHERE version > %s AND version <= %s
+            """,
+            (previous, version),
+        )
+        changes = cur.fetchall()
+
+        # A missing version (pruned history) or a change without a bbox means "anything"
+        seen = {row["version"] for row in changes}
+        if len(seen) < version - previous or any(row["min_lon"] is None for row in changes):
+            self._tiles.clear()
+            return
+
+        areas = [(row["min_lon"], row["min_lat"], row["max_lon"], row["max_lat"]) for row in changes]
+        self._tiles.discard_where(
+            lambda key: any(bboxes_intersect(tile_bbox(*key[:3], buffer=TILE_BUFFER), area) for area in areas)
+        )
+
+    def get(self, key: Tuple) -> Optional[Tuple[bytes, str]]:
+        return self._tiles.get(key)
+
+    def set(self, key: Tuple, tile: bytes, etag: str, version: int) -> None:
+        """Cache a tile built after sync returned `version`, unless the data has moved on since"""
+        with self._lock:
+            if version == self._version:
+                self._tiles.set(key, (tile, etag))
+
+    def clear(self) -> None:
+        self._tiles.clear()
+
+
+tile_cache = TileCache(TILE_CACHE_SIZE)
+
+
+def _query_features(cur, area: BBox, category: Optional[str]) -> list:
+    area_sql, params = bbox_clause(area)
+    clauses = [ACTIVE_CRISES_SQL, area_sql]
+    if category:
+        clauses.append("category = %s")
+        params.append(category)
+
+    # Most severe first, so capped low-zoom tiles keep the important markers
+    cur.execute(f"""
+        SELECT id, title, category, severity, latitude, longitude
+        FROM crises
+        WHERE {" AND ".join(clauses)}
+        ORDER BY COALESCE(severity, 0) DESC, id DESC
+        LIMIT %s
+    """, params + [MAX_TILE_FEATURES])
+    return cur.fetchall()
+
+
+def get_tile(cur, z: int, x: int, y: int, category: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    Encoded MVT tile and its strong ETag
+
+    Args:
+        cur: Open psycopg2 RealDictCursor
+    """
+    version = tile_cache.sync(cur)
+    key = (z, x, y, category)
+    cached = tile_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = _query_features(cur, tile_bbox(z, x, y, buffer=TILE_BUFFER), category)
+    features: list[Dict] = [
+        {
+            "id": row["id"],
+            "latitude": row["latitude"],
+            "longitude": row["longitude"],
+            "properties": {
+                "id": row["id"],
+                "title": row["title"],
+                "category": row["category"],
+                "severity": row["severity"],
+            },
+        }
+        for row in rows
+    ]
+    tile = encode_point_layer(TILE_LAYER, features, z, x, y)
+    # Content hash: unchanged tiles keep their ETag across ETL runs
+    etag = '"' + hashlib.sha1(tile).hexdigest() + '"'
+    tile_cache.set(key, tile, etag, version)
+    return tile, etag
@@ -0,0 +1,131 @@
+# backend/tests/test_api_cache.py
+import asyncio
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app import api_cache
+from app.api_cache import MemoryBackend, cache_key, etag_matches
+
+ETAG = '"0123456789abcdef0123456789abcdef"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    (ETAG, True),
+    (f"W/{ETAG}", True),
+    ("*", False),
+    (f'"other", {ETAG}', True),
+    (f' "other" ,W/{ETAG} ', True),
+    ('"0123456789abcdef"', False),  # a prefix of the tag
+    (ETAG.strip('"'), False),  # unquoted
+    ('"other"', False),
+    ("", False),
+    (None, False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, ETAG) is expected
+
+
+def test_weak_etag_matches_either_form():
+    assert etag_matches(ETAG, f"W/{ETAG}")
+    assert etag_matches(f"W/{ETAG}", f"W/{ETAG}")
+    assert not etag_matches('"other"', f"W/{ETAG}")
+
+
+def test_cache_key_ignores_none_params_and_order():
+    key = cache_key("crises", 7, {"q": "flood", "limit": 50, "category": None})
+    assert key == cache_key("crises", 7, {"limit": 50, "q": "flood"})
+    assert len(key) == 64
+
+
+def test_cache_key_changes_with_route_version_and_values():
+    key = cache_key("crises", 7, {"limit": 50})
+    assert key != cache_key("charities", 7, {"limit": 50})
+    assert key != cache_key("crises", 8, {"limit": 50})
+    assert key != cache_key("crises", 7, {"limit": 51})
+    assert key != cache_key("crises", 7, {"limit": "50"})
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(api_cache.time, "monotonic", lambda: now[0])
+    cache = MemoryBackend(maxsize=2, ttl=10)
+
+    async def main():
+        await cache.set("a", b"1")
+        hit = await cache.get("a")
+        now[0] += 11
+        return hit, await cache.get("a")
+
+    assert asyncio.run(main()) == (b"1", None)
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/crises", "headers": headers})
+
+
+def test_cached_json_serves_hits_and_304s(monkeypatch):
+    async def version(pool):
+        return 3
+
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return [{"id": 1}]
+
+    monkeypatch.setattr(api_cache, "backend", MemoryBackend(maxsize=8, ttl=60))
+    monkeypatch.setattr(api_cache, "current_data_version", version)
+
+    async def main():
+        params = {"limit": 1}
+        first = await api_cache.cached_json(_request(), "crises", params, list, build, trusted=True)
+        second = await api_cache.cached_json(_request(), "crises", params, list, build, trusted=True)
+        revalidated = await api_cache.cached_json(
+            _request(first.headers["etag"]), "crises", params, list, build, trusted=True)
+        return first, second, revalidated
+
+    first, second, revalidated = asyncio.run(main())
+    assert first.headers["x-cache"] == "miss" and second.headers["x-cache"] == "hit"
+    assert orjson.loads(second.body) == [{"id": 1}]
+    assert first.headers["etag"] == f'W/"{cache_key("crises", 3, {"limit": 1})[:32]}"'
+    assert revalidated.status_code == 304 and revalidated.body == b""
+    assert len(builds) == 1
+
+
+@pytest.mark.parametrize("if_none_match", ["*", "guessed"])
+def test_conditional_request_for_a_missing_resource_is_a_404(monkeypatch, if_none_match):
+    async def version(pool):
+        return 3
+
+    async def build():
+        raise HTTPException(status_code=404, detail="Crisis not found")
+
+    monkeypatch.setattr(api_cache, "backend", MemoryBackend(maxsize=8, ttl=60))
+    monkeypatch.setattr(api_cache, "current_data_version", version)
+    params = {"crisis_id": 999999}
+    guessed = f'"{cache_key("crises/detail", 3, params)[:32]}"'
+    header = guessed if if_none_match == "guessed" else "*"
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(api_cache.cached_json(_request(header), "crises/detail", params, dict, build))
+    assert e.value.status_code == 404
+
+
+def test_conditional_request_with_rejected_params_is_a_400(monkeypatch):
+    async def version(pool):
+        return 3
+
+    async def build():
+        raise HTTPException(status_code=400, detail="bad cursor")
+
+    monkeypatch.setattr(api_cache, "backend", MemoryBackend(maxsize=8, ttl=60))
+    monkeypatch.setattr(api_cache, "current_data_version", version)
+    params = {"cursor": "garbage"}
+    tag = f'"{cache_key("crises", 3, params)[:32]}"'
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(api_cache.cached_json(_request(tag), "crises", params, dict, build))
+    assert e.value.status_code == 400
@@ -0,0 +1,107 @@
+# backend/tests/test_clusters.py
+import pytest
+from fastapi import HTTPException
+
+from app import clusters
+from app.clusters import (
+    CELLS_PER_TILE, CLUSTER_WORLD_ZOOM, MAX_CLUSTER_TILES, _in_range, _range_bbox, get_clusters, tile_range,
+)
+from app.geo import BOX_SQL, in_bbox
+
+
+def test_world_range_only_at_low_zoom():
+    assert tile_range(0, None) == (0, 0, 0, 0)
+    assert tile_range(CLUSTER_WORLD_ZOOM, None) == (0, 0, 2 ** CLUSTER_WORLD_ZOOM - 1, 2 ** CLUSTER_WORLD_ZOOM - 1)
+    with pytest.raises(HTTPException) as e:
+        tile_range(CLUSTER_WORLD_ZOOM + 1, None)
+    assert e.value.status_code == 400
+
+
+def test_range_snaps_the_bbox_outward_to_tiles():
+    bbox = (-10.0, 35.0, 30.0, 60.0)
+    tiles = tile_range(6, bbox)
+    min_lon, min_lat, max_lon, max_lat = _range_bbox(6, tiles)
+    assert min_lon <= -10 and max_lon >= 30 and min_lat <= 35 and max_lat >= 60
+    assert max_lon - min_lon < 40 + 2 * 360 / 64  # at most one extra tile each side
+
+
+def test_range_wraps_the_antimeridian():
+    x0, _, x1, _ = tiles = tile_range(6, (170.0, -20.0, -170.0, -10.0))
+    assert x0 > x1
+    min_lon, _, max_lon, _ = _range_bbox(6, tiles)
+    assert min_lon <= 170 and max_lon >= -170 and min_lon > max_lon
+    assert _in_range(x0 * CELLS_PER_TILE, tiles[1] * CELLS_PER_TILE, tiles)
+    assert _in_range(0, tiles[1] * CELLS_PER_TILE, tiles)
+    assert not _in_range((x1 + 1) * CELLS_PER_TILE, tiles[1] * CELLS_PER_TILE, tiles)
+
+
+def test_range_covering_every_longitude_does_not_wrap():
+    assert tile_range(2, (10.0, -10.0, 5.0, 10.0))[::2] == (0, 3)
+
+
+def test_range_over_the_tile_budget_is_rejected():
+    with pytest.raises(HTTPException) as e:
+        tile_range(12, (-10.0, 35.0, 30.0, 60.0))
+    assert e.value.status_code == 400
+    x0, y0, x1, y1 = tile_range(12, (2.2, 48.8, 2.5, 48.95))
+    assert (x1 - x0 + 1) * (y1 - y0 + 1) <= MAX_CLUSTER_TILES
+
+
+class FakeCursor:
+    """Groups preset points into cells the way _CLUSTER_SQL does, honouring its bbox"""
+
+    def __init__(self, points):
+        self.points = points
+        self.queries = []
+
+    def execute(self, sql, params):
+        self.queries.append((sql, params))
+        assert sql.count("%s") == len(params)
+        n = params[0]
+        z = (n // CELLS_PER_TILE).bit_length() - 1
+        box = None
+        if BOX_SQL in sql:
+            box = tuple(params[4:8]) if " OR " not in sql else (params[4], params[5], params[10], params[11])
+        cells = {}
+        for point_id, lat, lon in self.points:
+            if box and not in_bbox(lat, lon, box):
+                continue
+            tx, ty = clusters._tile_xy(lon, lat, z + 2)  # CELLS_PER_TILE = 4 = 2 zooms deeper
+            row = cells.setdefault((tx, ty), {
+                "cx": tx, "cy": ty, "category": "Disaster", "count": 0, "max_severity": 1,
+                "lat_sum": 0.0, "lon_sum": 0.0, "min_id": point_id,
+            })
+            row["count"] += 1
+            row["lat_sum"] += lat
+            row["lon_sum"] += lon
+        self._rows = list(cells.values())
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.fixture
+def cursor(monkeypatch):
+    monkeypatch.setattr(clusters, "get_data_version", lambda cur: 1)
+    monkeypatch.setattr(clusters, "_cluster_cache", clusters.LRUCache(maxsize=8))
+    return FakeCursor([(1, 48.85, 2.35), (2, 48.86, 2.36), (3, 40.0, -100.0), (4, -33.9, 151.2)])
+
+
+def test_high_zoom_aggregates_only_the_viewport(cursor):
+    result = get_clusters(cursor, 12, bbox=(2.2, 48.8, 2.5, 48.95))
+    assert sum(c["count"] for c in result) == 2
+    sql, params = cursor.queries[0]
+    assert BOX_SQL in sql and len(params) == 8
+
+    # A viewport inside the same tiles reuses the cached aggregate
+    min_lon, min_lat, max_lon, max_lat = _range_bbox(12, tile_range(12, (2.2, 48.8, 2.5, 48.95)))
+    get_clusters(cursor, 12, bbox=(min_lon + 0.01, min_lat + 0.01, max_lon - 0.01, max_lat - 0.01))
+    assert len(cursor.queries) == 1
+
+
+def test_low_zoom_aggregates_the_world_once_and_clips(cursor):
+    everything = get_clusters(cursor, 2)
+    assert sum(c["count"] for c in everything) == 4
+    europe = get_clusters(cursor, 2, bbox=(-10.0, 35.0, 30.0, 60.0))
+    assert sum(c["count"] for c in europe) == 2
+    assert len(cursor.queries) == 1 and BOX_SQL not in cursor.queries[0][0]
@@ -0,0 +1,78 @@
+# backend/tests/test_compression.py
+import asyncio
+import gzip
+
+import brotli
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app import compression
+from app.compression import CompressionMiddleware
+
+JSON_BODY = b'{"items": [' + b",".join(b'{"id": %d, "title": "Flood"}' % i for i in range(500)) + b"]}"
+
+
+def _app():
+    async def json_route(request):
+        return Response(JSON_BODY, media_type="application/json")
+
+    async def small(request):
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    async def parquet(request):
+        return Response(b"PAR1" + b"\0" * 5000, media_type="application/vnd.apache.parquet")
+
+    async def tile(request):
+        return Response(b"\x1a" * 5000, media_type="application/vnd.mapbox-vector-tile")
+
+    async def csv_stream(request):
+        async def chunks():
+            for _ in range(3):
+                yield b"id,title\r\n" * 500
+        return StreamingResponse(chunks(), media_type="text/csv; charset=utf-8")
+
+    routes = [Route("/json", json_route), Route("/small", small), Route("/parquet", parquet),
+              Route("/tile", tile), Route("/csv", csv_stream)]
+    return CompressionMiddleware(Starlette(routes=routes), minimum_size=1000)
+
+
+DECODERS = {None: lambda raw: raw, "br": brotli.decompress, "gzip": gzip.decompress}
+
+
+def _get(path, encoding):
+    """(headers, body as sent) of one request through the middleware"""
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(_app()), base_url="http://test") as client:
+            async with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+                return response.headers, b"".join([chunk async for chunk in response.aiter_raw()])
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("encoding, expected", [("br, gzip", "br"), ("gzip", "gzip"), ("identity", None)])
+def test_text_is_compressed_with_the_best_accepted_encoding(encoding, expected):
+    headers, raw = _get("/json", encoding)
+    assert headers.get("content-encoding") == expected
+    assert DECODERS[expected](raw) == JSON_BODY
+    if expected:
+        assert headers["vary"] == "Accept-Encoding"
+        assert len(raw) < len(JSON_BODY) / 5
+
+
+@pytest.mark.parametrize("path", ["/parquet", "/tile", "/small"])
+def test_binary_and_small_bodies_are_sent_as_they_are(path):
+    headers, _ = _get(path, "br, gzip")
+    assert "content-encoding" not in headers
+
+
+def test_streamed_text_is_compressed_chunk_by_chunk():
+    headers, raw = _get("/csv", "br")
+    assert headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == b"id,title\r\n" * 1500
+
+
+def test_gzip_only_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert _get("/json", "br, gzip")[0]["content-encoding"] == "gzip"
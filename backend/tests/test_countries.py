@@ -0,0 +1,129 @@
+# backend/tests/test_countries.py
+import struct
+
+import numpy as np
+import pytest
+
+from app import countries
+
+
+def test_code_lookups():
+    assert countries.get("ke").alpha3 == "KEN"
+    assert countries.get(" KEN ").alpha2 == "KE"
+    assert countries.get("XX") is None
+    assert countries.get(None) is None
+    assert countries.iso3_to_iso2("jpn") == "JP"
+    assert countries.iso3_to_iso2("???") is None
+    lat, lon = countries.centroid("JP")
+    assert 30 < lat < 45 and 130 < lon < 145
+    assert countries.centroid(None) is None
+
+
+def test_name_lookups():
+    assert countries.by_name("Japan").alpha2 == "JP"
+    assert countries.by_name("  united   STATES of america ").alpha2 == "US"
+    assert countries.by_name("Türkiye").alpha2 == "TR"
+    assert countries.by_name("Viet Nam").alpha2 == "VN"
+    assert countries.by_name("Atlantis") is None
+    assert countries.by_name("") is None
+
+
+def test_all_countries_are_unique_and_sorted():
+    codes = [country.alpha2 for country in countries.all_countries()]
+    assert codes == sorted(set(codes))
+    assert len(codes) > 200
+
+
+def _square(x0, y0, x1, y1):
+    return [(x0, y0), (x0, y1), (x1, y1), (x1, y0), (x0, y0)]
+
+
+def _write_shapefile(path, records):
+    """Minimal ESRI Polygon .shp + dBase .dbf; records are (rings, {field: value})"""
+    body = b""
+    for number, (rings, _) in enumerate(records, 1):
+        points = [point for ring in rings for point in ring]
+        parts, start = [], 0
+        for ring in rings:
+            parts.append(start)
+            start += len(ring)
+        content = struct.pack("<i4d", 5, 0, 0, 0, 0) + struct.pack("<ii", len(rings), len(points))
+        content += struct.pack(f"<{len(parts)}i", *parts)
+        content += struct.pack(f"<{len(points) * 2}d", *(c for point in points for c in point))
+        body += struct.pack(">ii", number, len(content) // 2) + content
+    path.write_bytes(b"\0" * 100 + body)
+
+    names = list(records[0][1])
+    header_len = 32 + 32 * len(names) + 1
+    dbf = struct.pack("<B3xIHH20x", 3, len(records), header_len, 1 + 3 * len(names))
+    for name in names:
+        dbf += name.encode().ljust(11, b"\0") + b"C" + b"\0" * 4 + bytes([3]) + b"\0" * 15
+    dbf += b"\x0d"
+    for _, attributes in records:
+        dbf += b" " + b"".join(attributes[name].encode().ljust(3) for name in names)
+    path.with_suffix(".dbf").write_bytes(dbf)
+
+
+@pytest.fixture
+def polygon_index(tmp_path, monkeypatch):
+    """Index of two made-up squares: 'KE' with a hole, and 'TZ' whose ISO_A2 is -99"""
+    shp = tmp_path / "admin0.shp"
+    _write_shapefile(shp, [
+        ([_square(0, 0, 10, 10), _square(4, 4, 6, 6)], {"ISO_A2": "KE", "ISO_A3": "KEN"}),
+        ([_square(20, -5, 30, 5)], {"ISO_A2": "-99", "ISO_A3": "TZA"}),
+    ])
+    index_dir = tmp_path / "index"
+    countries.build_polygon_index(shp, index_dir)
+    monkeypatch.setattr(countries, "INDEX_DIR", index_dir)
+    monkeypatch.setattr(countries, "_index", None)
+    monkeypatch.setattr(countries, "_index_failed", False)
+    return index_dir
+
+
+def test_country_at_uses_compiled_index(polygon_index):
+    assert countries.country_at(1, 1) == "KE"
+    assert countries.country_at(5, 5) is None  # inside the hole
+    assert countries.country_at(0, 25) == "TZ"  # alpha-3 fallback
+    assert countries.country_at(50, 50) is None
+    assert isinstance(countries._index.edges, np.memmap)
+    assert len(countries._index.codes) == 2
+
+
+def test_country_at_without_index_never_downloads(tmp_path, monkeypatch):
+    monkeypatch.setattr(countries, "INDEX_DIR", tmp_path / "missing")
+    monkeypatch.setattr(countries, "_index", None)
+    monkeypatch.setattr(countries, "_index_failed", False)
+    monkeypatch.setattr(countries, "download_polygons", lambda *_: pytest.fail("lookup downloaded polygons"))
+    assert countries.country_at(1, 1) is None
+    assert countries._index_failed
+
+
+@pytest.fixture
+def bundled_index(monkeypatch):
+    monkeypatch.setattr(countries, "_index", None)
+    monkeypatch.setattr(countries, "_index_failed", False)
+    monkeypatch.setattr(countries, "download_polygons", lambda *_: pytest.fail("lookup downloaded polygons"))
+
+
+@pytest.mark.parametrize("lat, lon, code", [
+    (-1.29, 36.82, "KE"),     # Nairobi
+    (48.86, 2.35, "FR"),      # Paris
+    (35.68, 139.69, "JP"),    # Tokyo
+    (-29.31, 27.48, "LS"),    # Maseru, a hole in South Africa's polygon
+    (-26.20, 28.05, "ZA"),    # Johannesburg
+    (42.66, 21.17, "XK"),     # Pristina; Kosovo has no ISO code in Natural Earth
+    (64.70, 177.50, "RU"),    # Chukotka, east of the antimeridian
+    (-17.80, 178.00, "FJ"),
+    (0.0, -30.0, None),       # Atlantic
+])
+def test_country_at_bundled_index(bundled_index, lat, lon, code):
+    assert countries.country_at(lat, lon) == code
+    assert not countries._index_failed
+
+
+def test_bundled_index_matches_bundled_polygons(bundled_index, tmp_path):
+    rebuilt = countries.build_polygon_index(countries.POLYGON_SHAPEFILE, tmp_path)
+    bundled = countries._polygon_index()
+    for name in countries.INDEX_ARRAYS:
+        np.testing.assert_array_equal(getattr(bundled, name), getattr(rebuilt, name))
+    assert len(bundled.codes) > 170
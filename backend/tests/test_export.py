@@ -0,0 +1,68 @@
+# backend/tests/test_export.py
+import csv
+import io
+from datetime import datetime
+
+import pytest
+
+from app import export
+from app.export import CsvEncoder, make_encoder
+
+FIELDS = ["id", "title", "severity", "latitude", "last_updated"]
+ROWS = [
+    (1, "Flood, coastal", 4, 12.5, datetime(2024, 5, 1, 12, 30)),
+    (2, 'Drought "severe"', None, -3.25, datetime(2024, 5, 2)),
+    (3, "Río – landslide", 2, 0.0, None),
+]
+
+
+def _encode(encoder, batches):
+    chunks = [encoder.write(batch) for batch in batches]
+    chunks.append(encoder.close())
+    return chunks
+
+
+def test_csv_streams_header_then_rows_per_batch():
+    chunks = _encode(CsvEncoder(FIELDS), [ROWS[:2], [], ROWS[2:]])
+    assert chunks[0].startswith(b"id,title,severity,latitude,last_updated\r\n")
+    assert chunks[1] == chunks[3] == b""  # empty batch and close emit nothing new
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows == [
+        FIELDS,
+        ["1", "Flood, coastal", "4", "12.5", "2024-05-01T12:30:00"],
+        ["2", 'Drought "severe"', "", "-3.25", "2024-05-02T00:00:00"],
+        ["3", "Río – landslide", "2", "0.0", ""],
+    ]
+
+
+@pytest.mark.parametrize("format", ["arrow", "parquet"])
+def test_arrow_formats_round_trip(format):
+    pa = pytest.importorskip("pyarrow")
+    encoder = make_encoder(format, FIELDS)
+    chunks = _encode(encoder, [ROWS[:2], [], ROWS[2:]])
+    data = b"".join(chunks)
+    if format == "arrow":
+        assert chunks[1]  # each batch is flushed as it is written
+        table = pa.ipc.open_stream(data).read_all()
+        assert encoder.extension == "arrows"
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(pa.BufferReader(data))
+        assert encoder.extension == "parquet"
+    assert table.schema.names == FIELDS
+    assert table.schema.field("last_updated").type == pa.timestamp("us")
+    assert [tuple(row.values()) for row in table.to_pylist()] == ROWS
+
+
+def test_arrow_export_with_no_rows_has_the_schema():
+    pa = pytest.importorskip("pyarrow")
+    encoder = make_encoder("arrow", FIELDS)
+    table = pa.ipc.open_stream(b"".join(_encode(encoder, []))).read_all()
+    assert table.num_rows == 0 and table.schema.names == FIELDS
+
+
+def test_arrow_formats_require_pyarrow(monkeypatch):
+    monkeypatch.setattr(export, "ARROW_AVAILABLE", False)
+    assert isinstance(make_encoder("csv", FIELDS), CsvEncoder)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        make_encoder("parquet", FIELDS)
@@ -0,0 +1,97 @@
+# backend/tests/test_geo.py
+import math
+
+import pytest
+from fastapi import HTTPException
+
+from app.geo import (
+    BOX_SQL, EARTH_RADIUS_KM, HAVERSINE_SQL, bbox_clause, bboxes_intersect, in_bbox, parse_bbox,
+    radius_bbox, radius_clause, tile_bbox, validate_center,
+)
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2
+         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def test_parse_bbox():
+    assert parse_bbox("-10,35,30,60") == (-10.0, 35.0, 30.0, 60.0)
+    assert parse_bbox(" 170.5, -20 ,-170.5,  -10") == (170.5, -20.0, -170.5, -10.0)  # crosses the antimeridian
+
+
+@pytest.mark.parametrize("bbox", ["", "1,2,3", "1,2,3,4,5", "a,b,c,d", "0,60,10,50", "0,-91,10,0", "-181,0,10,10"])
+def test_parse_bbox_rejects_bad_input(bbox):
+    with pytest.raises(HTTPException) as e:
+        parse_bbox(bbox)
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize("lat, lon, radius", [(48.0, 2.0, 500.0), (70.0, -30.0, 1500.0), (-60.0, 100.0, 2500.0)])
+def test_radius_bbox_contains_the_circle(lat, lon, radius):
+    min_lon, min_lat, max_lon, max_lat = radius_bbox(lat, lon, radius)
+    assert min_lon < lon < max_lon and min_lat < lat < max_lat
+    for bearing in range(0, 360, 5):
+        # Points just inside the circle, stepped along each bearing
+        d = radius * 0.999 / EARTH_RADIUS_KM
+        b = math.radians(bearing)
+        plat = math.asin(math.sin(math.radians(lat)) * math.cos(d)
+                         + math.cos(math.radians(lat)) * math.sin(d) * math.cos(b))
+        plon = math.radians(lon) + math.atan2(math.sin(b) * math.sin(d) * math.cos(math.radians(lat)),
+                                              math.cos(d) - math.sin(math.radians(lat)) * math.sin(plat))
+        point = (math.degrees(plat), (math.degrees(plon) + 180) % 360 - 180)
+        assert _haversine_km(lat, lon, *point) <= radius
+        assert in_bbox(*point, (min_lon, min_lat, max_lon, max_lat))
+
+
+def test_radius_bbox_wraps_the_antimeridian():
+    min_lon, _, max_lon, _ = radius_bbox(0.0, 179.0, 500.0)
+    assert min_lon > max_lon
+    assert in_bbox(0.0, -178.0, (min_lon, -5, max_lon, 5))
+
+
+def test_radius_bbox_covering_a_pole_spans_every_longitude():
+    min_lon, _, max_lon, max_lat = radius_bbox(85.0, 10.0, 1000.0)
+    assert (min_lon, max_lon, max_lat) == (-180.0, 180.0, 90.0)
+    assert radius_bbox(0.0, 0.0, 20000.0) == (-180.0, -90.0, 180.0, 90.0)
+
+
+def test_bbox_clause():
+    assert bbox_clause((-10, 35, 30, 60)) == (BOX_SQL, [-10, 35, 30, 60])
+    sql, params = bbox_clause((170, -20, -170, -10))
+    assert sql == f"({BOX_SQL} OR {BOX_SQL})"
+    assert params == [170, -20, 180.0, -10, -180.0, -20, -170, -10]
+    assert sql.count("%s") == len(params)
+
+
+def test_radius_clause_params_match_placeholders():
+    sql, params = radius_clause(10.0, 20.0, 300.0)
+    assert HAVERSINE_SQL in sql
+    assert sql.count("%s") == len(params)
+    assert params[-4:] == [10.0, 10.0, 20.0, 300.0]
+
+
+def test_haversine_sql_clamps_the_asin_argument():
+    assert "asin(LEAST(1.0, sqrt(" in HAVERSINE_SQL
+
+
+def test_tile_bbox():
+    assert tile_bbox(0, 0, 0) == (-180.0, -90.0, 180.0, 90.0)
+    min_lon, min_lat, max_lon, max_lat = tile_bbox(1, 1, 0)
+    assert (min_lon, min_lat, max_lon, max_lat) == (0.0, 0.0, 180.0, 90.0)
+    buffered = tile_bbox(2, 1, 1, buffer=0.25)
+    plain = tile_bbox(2, 1, 1)
+    assert buffered[0] < plain[0] and buffered[2] > plain[2] and buffered[1] < plain[1] and buffered[3] > plain[3]
+
+
+def test_bboxes_intersect():
+    assert bboxes_intersect((0, 0, 10, 10), (10, 10, 20, 20))
+    assert not bboxes_intersect((0, 0, 10, 10), (11, 0, 20, 10))
+
+
+def test_validate_center():
+    assert validate_center(None, None, None) is False
+    assert validate_center(1.0, 2.0, 3.0) is True
+    with pytest.raises(HTTPException):
+        validate_center(1.0, None, 3.0)
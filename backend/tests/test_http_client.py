@@ -0,0 +1,166 @@
+# backend/tests/test_http_client.py
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.integrations import http_client
+from app.integrations.http_client import TokenBucket, _retry_after
+
+URL = "https://api.example.test/items"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Delays the client asked to sleep for (returned immediately)"""
+    recorded = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        recorded.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", fake_sleep)
+    monkeypatch.setitem(http_client.SOURCES, "test", {
+        "timeout": 5.0, "concurrency": 1, "rate": 1000.0, "burst": 1000, "cache_ttl": 0,
+    })
+    return recorded
+
+
+def run(handler, body):
+    """Run body() on a fresh loop whose shared client answers through handler"""
+    async def main():
+        state = http_client._get_state()
+        await state.client.aclose()
+        state.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await body(state)
+        finally:
+            await http_client.close_client()
+    return asyncio.run(main())
+
+
+def responses(*replies):
+    """Handler answering each request with the next reply; records the calls"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status, headers = replies[min(len(calls), len(replies)) - 1]
+        return httpx.Response(status, headers=headers, json={"ok": status == 200})
+    return handler, calls
+
+
+def test_retry_after_is_capped_at_the_backoff_ceiling():
+    assert http_client.RETRY_AFTER_MAX == http_client.BACKOFF_CAP
+
+
+def test_retry_after_within_the_max_is_honored(sleeps, monkeypatch):
+    monkeypatch.setattr(http_client, "RETRY_AFTER_MAX", 30.0)
+    handler, calls = responses((429, {"Retry-After": "20"}), (200, {}))
+    response = run(handler, lambda state: http_client.request("test", "GET", URL))
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert sleeps == [20.0]
+
+
+@pytest.mark.parametrize("retry_after", ["45", "3600"])
+def test_retry_after_over_the_max_fails_without_waiting(sleeps, monkeypatch, retry_after):
+    monkeypatch.setattr(http_client, "RETRY_AFTER_MAX", 30.0)
+    handler, calls = responses((503, {"Retry-After": retry_after}), (200, {}))
+    response = run(handler, lambda state: http_client.request("test", "GET", URL))
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert sleeps == []
+    with pytest.raises(httpx.HTTPStatusError):
+        response.raise_for_status()
+
+
+def test_retries_stop_after_max_retries(sleeps, monkeypatch):
+    monkeypatch.setattr(http_client, "MAX_RETRIES", 2)
+    handler, calls = responses((500, {}))
+    response = run(handler, lambda state: http_client.request("test", "GET", URL))
+    assert response.status_code == 500
+    assert len(calls) == 3
+    assert len(sleeps) == 2 and all(0 <= delay <= http_client.BACKOFF_CAP for delay in sleeps)
+
+
+def test_transport_errors_are_retried(sleeps):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    response = run(handler, lambda state: http_client.request("test", "GET", URL))
+    assert response.status_code == 200 and len(attempts) == 2
+
+
+def test_stream_holds_the_host_slot_until_closed(sleeps):
+    handler, _ = responses((200, {}))
+
+    async def body(state):
+        async with http_client.stream("test", "GET", URL) as response:
+            semaphore = state.host_semaphores["api.example.test"]
+            held = semaphore.locked()
+            await response.aread()
+        return held, semaphore.locked()
+
+    assert run(handler, body) == (True, False)
+
+
+def test_stream_releases_the_slot_between_retries(sleeps):
+    handler, calls = responses((503, {"Retry-After": "1"}), (200, {}))
+
+    async def body(state):
+        async with http_client.stream("test", "GET", URL) as response:
+            return response.status_code, state.host_semaphores["api.example.test"].locked()
+
+    assert run(handler, body) == (200, True)
+    assert len(calls) == 2 and sleeps == [1.0]
+
+
+def test_request_releases_the_slot(sleeps):
+    handler, _ = responses((200, {}))
+
+    async def body(state):
+        await http_client.request("test", "GET", URL)
+        await http_client.request("test", "GET", URL)  # would block forever if the slot leaked
+        return state.host_semaphores["api.example.test"].locked()
+
+    assert run(handler, body) is False
+
+
+@pytest.mark.parametrize("value, expected", [("120", 120.0), ("0", 0.0), ("-5", 0.0), ("1.5", 1.5), ("soon", None)])
+def test_retry_after_seconds(value, expected):
+    assert _retry_after(httpx.Response(429, headers={"Retry-After": value})) == expected
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    delay = _retry_after(httpx.Response(429, headers={"Retry-After": format_datetime(when, usegmt=True)}))
+    assert 115 <= delay <= 120
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+    assert _retry_after(httpx.Response(429, headers={"Retry-After": past})) == 0.0
+    assert _retry_after(httpx.Response(429)) is None
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    async def main():
+        bucket = TokenBucket(rate=50.0, burst=2)
+        start = time.monotonic()
+        for _ in range(2):
+            await bucket.acquire()
+        burst_time = time.monotonic() - start
+        for _ in range(5):
+            await bucket.acquire()
+        return burst_time, time.monotonic() - start
+
+    burst_time, total_time = asyncio.run(main())
+    assert burst_time < 0.02
+    assert 0.09 <= total_time < 0.5  # 5 more tokens at 50/s
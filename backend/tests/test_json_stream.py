@@ -0,0 +1,45 @@
+# backend/tests/test_json_stream.py
+import asyncio
+import json
+
+import pytest
+
+from app.integrations.json_stream import iter_array_items
+
+DOCUMENTS = [
+    '{"features":[1.25,2]}',
+    '{"count": 1.5, "features":[{"id": "a", "mag": -2.5e-3}, {"id": "b", "mag": 10E+2}], "bbox": [-1, 2.0]}',
+    '{"type": "FeatureCollection", "metadata": {"title": "café \\"q\\" 地震"}, '
+    '"features": [{"geometry": {"coordinates": [-122.5, 37.25, 10]}, "ok": true, "n": null}, 0, -0.0, 1e5]}',
+    '{"features": []}',
+    '{"features": [], "after": 123456789}',
+    '{}',
+    ' { "features" : [ 7 , [ ] , { } , "x" ] } ',
+]
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _collect(data: bytes, size: int, key: str = "features") -> list:
+    return [item async for item in iter_array_items(_chunks(data, size), key)]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_chunk_size_matches_json_loads(document):
+    data = document.encode()
+    expected = json.loads(document).get("features", [])
+    for size in range(1, len(data) + 1):
+        assert asyncio.run(_collect(data, size)) == expected, f"chunk size {size}"
+
+
+def test_missing_key_yields_nothing():
+    assert asyncio.run(_collect(b'{"other": [1, 2]}', 3)) == []
+
+
+@pytest.mark.parametrize("document", ['{"features": [1, 2}', '{"features": [1 2]}', '["features"]', '{"features": [1,'])
+def test_malformed_input_raises(document):
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(document.encode(), 4))
@@ -0,0 +1,145 @@
+# backend/tests/test_mvt.py
+import struct
+
+import pytest
+
+from app.mvt import EXTENT, encode_point_layer, lonlat_to_tile_px
+
+
+def _varint(data: bytes, pos: int):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(data: bytes):
+    """(field number, wire type, value) of every field in a protobuf message"""
+    pos = 0
+    while pos < len(data):
+        key, pos = _varint(data, pos)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = _varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        else:
+            raise AssertionError(f"unexpected wire type {wire_type}")
+        yield field, wire_type, value
+
+
+def _packed(data: bytes):
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = _varint(data, pos)
+        values.append(value)
+    return values
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _decode_value(data: bytes):
+    (field, _, value), = _fields(data)
+    if field == 1:
+        return value.decode("utf-8")
+    if field == 3:
+        return struct.unpack("<d", value)[0]
+    if field == 4:
+        return value - (1 << 64) if value >= 1 << 63 else value
+    if field == 7:
+        return bool(value)
+    raise AssertionError(f"unexpected value field {field}")
+
+
+def decode_tile(tile: bytes) -> dict:
+    """{layer name: {"version", "extent", "features": [{"id", "type", "geometry", "properties"}]}}"""
+    layers = {}
+    for field, _, layer_bytes in _fields(tile):
+        assert field == 3
+        layer = {"features": []}
+        keys, values, raw_features = [], [], []
+        for lf, _, value in _fields(layer_bytes):
+            if lf == 15:
+                layer["version"] = value
+            elif lf == 1:
+                name = value.decode("utf-8")
+            elif lf == 2:
+                raw_features.append(value)
+            elif lf == 3:
+                keys.append(value.decode("utf-8"))
+            elif lf == 4:
+                values.append(_decode_value(value))
+            elif lf == 5:
+                layer["extent"] = value
+        for raw in raw_features:
+            feature = {"properties": {}}
+            for ff, _, value in _fields(raw):
+                if ff == 1:
+                    feature["id"] = value
+                elif ff == 2:
+                    tags = _packed(value)
+                    for k, v in zip(tags[::2], tags[1::2]):
+                        feature["properties"][keys[k]] = values[v]
+                elif ff == 3:
+                    feature["type"] = value
+                elif ff == 4:
+                    command, dx, dy = _packed(value)
+                    assert command == (1 << 3) | 1  # MoveTo, count 1
+                    feature["geometry"] = (_unzigzag(dx), _unzigzag(dy))
+            layer["features"].append(feature)
+        layers[name] = layer
+    return layers
+
+
+FEATURES = [
+    {"id": 1, "latitude": 0.0, "longitude": 0.0,
+     "properties": {"id": 1, "title": "Flood – Río", "category": "Disaster", "severity": 7}},
+    {"id": 2, "latitude": 45.5, "longitude": -120.25,
+     "properties": {"id": 2, "title": "Drought", "category": "Climate", "severity": None}},
+    {"id": 3, "latitude": -10.0, "longitude": 30.0,
+     "properties": {"id": 3, "title": "Flood – Río", "category": "Disaster", "score": -2, "ratio": 0.5,
+                    "verified": True}},
+]
+
+
+def test_round_trip_at_zoom_zero():
+    layers = decode_tile(encode_point_layer("crises", FEATURES, 0, 0, 0))
+    layer = layers["crises"]
+    assert layer["version"] == 2
+    assert layer["extent"] == EXTENT
+    assert [f["id"] for f in layer["features"]] == [1, 2, 3]
+    assert all(f["type"] == 1 for f in layer["features"])  # POINT
+    for feature, original in zip(layer["features"], FEATURES):
+        expected = {k: v for k, v in original["properties"].items() if v is not None}
+        assert feature["properties"] == expected
+        assert feature["geometry"] == lonlat_to_tile_px(original["longitude"], original["latitude"], 0, 0, 0)
+    assert layer["features"][0]["geometry"] == (EXTENT // 2, EXTENT // 2)
+
+
+@pytest.mark.parametrize("z, x, y", [(1, 0, 0), (3, 5, 2), (12, 2048, 2047)])
+def test_coordinates_are_relative_to_the_tile(z, x, y):
+    layer = decode_tile(encode_point_layer("crises", FEATURES, z, x, y))["crises"]
+    for feature, original in zip(layer["features"], FEATURES):
+        assert feature["geometry"] == lonlat_to_tile_px(original["longitude"], original["latitude"], z, x, y)
+    # Points outside the tile get coordinates outside 0..EXTENT, including negative ones
+    if (z, x, y) == (1, 0, 0):
+        assert layer["features"][2]["geometry"][0] > EXTENT
+
+
+def test_polar_latitudes_are_clamped():
+    _, top = lonlat_to_tile_px(0.0, 90.0, 0, 0, 0)
+    _, bottom = lonlat_to_tile_px(0.0, -90.0, 0, 0, 0)
+    assert (top, bottom) == (0, EXTENT)
+
+
+def test_empty_layer_is_an_empty_tile():
+    assert encode_point_layer("crises", [], 0, 0, 0) == b""
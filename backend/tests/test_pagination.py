@@ -0,0 +1,72 @@
+# backend/tests/test_pagination.py
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, encode_cursor, keyset_clause, order_by
+
+
+@pytest.mark.parametrize("sort, value", [
+    ("severity", 7),
+    ("relevance", 0.0607927101854787),
+    ("last_updated", datetime(2026, 3, 1, 12, 30, 45, 123456)),
+    ("title", "Flood – Río"),
+    ("id", None),
+])
+def test_cursor_round_trip(sort, value):
+    cursor = encode_cursor(sort, value, 4242)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor, sort) == (value, 4242)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(encode_cursor("severity", 5, 1), "last_updated")
+    assert e.value.status_code == 400
+    assert "sort" in e.value.detail
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize("cursor", [
+    "", "not a cursor", "%%%", _raw_cursor(["severity", 5]), _raw_cursor(["severity", 5, "x"]),
+    _raw_cursor(["last_updated", {"dt": "yesterday"}, 1]), _raw_cursor(["severity", [1, 2], 3]),
+    _raw_cursor({"sort": "severity"}),
+])
+def test_malformed_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, "severity")
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize("sort, value", [
+    ("severity", "abc"), ("severity", 2.5), ("severity", True), ("severity", None),
+    ("relevance", "abc"), ("relevance", None),
+    ("last_updated", "2026-03-01"), ("last_updated", "abc"), ("last_updated", 5),
+    ("title", 5),
+    ("id", 5),
+])
+def test_cursor_key_of_the_wrong_type_is_a_400(sort, value):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(_raw_cursor([sort, value, 1]), sort)
+    assert e.value.status_code == 400
+
+
+def test_null_last_updated_stand_in_round_trips():
+    assert decode_cursor(encode_cursor("last_updated", "-infinity", 3), "last_updated") == ("-infinity", 3)
+    assert decode_cursor(encode_cursor("relevance", 0, 3), "relevance") == (0, 3)
+
+
+def test_keyset_clause_and_order_by_agree():
+    assert keyset_clause("id", None, 10) == ("id < %s", [10])
+    assert order_by("id") == "id DESC"
+
+    sql, params = keyset_clause("COALESCE(severity, 0)", 3, 10)
+    assert sql == "(COALESCE(severity, 0), id) < (%s, %s)"
+    assert params == [3, 10]
+    assert order_by("COALESCE(severity, 0)") == "COALESCE(severity, 0) DESC, id DESC"
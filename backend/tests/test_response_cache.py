@@ -0,0 +1,115 @@
+# backend/tests/test_response_cache.py
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.integrations import http_client, response_cache
+from app.integrations.response_cache import ResponseCache
+
+URL = "https://api.example.test/items"
+
+
+def _response(body: bytes, **headers) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "application/json", **headers}, content=body,
+                          request=httpx.Request("GET", URL))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache's stored/accessed timestamps"""
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=300)
+    for key in ("a", "b", "c"):
+        cache.put(key, _response(b"x" * 100))
+        clock[0] += 1
+    cache.get("a")  # a is now more recent than b and c
+    clock[0] += 1
+    cache.put("d", _response(b"x" * 100))  # 400 bytes > 300: evict down to 270
+
+    assert cache.get("b") is None and cache.get("c") is None
+    assert cache.get("a").body == b"x" * 100
+    assert cache.get("d") is not None
+
+
+def test_graphql_errors_are_not_stored(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=10_000)
+    assert cache.put("err", _response(b'{"data": null, "errors": [{"message": "rate limited"}]}')) is False
+    assert cache.get("err") is None
+    assert cache.put("ok", _response(b'{"data": {"accounts": []}, "errors": []}')) is True
+    assert cache.put("text", httpx.Response(200, content=b'"errors"', request=httpx.Request("GET", URL))) is True
+
+
+@pytest.fixture
+def cached_source(tmp_path, monkeypatch):
+    """A 'test' source with a 60 s TTL backed by a fresh cache file; returns the cache"""
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=1_000_000)
+    monkeypatch.setattr(http_client, "get_cache", lambda: cache)
+    monkeypatch.setitem(http_client.SOURCES, "test", {
+        "timeout": 5.0, "concurrency": 1, "rate": 1000.0, "burst": 1000, "cache_ttl": 60,
+    })
+    return cache
+
+
+def _run(handler, *requests):
+    """Send each (method, kwargs) through http_client.request on a loop answering via handler"""
+    async def main():
+        state = http_client._get_state()
+        await state.client.aclose()
+        state.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [await http_client.request("test", method, URL, **kwargs) for method, kwargs in requests]
+        finally:
+            await http_client.close_client()
+    return asyncio.run(main())
+
+
+def test_stale_entries_are_revalidated_and_refreshed(cached_source, clock):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json={"items": [1, 2]})
+
+    first, fresh = _run(handler, ("GET", {}), ("GET", {}))
+    assert seen == [None]  # the second call was answered from the cache
+    assert fresh.json() == first.json() == {"items": [1, 2]}
+
+    clock[0] += 61
+    revalidated, = _run(handler, ("GET", {}))
+    assert seen == [None, '"v1"']
+    assert revalidated.status_code == 200 and revalidated.json() == {"items": [1, 2]}
+
+    # The 304 restarted the TTL
+    clock[0] += 30
+    _run(handler, ("GET", {}))
+    assert len(seen) == 2
+
+
+def test_graphql_error_responses_are_refetched(cached_source):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"data": None, "errors": [{"message": "try again"}]})
+
+    _run(handler, ("POST", {"json": {"query": "{ accounts }"}}), ("POST", {"json": {"query": "{ accounts }"}}))
+    assert len(calls) == 2
+
+
+def test_cache_io_runs_off_the_event_loop(cached_source, monkeypatch):
+    threads = []
+    real_get, real_put = cached_source.get, cached_source.put
+    monkeypatch.setattr(cached_source, "get", lambda *a: threads.append(threading.get_ident()) or real_get(*a))
+    monkeypatch.setattr(cached_source, "put", lambda *a: threads.append(threading.get_ident()) or real_put(*a))
+
+    _run(lambda request: httpx.Response(200, json={}), ("GET", {}))
+    assert len(threads) == 2 and threading.get_ident() not in threads
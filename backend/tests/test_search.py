@@ -0,0 +1,31 @@
+# backend/tests/test_search.py
+import pytest
+
+from app.search import STOPWORDS, build_tsquery
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("flood", "flood:*"),
+    ("flood ban", "flood:* & ban:*"),
+    ("  Flood,   relief!! ", "Flood:* & relief:*"),
+    ("Río Grande 2024", "Río:* & Grande:* & 2024:*"),
+    ("flood_relief", "flood:* & relief:*"),
+    ("the flood in Kenya", "flood:* & Kenya:*"),
+    ("The", None),
+    ("the of and", None),
+    ("", None),
+    ("  ", None),
+    ("'&|!():*", None),
+])
+def test_build_tsquery(q, expected):
+    assert build_tsquery(q) == expected
+
+
+def test_operators_never_reach_the_tsquery():
+    tsquery = build_tsquery("flood & !drought | (war):* <-> x")
+    assert tsquery == "flood:* & drought:* & war:* & x:*"
+
+
+def test_stopwords_are_lowercase_words():
+    assert "the" in STOPWORDS and "flood" not in STOPWORDS
+    assert all(word == word.lower() and word.isalpha() for word in STOPWORDS)
@@ -0,0 +1,77 @@
+# backend/tests/test_tiles.py
+import pytest
+
+from app import tiles
+from app.tiles import TileCache
+
+
+class FakeCursor:
+    """Answers the data_changes query with preset rows"""
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    def execute(self, sql, params=None):
+        previous, version = params
+        self._rows = [row for row in self.changes if previous < row["version"] <= version]
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    current = {"version": 1}
+    monkeypatch.setattr(tiles, "get_data_version", lambda cur: current["version"])
+    return current
+
+
+def _change(version, bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox if bbox else (None,) * 4
+    return {"version": version, "min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat}
+
+
+def test_only_tiles_overlapping_a_change_are_evicted(versions):
+    cache = TileCache(16)
+    cursor = FakeCursor([_change(2, (100, 10, 101, 11))])
+    version = cache.sync(cursor)
+    cache.set((2, 0, 1, None), b"west", '"w"', version)
+    cache.set((2, 3, 1, None), b"east", '"e"', version)
+
+    versions["version"] = 2
+    assert cache.sync(cursor) == 2
+    assert cache.get((2, 0, 1, None)) == (b"west", '"w"')
+    assert cache.get((2, 3, 1, None)) is None
+
+
+def test_change_without_bbox_or_missing_version_clears_everything(versions):
+    cache = TileCache(16)
+    cache.set((0, 0, 0, None), b"tile", '"t"', cache.sync(FakeCursor([])))
+    versions["version"] = 3
+    cache.sync(FakeCursor([_change(3, (0, 0, 1, 1))]))  # version 2 is missing
+    assert cache.get((0, 0, 0, None)) is None
+
+    cache.set((0, 0, 0, None), b"tile", '"t"', 3)
+    versions["version"] = 4
+    cache.sync(FakeCursor([_change(4, None)]))
+    assert cache.get((0, 0, 0, None)) is None
+
+
+def test_tile_built_before_a_version_change_is_not_cached(versions):
+    cache = TileCache(16)
+    cursor = FakeCursor([_change(2, None)])
+    stale_version = cache.sync(cursor)
+    versions["version"] = 2
+    cache.sync(cursor)  # another request moves the cache on while the first builds its tile
+    cache.set((0, 0, 0, None), b"stale", '"s"', stale_version)
+    assert cache.get((0, 0, 0, None)) is None
+
+
+def test_older_version_never_moves_the_cache_back(versions):
+    cache = TileCache(16)
+    versions["version"] = 5
+    cache.sync(FakeCursor([]))
+    versions["version"] = 4
+    assert cache.sync(FakeCursor([])) == 4
+    cache.set((0, 0, 0, None), b"tile", '"t"', 4)
+    assert cache.get((0, 0, 0, None)) is None
@@ -16,7 +16,7 @@ function MapView() {
   const [offset, setOffset] = useState(0)
 
   const [crises, setCrises] = useState<Crisis[]>([])
-  const [total, setTotal] = useState(0)
+  const [total, setTotal] = useState<number | null>(0)
   const [selected, setSelected] = useState<Crisis | null>(null)
   const [charities, setCharities] = useState<Charity[]>([])
   const [loading, setLoading] = useState(false)
@@ -29,7 +29,7 @@ function MapView() {
     setLoading(true)
     setError(null)
     console.log('Fetching crises with category:', category)
-    fetchCrises({ q, category, sort, limit, offset })
+    fetchCrises({ q, category, sort, limit, offset, include: 'charities' })
       .then(({ items, total }) => {
         if (cancelled) return
         console.log('Received crises:', items.length, 'category filter:', category)
@@ -54,6 +54,11 @@ function MapView() {
       setCharities([])
       return
     }
+    // Charities come nested in the crisis list; only fall back to a request without them
+    if (selected.charities) {
+      setCharities(selected.charities)
+      return
+    }
     
     let cancelled = false
     setLoadingCharities(true)
@@ -62,7 +67,7 @@ function MapView() {
     console.log('Crisis details:', selected)
     
     fetchCharities({ crisis_id: selected.id })
-      .then((list) => {
+      .then(({ items: list }) => {
         if (!cancelled) {
           console.log('✅ Received charities:', list)
           console.log('✅ Number of charities:', list.length)
@@ -182,7 +187,7 @@ function MapView() {
             {/* Results Count */}
             <div className="flex-shrink-0 px-4 py-2 bg-blue-50 rounded-full border border-blue-100">
               <span className="text-sm font-medium text-blue-700">
-                {loading ? '...' : total} {total === 1 ? 'crisis' : 'crises'}
+                {loading ? '...' : total ?? '–'} {total === 1 ? 'crisis' : 'crises'}
               </span>
             </div>
           </div>
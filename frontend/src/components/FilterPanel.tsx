@@ -145,7 +145,7 @@ export default function FilterPanel({
         </div>
 
         {/* Pagination */}
-        {total > limit && (
+        {total != null && total > limit && (
           <div className="flex items-center justify-between text-sm">
             <span className="text-slate-600">
               Showing {offset + 1}-{Math.min(offset + limit, total)} of {total}
@@ -20,9 +20,15 @@ export type Crisis = {
   longitude: number
   source_api?: string
   last_updated?: string
+  charities?: Charity[] // present with include: 'charities' and on fetchCrisis
 }
 
-export type Paginated<T> = { total: number; items: T[] }
+export type Paginated<T> = {
+  total: number | null // null with total_mode: 'none'
+  total_mode?: 'exact' | 'cached' | 'estimate' | 'none'
+  items: T[]
+  next_cursor?: string | null
+}
 
 export async function fetchCrises(params: {
   q?: string
@@ -30,6 +36,10 @@ export async function fetchCrises(params: {
   sort?: 'severity' | 'last_updated' | 'id'
   limit?: number
   offset?: number
+  cursor?: string
+  include?: 'charities'
+  charities_limit?: number
+  fields?: (keyof Crisis)[] // projection; id is always returned
 }): Promise<Paginated<Crisis>> {
   const usp = new URLSearchParams()
   if (params.q) usp.set('q', params.q)
@@ -37,23 +47,107 @@ export async function fetchCrises(params: {
   if (params.sort) usp.set('sort', params.sort)
   if (params.limit != null) usp.set('limit', String(params.limit))
   if (params.offset != null) usp.set('offset', String(params.offset))
+  if (params.cursor) usp.set('cursor', params.cursor)
+  if (params.include) usp.set('include', params.include)
+  if (params.charities_limit != null) usp.set('charities_limit', String(params.charities_limit))
+  if (params.fields) usp.set('fields', params.fields.join(','))
   const res = await fetch(`${API}/crises/?${usp.toString()}`)
   return json<Paginated<Crisis>>(res)
 }
 
+// Download link for a bulk export (streamed by the API, not fetched into memory)
+export function crisesExportUrl(params: {
+  format?: 'csv' | 'arrow' | 'parquet'
+  q?: string
+  category?: string
+  fields?: (keyof Crisis)[]
+}): string {
+  const usp = new URLSearchParams()
+  if (params.format) usp.set('format', params.format)
+  if (params.q) usp.set('q', params.q)
+  if (params.category) usp.set('category', params.category)
+  if (params.fields) usp.set('fields', params.fields.join(','))
+  return `${API}/crises/export?${usp.toString()}`
+}
+
+export async function fetchCrisis(id: number): Promise<Crisis> {
+  const res = await fetch(`${API}/crises/${id}`)
+  return json<Crisis>(res)
+}
+
+export type CrisesInArea = { items: Crisis[]; count: number; truncated: boolean }
+
+export async function fetchCrisesWithin(params: {
+  bbox?: [number, number, number, number] // [minLon, minLat, maxLon, maxLat]
+  lat?: number
+  lon?: number
+  radius_km?: number
+  category?: string
+  limit?: number
+  fields?: (keyof Crisis)[] // e.g. ['latitude', 'longitude', 'category', 'severity'] for markers
+}): Promise<CrisesInArea> {
+  const usp = new URLSearchParams()
+  if (params.bbox) usp.set('bbox', params.bbox.join(','))
+  if (params.lat != null) usp.set('lat', String(params.lat))
+  if (params.lon != null) usp.set('lon', String(params.lon))
+  if (params.radius_km != null) usp.set('radius_km', String(params.radius_km))
+  if (params.category) usp.set('category', params.category)
+  if (params.limit != null) usp.set('limit', String(params.limit))
+  if (params.fields) usp.set('fields', params.fields.join(','))
+  const res = await fetch(`${API}/crises/within?${usp.toString()}`)
+  return json<CrisesInArea>(res)
+}
+
+export type CrisisCluster = {
+  x: number
+  y: number
+  count: number
+  max_severity?: number | null
+  categories: Record<string, number>
+  latitude: number
+  longitude: number
+  crisis_id?: number | null
+}
+
+export async function fetchCrisisClusters(params: {
+  z: number
+  bbox?: [number, number, number, number] // [minLon, minLat, maxLon, maxLat]
+  category?: string
+}): Promise<{ z: number; clusters: CrisisCluster[] }> {
+  const usp = new URLSearchParams({ z: String(params.z) })
+  if (params.bbox) usp.set('bbox', params.bbox.join(','))
+  if (params.category) usp.set('category', params.category)
+  const res = await fetch(`${API}/crises/clusters?${usp.toString()}`)
+  return json<{ z: number; clusters: CrisisCluster[] }>(res)
+}
+
 export type Charity = {
   id: number
   name: string
   description?: string
   website?: string
   logo_url?: string
+  donation_url?: string
+  country_code?: string
+  source?: string
   related_crisis_id?: number
-  verified: boolean
 }
 
-export async function fetchCharities(params: { crisis_id?: number }): Promise<Charity[]> {
+export type CharityPage = { items: Charity[]; limit: number; next_cursor?: string | null }
+
+export async function fetchCharities(params: {
+  crisis_id?: number
+  country_code?: string
+  source?: string
+  limit?: number
+  cursor?: string
+}): Promise<CharityPage> {
   const usp = new URLSearchParams()
   if (params.crisis_id != null) usp.set('crisis_id', String(params.crisis_id))
+  if (params.country_code) usp.set('country_code', params.country_code)
+  if (params.source) usp.set('source', params.source)
+  if (params.limit != null) usp.set('limit', String(params.limit))
+  if (params.cursor) usp.set('cursor', params.cursor)
   const res = await fetch(`${API}/charities/?${usp.toString()}`)
   console.log('📡 Response status:', res.status, res.statusText)
 
@@ -63,10 +157,9 @@ export async function fetchCharities(params: { crisis_id?: number }): Promise<Ch
     throw new Error(`Failed to fetch charities: ${res.status} ${errorText}`)
   }
 
-  const data = await res.json()
+  const data = (await res.json()) as CharityPage
   console.log('📦 Raw charities data received:', data)
-  console.log('📦 Type of data:', Array.isArray(data) ? 'Array' : typeof data)
-  console.log('📦 Number of items:', Array.isArray(data) ? data.length : 'N/A')
+  console.log('📦 Number of items:', data.items.length)
 
   return data
 }